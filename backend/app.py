@@ -2,8 +2,14 @@
 import os
 import sys
 import json
-from datetime import datetime
-from flask import Flask, request, jsonify
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from flask import Flask, request, jsonify, Response, stream_with_context, send_file
 from flask_cors import CORS
 from dotenv import load_dotenv
 
@@ -11,40 +17,154 @@ load_dotenv()
 sys.path.insert(0, os.path.dirname(__file__))
 
 from config.config_manager import ConfigManager
+from config.file_watcher import FileWatcher
 from questions.question_manager import QuestionManager
 from scoring.scoring_engine import ScoringEngine
 from analysis.analysis_engine import AnalysisEngine
 from llm_agent import InterviewAgent
 from reports.report_generator import ReportGenerator
+from reports.report_archive import (
+    REPORT_DIR, iter_reports, export_ndjson, export_csv, summarize_report, write_report, load_report,
+    find_report_path, parse_date
+)
+from reports.report_index import ReportIndex, SCORE_COLUMNS, FILTER_COLUMNS
+from reports.pdf_service import PDFRenderService
+try:
+    from reports.answer_index import AnswerIndex
+except ImportError:
+    AnswerIndex = None  # numpy not installed: no near-duplicate detection
+from sessions.session_store import create_session_store
+from sessions.answer_journal import AnswerJournal
+from sessions.deadlines import DeadlineScheduler
+from sessions.bulk import (
+    parse_candidates, validate_candidate, results_ndjson, results_csv, session_slug, invite_link
+)
+from http_cache import ResponseCache
+from profiling import SamplingProfiler, install_signal_handler
+from llm.scheduler import LLMScheduler, Priority, SchedulerOverloaded
+from llm.model_keeper import ModelKeeper, ModelNotReady
+from llm.recommendation_cache import RecommendationCache
+from llm.replay import TrafficReplayer, transport_from_env
 
 app = Flask(__name__)
 CORS(app)
 
+# Idle until started from /api/admin/profile/start or PROFILE_SIGNAL
+profiler = SamplingProfiler(max_seconds=float(os.getenv('PROFILE_MAX_SECONDS', 120)))
+
+@app.before_request
+def profile_request_start():
+    if profiler.running:
+        rule = request.url_rule.rule if request.url_rule else request.path
+        profiler.request_started(f"{request.method} {rule}")
+
+@app.teardown_request
+def profile_request_end(error=None):
+    profiler.request_finished()
+
 config_manager = ConfigManager()
 question_manager = QuestionManager()
 scoring_engine = ScoringEngine()
 analysis_engine = AnalysisEngine()
-llm_agent = InterviewAgent()
-report_generator = ReportGenerator()
+llm_agent = InterviewAgent.from_settings(config_manager.get_llm_settings())
+# LLM_RECORD / LLM_REPLAY swap the agent's transport for benchmarking (see llm/replay.py)
+llm_transport = transport_from_env(llm_agent)
+report_generator = ReportGenerator(output_dir=REPORT_DIR)
+llm_scheduler = LLMScheduler.from_settings(config_manager.get_llm_scheduler_settings())
+model_keeper = ModelKeeper.from_settings(llm_agent, config_manager.get_llm_keeper_settings())
+recommendation_cache = RecommendationCache.from_settings(config_manager.get_recommendation_cache_settings())
+report_index = ReportIndex()
+pdf_service = PDFRenderService.from_settings(config_manager.get_pdf_rendering_settings())
 
-sessions = {}
+duplicate_settings = config_manager.get_duplicate_detection_settings()
+answer_index = AnswerIndex.from_settings(duplicate_settings) \
+    if AnswerIndex is not None and duplicate_settings.get('enabled', True) else None
 
-@app.route('/api/config', methods=['GET'])
-def get_config():
-    return jsonify({
-        "roles": config_manager.get_roles(),
-        "experience_levels": config_manager.get_experience_levels(),
-        "domains": config_manager.get_domains(),
-        "difficulties": config_manager.get_difficulty_levels(),
-        "settings": config_manager.get_interview_settings()
-    })
+# "memory" for the dev server; wsgi.py points this at a SQLite file shared by workers
+sessions = create_session_store(os.getenv('SESSION_STORE', 'memory'))
 
-@app.route('/api/session/start', methods=['POST'])
-def start_session():
-    data = request.json
-    session_id = f"{data['name'].replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+# Write-ahead journal of starts and answers; unfinished interviews from a
+# crashed run are restored here (in the master when gunicorn preloads; each
+# importing process otherwise, one at a time, leaving live workers' files alone)
+journal_settings = config_manager.get_answer_journal_settings()
+answer_journal = AnswerJournal.from_settings(journal_settings) if journal_settings.get('enabled', True) else None
+if answer_journal is not None:
+    answer_journal.recover(sessions)
+
+# Serialized /api/config and question responses
+response_cache = ResponseCache()
+
+# defaults.json and the question bank are reloaded in place when edited; the
+# watcher thread is started per serving process (see start_config_watcher)
+config_watcher = FileWatcher(interval=float(os.getenv('CONFIG_POLL_SECONDS', 2)))
+config_watcher.watch(config_manager.config_path, config_manager.reload)
+config_watcher.watch(question_manager.question_bank_path, question_manager.reload)
+config_watcher.watch(question_manager.question_bank_path, response_cache.clear)
+config_watcher.watch(question_manager.question_bank_path, scoring_engine.reload_key_points)
+if answer_index is not None:
+    config_watcher.watch(question_manager.question_bank_path, answer_index.load_samples)
+config_watcher.watch(os.path.join(os.path.dirname(question_manager.question_bank_path), 'question_embeddings.npz'),
+                     scoring_engine.reload_key_points)
+config_watcher.watch(recommendation_cache.path, recommendation_cache.reload)
+config_manager.subscribe(lambda snapshot: response_cache.clear())
+
+def start_config_watcher():
+    config_watcher.start()
+
+def start_indexing():
+    """
+    Index an existing archive on first run and load the near-duplicate
+    signatures into this process's memory, without delaying startup. Per
+    serving process, after fork: a thread started in the master could be
+    forked holding an index lock or mid-write.
+    """
+    def build():
+        report_index.ensure_built()
+        if answer_index is not None:
+            answer_index.ensure_built()
     
-    sessions[session_id] = {
+    threading.Thread(target=build, daemon=True).start()
+
+def install_profile_signal():
+    """Let PROFILE_SIGNAL (default SIGUSR2) toggle a profiler run in this process; call from its main thread."""
+    import signal
+    signum = getattr(signal, os.getenv('PROFILE_SIGNAL', 'SIGUSR2'), None)
+    install_signal_handler(profiler, float(os.getenv('PROFILE_SECONDS', 30)), signum)
+
+def start_model_keeper():
+    """Warm the LLM models and keep them loaded (per serving process, like the config watcher)."""
+    if isinstance(llm_transport, TrafficReplayer):
+        return  # no model to keep loaded; replayed calls are always "warm"
+    if config_manager.get_llm_keeper_settings().get('enabled', True):
+        model_keeper.start()
+
+DEFAULT_RECOMMENDATIONS = {"recommendations": ["Review fundamentals", "Practice more", "Build projects"]}
+
+def journal(op, session_id, **fields):
+    """Append an interview event to the answer journal; a failing journal never fails the request."""
+    journal_many([(op, session_id, fields)])
+
+def journal_many(records):
+    """Append (op, session_id, fields) events with a single commit wait."""
+    if answer_journal is None or not records:
+        return
+    try:
+        answer_journal.append_many(records)
+    except OSError as e:
+        print(f"⚠️ Answer journal: {e}")
+
+def journaled(session):
+    """A session as its journal "start" record holds it (answers are journaled one by one)."""
+    return {k: v for k, v in session.items() if k not in ('answers', 'scores')}
+
+def new_session(data, questions, invited=False):
+    """
+    Session record for a candidate. The first question's clock starts now,
+    or for an invited session (bulk creation) when the candidate opens its
+    link (see begin_session).
+    """
+    now = datetime.now().isoformat()
+    session = {
         "candidate_name": data['name'],
         "candidate_email": data['email'],
         "role": data['role'],
@@ -52,39 +172,730 @@ def start_session():
         "domain": data['domain'],
         "answers": [],
         "scores": [],
-        "start_time": datetime.now().isoformat()
+        "start_time": None if invited else now,
+        "questions": list(questions)
     }
+    if invited:
+        session["invited_at"] = now
+        session["deadline"] = None
+    else:
+        open_question(session, 0, time.time())
+    return session
+
+def create_session(data):
+    """Create and store a session with its question set; returns (session_id, session)."""
+    session_id = f"{session_slug(data['name'])}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     
-    num_questions = config_manager.get_interview_settings().get('max_questions', 5)
-    questions = question_manager.get_questions(
+    session = new_session(data, question_manager.get_questions(
         role=data['role'],
         domain=data['domain'],
         experience_level=data['experience'],
-        count=num_questions
-    )
+        count=config_manager.snapshot.max_questions
+    ))
+    
+    journal('start', session_id, session=journaled(session))
+    sessions[session_id] = session
+    schedule_deadlines(session_id, session, reap=True)
+    return session_id, session
+
+def create_sessions_bulk(candidates, link_base):
+    """
+    Create an invited session for every valid candidate, stored in one transaction.
+
+    Each candidate gets their own question set, drawn like /api/session/start's
+    (all candidates with the same role/domain/experience in one pass).
+    Returns one result per candidate, in input order: row, name and email
+    plus session_id and link, or error.
+    """
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    seen_emails = set()
+    errors = []
+    for candidate in candidates:
+        error = validate_candidate(candidate, config_manager)
+        email = candidate['email'].lower()
+        if error is None and email in seen_emails:
+            error = "Duplicate email in this upload"
+        seen_emails.add(email)
+        errors.append(error)
     
-    sessions[session_id]["questions"] = questions
+    valid = [candidate for candidate, error in zip(candidates, errors) if error is None]
+    question_sets = iter(question_manager.question_sets(
+        ((c['role'], c['domain'], c['experience']) for c in valid),
+        count=config_manager.snapshot.max_questions
+    ))
     
-    return jsonify({
+    created, results = {}, []
+    for row, (candidate, error) in enumerate(zip(candidates, errors), 1):
+        result = {"row": row, "name": candidate['name'], "email": candidate['email']}
+        if error is None:
+            session_id = f"{session_slug(candidate['name'])}_{stamp}_{secrets.token_hex(4)}"
+            created[session_id] = new_session(candidate, next(question_sets), invited=True)
+            result.update(session_id=session_id, link=invite_link(link_base, session_id))
+        else:
+            result["error"] = error
+        results.append(result)
+    
+    journal_many([('start', session_id, {"session": journaled(session)}) for session_id, session in created.items()])
+    sessions.put_many(created)
+    print(f"📋 Created {len(created)} of {len(candidates)} bulk sessions")
+    return results
+
+def begin_session(session_id):
+    """Start an invited session's clock when the candidate opens it (no-op once started); returns the session."""
+    now = time.time()
+    begun = []
+    
+    def begin(stored):
+        if stored.get("start_time") is None:
+            stored["start_time"] = datetime.now().isoformat()
+            open_question(stored, 0, now)
+            begun.append(True)
+    
+    stored = sessions.update(session_id, begin)
+    if begun:
+        journal('start', session_id, session=journaled(stored))
+        schedule_deadlines(session_id, stored, reap=True)
+    return stored
+
+# The only question fields the interview screen renders; key points and sample
+# answers stay on the server
+CLIENT_QUESTION_FIELDS = ('id', 'text', 'difficulty', 'context')
+
+def client_question(question):
+    """A question trimmed to the fields the frontend needs."""
+    return {k: question[k] for k in CLIENT_QUESTION_FIELDS if question.get(k)}
+
+def client_questions(questions):
+    """Ordered question set trimmed to the fields the frontend needs."""
+    return [client_question(q) for q in questions]
+
+def session_start_payload(session_id, session, include_questions=False):
+    questions = session["questions"]
+    payload = {
         "session_id": session_id,
         "total_questions": len(questions),
-        "first_question": questions[0] if questions else None
-    })
+        "first_question": client_question(questions[0]) if questions else None,
+        "time_per_question_seconds": question_time_limit(),
+        "deadline": deadline_payload(session)
+    }
+    if include_questions:
+        payload["questions"] = client_questions(questions)
+    return payload
+
+def fallback_score(error):
+    """Neutral score used when the LLM scoring call fails."""
+    return {
+        "score": 50,
+        "clarity": 50,
+        "accuracy": 50,
+        "completeness": 50,
+        "confidence": 50,
+        "feedback": f"Error: {str(error)}"
+    }
+
+def heuristic_score(question, answer):
+    """Rule-based ScoringEngine score (1-5 scaled to 0-100), used when the LLM queue sheds load."""
+    return scoring_engine.score_response_percent(answer, question)
+
+def check_duplicate(question, answer):
+    """
+    Look the answer up in the near-duplicate index.
+
+    Returns (duplicate, reused_score): the match to flag (without its score)
+    or None, and the earlier answer's score when the match is close enough
+    to reuse instead of asking the LLM. The match names the earlier report,
+    so it is only stored with the answer; responses get client_duplicate().
+    """
+    if answer_index is None:
+        return None, None
+    match = answer_index.find(question, answer)
+    if match is None:
+        return None, None
+    
+    score = match.pop('score')
+    settings = config_manager.get_duplicate_detection_settings()
+    reusable = score and not score.get('partial')
+    if reusable and settings.get('reuse_scores', True) and match['similarity'] >= settings.get('reuse_score_threshold', 0.95):
+        # The earlier feedback was written about someone else's answer
+        return match, dict(score, feedback=REUSED_SCORE_FEEDBACK)
+    return match, None
+
+# Fields of a near-duplicate match the candidate's client may see
+CLIENT_DUPLICATE_FIELDS = ('similarity', 'exact', 'source')
+
+REUSED_SCORE_FEEDBACK = "This answer closely matches one scored before, so it received the same score."
+
+def client_duplicate(duplicate):
+    """A near-duplicate match without the earlier report it came from."""
+    return {k: duplicate[k] for k in CLIENT_DUPLICATE_FIELDS} if duplicate else None
+
+def client_report(report_data):
+    """The report as returned on completion, with near-duplicate matches trimmed."""
+    if not any(answer.get('duplicate') for answer in report_data['answers']):
+        return report_data
+    answers = [dict(answer, duplicate=client_duplicate(answer['duplicate'])) if answer.get('duplicate') else answer
+               for answer in report_data['answers']]
+    return dict(report_data, answers=answers)
+
+def recommendation_lookup(session):
+    """
+    (key, profile, cached recommendations or None) for the session's score profile.
+
+    key is None when the cache is disabled, in which case recommendations
+    are generated from the session's own context as before.
+    """
+    if not config_manager.get_recommendation_cache_settings().get('enabled', True):
+        return None, None, None
+    key, profile = recommendation_cache.profile(session["scores"], session["role"], session["domain"])
+    return key, profile, recommendation_cache.get(key)
+
+def record_answer(session_id, question_index, question, answer, score_result, duplicate=None, expired=False):
+    """
+    Append an answer and its score to the stored session, start the next
+    question's clock, and journal it.
+
+    expired marks a draft (or empty answer) submitted because the question
+    timed out; it raises QuestionClosed if the question was answered or
+    claimed by a submission meanwhile.
+    """
+    entry = {
+        "question_index": question_index,
+        "question_id": question.get('id'),
+        "question": question.get('text', ''),
+        "answer": answer
+    }
+    if duplicate:
+        entry["duplicate"] = duplicate
+    if expired:
+        entry["expired"] = True
+    now = time.time()
+    
+    def append(stored):
+        if expired and not expirable(stored, question_index, now):
+            raise QuestionClosed(question_index)
+        stored["answers"].append(entry)
+        stored["scores"].append(score_result)
+        stored.get("drafts", {}).pop(str(question_index), None)
+        # A timeout is not candidate activity: a session that only times out is still abandoned
+        open_question(stored, question_index + 1, now, activity=not expired)
+    
+    stored = sessions.update(session_id, append)
+    journal('answer', session_id, entry=entry, score=score_result,
+            update={"deadline": stored["deadline"], "last_activity": stored.get("last_activity")})
+    deadline_scheduler.cancel(('question', session_id, question_index))
+    schedule_deadlines(session_id, stored)
+    return stored
+
+def mark_reported(session_id, report_id):
+    """Link the session to its saved report; the journal can then drop the session's records."""
+    stored = sessions.update(session_id, lambda stored: stored.update(report_id=report_id, deadline=None))
+    journal('complete', session_id, report_id=report_id)
+    deadline_scheduler.cancel(('reap', session_id))
+    for index in range(len(stored["questions"])):
+        deadline_scheduler.cancel(('question', session_id, index))
+
+# ===== Question time limits =====
+#
+# The session's "deadline" tracks the question after the last answered one.
+# Its expiry timer and the session's abandonment timer live in this process's
+# DeadlineScheduler; the stored session stays the source of truth, so every
+# handler re-reads it and any process may act on any session.
+
+# An answer being scored holds off its question's expiry for at most this long
+SUBMISSION_HOLD_SECONDS = 300
+
+# Called with the id of every reaped session (the ASGI app adds its own agent)
+reap_hooks = [llm_agent.forget_session]
+
+class QuestionClosed(Exception):
+    """The question timed out (or was already answered) before this submission."""
+
+def timeout_settings():
+    return config_manager.get_question_timeout_settings()
+
+def question_time_limit():
+    """Seconds allowed per question, or None when limits are not enforced."""
+    if not timeout_settings().get('enabled', True):
+        return None
+    return config_manager.snapshot.time_per_question_minutes * 60
+
+def open_question(stored, index, now, activity=True):
+    """Start the clock on question index (no deadline past the last one); activity marks the candidate active."""
+    limit = question_time_limit()
+    stored["deadline"] = {"question_index": index, "expires_at": now + limit} \
+        if limit and index < len(stored["questions"]) else None
+    if activity:
+        stored["last_activity"] = now
+
+def deadline_payload(session):
+    """The open question's deadline as the client sees it."""
+    deadline = session.get("deadline")
+    if not deadline:
+        return None
+    return {
+        "question_index": deadline["question_index"],
+        "expires_at": datetime.fromtimestamp(deadline["expires_at"]).isoformat(),
+        "seconds_left": max(0, round(deadline["expires_at"] - time.time()))
+    }
+
+def expirable(session, index, now):
+    """Whether question index is still open and unclaimed, so a timeout may submit its draft."""
+    deadline = session.get("deadline")
+    if not deadline or deadline["question_index"] != index:
+        return False
+    return now - deadline.get("submitted_at", 0) >= SUBMISSION_HOLD_SECONDS
+
+def question_closed(session, index, now=None):
+    """Whether a submission for question index comes too late (past its deadline plus grace)."""
+    if not timeout_settings().get('enabled', True):
+        return False
+    now = now or time.time()
+    if any(a["question_index"] == index and a.get("expired") for a in session["answers"]):
+        return True
+    deadline = session.get("deadline")
+    return bool(deadline) and deadline["question_index"] == index and \
+        now > deadline["expires_at"] + timeout_settings().get('grace_seconds', 15)
+
+def claim_question(session_id, index):
+    """
+    Record that an answer to question index arrived in time, so its expiry
+    does not submit the draft while the answer is being scored. Raises
+    QuestionClosed if it is too late, KeyError if the session is gone.
+    """
+    now = time.time()
+    
+    def claim(stored):
+        if question_closed(stored, index, now):
+            raise QuestionClosed(index)
+        deadline = stored.get("deadline")
+        if deadline and deadline["question_index"] == index:
+            deadline["submitted_at"] = now
+        stored["last_activity"] = now
+    
+    if timeout_settings().get('enabled', True):
+        sessions.update(session_id, claim)
+
+def save_draft(session_id, index, answer):
+    """Keep the candidate's unsent answer for submission at timeout; returns the session."""
+    now = time.time()
+    
+    def store(stored):
+        if question_closed(stored, index, now):
+            raise QuestionClosed(index)
+        stored.setdefault("drafts", {})[str(index)] = answer
+        stored["last_activity"] = now
+    
+    return sessions.update(session_id, store)
+
+def schedule_deadlines(session_id, session, reap=False):
+    """Arm this process's timer for the open question (and, with reap, for abandonment)."""
+    settings = timeout_settings()
+    if not settings.get('enabled', True) or session.get("report_id") or not session.get("start_time"):
+        return  # done, or invited and not opened yet
+    deadline = session.get("deadline")
+    if deadline:
+        deadline_scheduler.schedule(('question', session_id, deadline["question_index"]),
+                                    deadline["expires_at"] + settings.get('grace_seconds', 15))
+    if reap:
+        deadline_scheduler.schedule(('reap', session_id), session.get("last_activity", time.time())
+                                    + settings.get('abandon_after_minutes', 30) * 60)
+
+def draft_score(question, draft):
+    """Score for a timed-out answer: rule-based, so expiry never waits on the LLM."""
+    if not draft:
+        return {"score": 0, "clarity": 0, "accuracy": 0, "completeness": 0, "confidence": 0,
+                "feedback": "No answer was given within the time limit."}
+    return heuristic_score(question, draft)
+
+def expire_question(session_id, index):
+    """
+    Close a question whose time ran out, submitting the candidate's last
+    saved draft (or an empty answer). Returns the score, or None if the
+    question was answered, extended or claimed meanwhile.
+    """
+    session = sessions.get(session_id)
+    if session is None or session.get("report_id"):
+        return None
+    now = time.time()
+    deadline = session.get("deadline")
+    if not expirable(session, index, now):
+        if deadline and deadline["question_index"] == index:
+            # Claimed by a submission still being scored: look again once its hold lapses
+            deadline_scheduler.schedule(('question', session_id, index),
+                                        deadline["submitted_at"] + SUBMISSION_HOLD_SECONDS)
+        return None
+    due = deadline["expires_at"] + timeout_settings().get('grace_seconds', 15)
+    if now < due:
+        deadline_scheduler.schedule(('question', session_id, index), due)
+        return None
+    
+    question = session["questions"][index]
+    draft = session.get("drafts", {}).get(str(index), '').strip()
+    score_result = draft_score(question, draft)
+    try:
+        record_answer(session_id, index, question, draft, score_result, expired=True)
+    except (KeyError, QuestionClosed):
+        return None
+    print(f"⏰ {session_id}: question {index + 1} timed out, {'draft submitted' if draft else 'no answer'}")
+    return score_result
+
+def reap_session(session_id):
+    """Drop a session untouched for abandon_after_minutes, with its cached responses and LLM context."""
+    abandon_after = timeout_settings().get('abandon_after_minutes', 30) * 60
+    
+    def reapable(session):
+        return not session.get("report_id") and bool(session.get("start_time"))
+    
+    def abandoned(session):
+        return reapable(session) and time.time() >= session.get("last_activity", 0) + abandon_after
+    
+    # Checked and deleted in one store transaction, so an answer saved meanwhile keeps the session
+    session = sessions.pop_if(session_id, abandoned)
+    if session is None:
+        current = sessions.get(session_id)
+        if current is not None and reapable(current):
+            deadline_scheduler.schedule(('reap', session_id), current.get("last_activity", 0) + abandon_after)
+        return False
+    response_cache.discard(('questions', session_id))
+    for index in range(len(session["questions"])):
+        response_cache.discard(('question', session_id, index))
+        deadline_scheduler.cancel(('question', session_id, index))
+    for hook in reap_hooks:
+        hook(session_id)
+    journal('reap', session_id)
+    print(f"🧹 Reaped abandoned session {session_id} ({len(session['answers'])} answered)")
+    return True
+
+def handle_deadline(key):
+    if key[0] == 'question':
+        expire_question(key[1], key[2])
+    elif key[0] == 'reap':
+        reap_session(key[1])
+
+deadline_scheduler = DeadlineScheduler(handle_deadline, workers=timeout_settings().get('workers', 2))
+
+def start_deadline_scheduler():
+    """Start this process's timer thread, then arm the timers of every unfinished session in the store."""
+    if not timeout_settings().get('enabled', True):
+        return
+    deadline_scheduler.start()
+    
+    def resume():
+        for session_id in sessions.keys():
+            session = sessions.get(session_id)
+            if session is not None:
+                schedule_deadlines(session_id, session, reap=True)
+    
+    threading.Thread(target=resume, daemon=True).start()
+
+def timed_out_payload(session_id, question_index, total_questions):
+    """Response to a submission that arrived after its question closed (the draft was submitted instead)."""
+    score_result = expire_question(session_id, question_index)
+    session = sessions.get(session_id) or {}
+    if score_result is None:
+        # Already timed out: report the score the submitted draft got then
+        score_result = next((score for answer, score in zip(session.get("answers", []), session.get("scores", []))
+                             if answer["question_index"] == question_index and answer.get("expired")), None)
+    return {
+        "error": "Time is up for this question",
+        "expired": True,
+        "score": score_result,
+        "followup_question": None,
+        "next_question_index": question_index + 1,
+        "total_questions": total_questions,
+        "deadline": deadline_payload(session)
+    }
+
+def build_report(session, recommendations):
+    """Aggregate session scores into the report payload."""
+    scores = session["scores"]
+    answers = session["answers"]
+    
+    def average(field):
+        # A partial LLM score (truncated output) may lack some dimensions; average the ones given
+        given = [s[field] for s in scores if s.get(field) is not None]
+        return sum(given) / len(given) if given else 0
+    
+    overall_score = average('score')
+    clarity = average('clarity')
+    accuracy = average('accuracy')
+    completeness = average('completeness')
+    confidence = average('confidence')
+    
+    return {
+        "candidate_name": session["candidate_name"],
+        "candidate_email": session["candidate_email"],
+        "role": session["role"],
+        "experience": session["experience"],
+        "domain": session["domain"],
+        "overall_score": overall_score,
+        "clarity": clarity,
+        "accuracy": accuracy,
+        "completeness": completeness,
+        "confidence": confidence,
+        "answers": answers,
+        "scores": scores,
+        "recommendations": recommendations.get('recommendations', []),
+        "timestamp": datetime.now().isoformat()
+    }
+
+def save_report(report_data):
+    """Store the report (compact/compressed JSON, HTML only if configured); returns its report id."""
+    storage = config_manager.get_report_storage_settings()
+    
+    report_dir = REPORT_DIR
+    os.makedirs(report_dir, exist_ok=True)
+    
+    filename = f"{report_data['candidate_name'].replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    report_path = write_report(os.path.join(report_dir, filename), report_data, storage.get('format', 'json.gz'))
+    
+    report_index.add(summarize_report(report_data, filename), report_path)
+    if answer_index is not None:
+        answer_index.add_report(filename, report_data)
+    
+    if storage.get('store_html', False):
+        with open(os.path.join(report_dir, f"{filename}.html"), 'w') as f:
+            f.write(report_generator.render_report_html(report_data))
+    
+    return filename
+
+def report_path_for(report_id):
+    """Stored report path, from the index when it is current."""
+    indexed = report_index.get(report_id)
+    return indexed['path'] if indexed and os.path.exists(indexed['path']) else find_report_path(report_id)
+
+# Rendered HTML by ETag; reports never change once stored, so entries never go stale
+_html_cache = OrderedDict()
+_html_cache_lock = threading.Lock()
+HTML_CACHE_SIZE = 128
+
+def report_html(report_id, if_none_match):
+    """
+    Render a stored report to HTML on demand, with a strong ETag and an in-memory cache.
+    
+    Returns (status, html, headers): 404 with no html if the report is not
+    stored, 304 with no html if if_none_match (the request's ETags) has it.
+    """
+    path = report_path_for(report_id)
+    if path is None:
+        return 404, None, {}
+    
+    stat = os.stat(path)
+    etag = hashlib.sha1(f"{report_id}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "private, max-age=86400"}
+    
+    if if_none_match.contains(etag):
+        return 304, None, headers
+    
+    with _html_cache_lock:
+        html = _html_cache.get(etag)
+        if html is not None:
+            _html_cache.move_to_end(etag)
+    if html is None:
+        html = report_generator.render_report_html(load_report(path))
+        with _html_cache_lock:
+            _html_cache[etag] = html
+            while len(_html_cache) > HTML_CACHE_SIZE:
+                _html_cache.popitem(last=False)
+    
+    return 200, html, headers
+
+def report_html_response(report_id):
+    status, html, headers = report_html(report_id, request.if_none_match)
+    if status == 404:
+        return jsonify({"error": "Report not found"}), 404
+    return Response(html, status=status, mimetype='text/html', headers=headers)
+
+def report_export(args):
+    """
+    (chunks, mimetype, format) streaming the stored reports that match the
+    /api/reports/export query args; raises ValueError for invalid args.
+    """
+    export_format = args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        raise ValueError("Invalid format")
+    
+    # Validated here: the CSV header is sent before the first report is read
+    since = parse_date(args.get('since'))
+    until = parse_date(args.get('until'), end_of_day=True)
+    
+    rows = iter_reports(
+        since=since,
+        until=until,
+        role=args.get('role'),
+        min_score=args.get('min_score', type=float),
+        max_score=args.get('max_score', type=float)
+    )
+    if export_format == 'csv':
+        return export_csv(rows), 'text/csv', export_format
+    return export_ndjson(rows, full=args.get('full') == '1'), 'application/x-ndjson', export_format
+
+def report_search(args):
+    """A page of indexed reports for the /api/reports/search query args; raises ValueError for invalid args."""
+    filters = {column: args.get(column) for column in FILTER_COLUMNS}
+    for column in SCORE_COLUMNS:
+        for bound in ('min', 'max'):
+            filters[f'{bound}_{column}'] = args.get(f'{bound}_{column}', type=float)
+    
+    return report_index.search(
+        filters,
+        since=args.get('since'),
+        until=args.get('until'),
+        limit=args.get('limit', 50, type=int),
+        cursor=args.get('cursor')
+    )
+
+def pdf_job_response(job):
+    return {
+        "job_id": job['job_id'],
+        "report_id": job['report_id'],
+        "status": job['status'],
+        "error": job['error'],
+        "pdf_url": f"/api/reports/pdf/jobs/{job['job_id']}/file" if job['status'] == 'done' else None
+    }
+
+def queue_report_pdf(report_id):
+    """(payload, status) for a PDF render of one stored report."""
+    if not pdf_service.available():
+        return {"error": "PDF generation requires weasyprint"}, 501
+    
+    path = report_path_for(report_id)
+    if path is None:
+        return {"error": "Report not found"}, 404
+    
+    job = pdf_service.submit(report_id, path)
+    return pdf_job_response(job), 200 if job['status'] == 'done' else 202
+
+def queue_report_pdf_batch(data):
+    """(payload, status) for PDF renders of every report matching the filters (default: this week's reports)."""
+    if not pdf_service.available():
+        return {"error": "PDF generation requires weasyprint"}, 501
+    
+    today = datetime.now().date()
+    since = data.get('since') or (today - timedelta(days=today.weekday())).isoformat()
+    filters = {column: data.get(column) for column in FILTER_COLUMNS}
+    
+    reports, cursor = [], None
+    try:
+        while True:
+            page = report_index.search(filters, since=since, until=data.get('until'), limit=500, cursor=cursor)
+            reports.extend((row['report_id'], row['path']) for row in page['results'] if row['path'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    
+    batch = pdf_service.submit_batch(reports)
+    print(f"📄 Queued {batch['total']} PDF renders since {since}")
+    return batch, 202
+
+@app.route('/api/config', methods=['GET'])
+def get_config():
+    cached = response_cache.get_or_build('config', lambda: {
+        "roles": config_manager.get_roles(),
+        "experience_levels": config_manager.get_experience_levels(),
+        "domains": config_manager.get_domains(),
+        "difficulties": config_manager.get_difficulty_levels(),
+        "settings": config_manager.get_interview_settings()
+    }, "public, max-age=300")
+    return cached.to_response(request)
+
+@app.route('/api/session/start', methods=['POST'])
+def start_session():
+    data = request.json
+    session_id, session = create_session(data)
+    include_questions = bool(data.get('include_questions')) or request.args.get('include') == 'questions'
+    return jsonify(session_start_payload(session_id, session, include_questions))
+
+@app.route('/api/session/<session_id>/begin', methods=['POST'])
+def begin_interview(session_id):
+    """Open a session created in bulk (from its link): starts the clock and returns the question set."""
+    try:
+        session = begin_session(session_id)
+    except KeyError:
+        return jsonify({"error": "Session not found"}), 404
+    return jsonify(dict(session_start_payload(session_id, session, include_questions=True),
+                        answered=len(session["answers"])))
+
+def bulk_candidates(body, content_type, files):
+    """Candidates from an uploaded file (multipart "file") or the raw body; raises ValueError."""
+    upload = files.get('file')
+    if upload is not None:
+        return parse_candidates(upload.read(), 'text/csv' if upload.filename.lower().endswith('.csv') else '')
+    return parse_candidates(body, content_type)
+
+def bulk_results_stream(results, output_format):
+    """(chunks, mimetype) for bulk session results."""
+    if output_format == 'csv':
+        return results_csv(results), 'text/csv'
+    return results_ndjson(results), 'application/x-ndjson'
+
+@app.route('/api/sessions/bulk', methods=['POST'])
+def create_bulk_sessions():
+    """Create sessions for a CSV or JSON candidate list (admin); streams back ids and links as NDJSON or CSV."""
+    denied = admin_denied()
+    if denied:
+        return denied
+    output_format = request.args.get('format', 'ndjson')
+    if output_format not in ('ndjson', 'csv'):
+        return jsonify({"error": "Invalid format"}), 400
+    
+    settings = config_manager.get_bulk_session_settings()
+    try:
+        candidates = bulk_candidates(request.get_data(cache=False) if not request.files else b'',
+                                     request.content_type or '', request.files)
+    except ValueError as e:
+        return jsonify({"error": f"Could not read candidates: {e}"}), 400
+    if len(candidates) > settings.get('max_candidates', 10000):
+        return jsonify({"error": f"At most {settings.get('max_candidates', 10000)} candidates per request"}), 413
+    
+    results = create_sessions_bulk(candidates, request.args.get('link_base') or settings.get('link_base', ''))
+    chunks, mimetype = bulk_results_stream(results, output_format)
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=sessions.{output_format}"}
+    )
+
+@app.route('/api/session/<session_id>/questions', methods=['GET'])
+def get_question_set(session_id):
+    """The whole ordered question set in one response, for clients that render locally."""
+    cached = response_cache.get(('questions', session_id))
+    if cached is not None:
+        return cached.to_response(request)
+    
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Session not found"}), 404
+    
+    payload = {"questions": client_questions(session["questions"])}
+    cached = response_cache.put(('questions', session_id), payload, "private, max-age=3600")
+    return cached.to_response(request)
 
 @app.route('/api/session/<session_id>/question/<int:index>', methods=['GET'])
 def get_question(session_id, index):
-    if session_id not in sessions:
+    # A session's question set is fixed at start, so a cached entry stays valid
+    cached = response_cache.get(('question', session_id, index))
+    if cached is not None:
+        return cached.to_response(request)
+    
+    session = sessions.get(session_id)
+    if session is None:
         return jsonify({"error": "Session not found"}), 404
     
-    questions = sessions[session_id]["questions"]
+    questions = session["questions"]
     if index >= len(questions):
         return jsonify({"error": "Index out of range"}), 400
     
-    return jsonify(questions[index])
+    cached = response_cache.put(('question', session_id, index), client_question(questions[index]),
+                                "private, max-age=3600")
+    return cached.to_response(request)
 
 @app.route('/api/session/<session_id>/answer', methods=['POST'])
 def submit_answer(session_id):
-    if session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         return jsonify({"error": "Session not found"}), 404
     
     data = request.json
@@ -96,58 +907,76 @@ def submit_answer(session_id):
     print(f"📝 RECEIVED ANSWER: {answer[:100]}...")
     print("="*60)
     
-    session = sessions[session_id]
     questions = session["questions"]
     question = questions[question_index]
     
-    print(f"🤖 CALLING LLM to score question: {question.get('text', '')[:80]}...")
-    print(f"   Expected concepts: {question.get('keywords', [])}")
-    
     try:
-        # LLM Score
-        print("   ⏳ Waiting for LLM response...")
-        score_result = llm_agent.score_answer(
-            question=question.get('text', ''),
-            answer=answer,
-            expected_concepts=question.get('keywords', [])
-        )
+        claim_question(session_id, question_index)
+    except QuestionClosed:
+        print(f"⏰ ANSWER ARRIVED AFTER THE TIME LIMIT - submitting the saved draft instead")
+        return jsonify(timed_out_payload(session_id, question_index, len(questions))), 409
+    
+    duplicate, score_result = check_duplicate(question, answer)
+    if duplicate:
+        print(f"⚠️ NEAR-DUPLICATE of {duplicate['source']} {duplicate['report_id'] or ''} "
+              f"(similarity {duplicate['similarity']})")
+    
+    if score_result is not None:
+        print("♻️ Reusing the earlier answer's score")
+    else:
+        print(f"🤖 CALLING LLM to score question: {question.get('text', '')[:80]}...")
+        print(f"   Expected concepts: {question.get('keywords', [])}")
         
-        print(f"✅ SCORE RESULT RECEIVED:")
-        print(f"   Score: {score_result.get('score')}")
-        print(f"   Clarity: {score_result.get('clarity')}")
-        print(f"   Accuracy: {score_result.get('accuracy')}")
-        print(f"   Completeness: {score_result.get('completeness')}")
-        print(f"   Confidence: {score_result.get('confidence')}")
-        print(f"   Feedback: {score_result.get('feedback')[:100]}...")
+        try:
+            # LLM Score
+            print("   ⏳ Waiting for LLM response...")
+            model_keeper.check_ready('score')
+            score_result = llm_scheduler.run(
+                Priority.LIVE_SCORING,
+                llm_agent.score_answer,
+                question=question.get('text', ''),
+                answer=answer,
+                expected_concepts=question.get('keywords', []),
+                session_id=session_id
+            )
         
-    except Exception as e:
-        print(f"❌ ERROR SCORING ANSWER: {e}")
-        score_result = {
-            "score": 50,
-            "clarity": 50,
-            "accuracy": 50,
-            "completeness": 50,
-            "confidence": 50,
-            "feedback": f"Error: {str(e)}"
-        }
-    
-    session["answers"].append({
-        "question_index": question_index,
-        "question": question.get('text', ''),
-        "answer": answer
-    })
-    session["scores"].append(score_result)
+            print(f"✅ SCORE RESULT RECEIVED:")
+            print(f"   Score: {score_result.get('score')}")
+            print(f"   Clarity: {score_result.get('clarity')}")
+            print(f"   Accuracy: {score_result.get('accuracy')}")
+            print(f"   Completeness: {score_result.get('completeness')}")
+            print(f"   Confidence: {score_result.get('confidence')}")
+            print(f"   Feedback: {score_result.get('feedback')[:100]}...")
+        
+        except SchedulerOverloaded as e:
+            print(f"⚠️ LLM QUEUE FULL ({e}) - using heuristic score")
+            score_result = heuristic_score(question, answer)
+        except ModelNotReady as e:
+            print(f"⚠️ MODEL NOT LOADED ({e}) - using heuristic score")
+            score_result = heuristic_score(question, answer)
+        except Exception as e:
+            print(f"❌ ERROR SCORING ANSWER: {e}")
+            score_result = fallback_score(e)
+    
+    stored = record_answer(session_id, question_index, question, answer, score_result, duplicate)
     
     # LLM Follow-up
     followup_question = None
     try:
         print(f"🤖 GENERATING FOLLOW-UP QUESTION...")
-        followup_question = llm_agent.generate_followup(
+        model_keeper.check_ready('followup')
+        followup_question = llm_scheduler.run(
+            Priority.FOLLOWUP,
+            llm_agent.generate_followup,
             question=question.get('text', ''),
             answer=answer,
-            question_context=question.get('context', '')
+            question_context=question.get('context', ''),
+            session_id=session_id
         )
         print(f"✅ FOLLOW-UP GENERATED: {followup_question[:100]}...")
+    except (SchedulerOverloaded, ModelNotReady) as e:
+        print(f"⚠️ LLM UNAVAILABLE ({e}) - using question bank follow-up")
+        followup_question = question.get('follow_up')
     except Exception as e:
         print(f"❌ ERROR GENERATING FOLLOW-UP: {e}")
         followup_question = None
@@ -156,91 +985,262 @@ def submit_answer(session_id):
     
     return jsonify({
         "score": score_result,
+        "duplicate": client_duplicate(duplicate),
         "followup_question": followup_question,
         "next_question_index": question_index + 1,
-        "total_questions": len(questions)
+        "total_questions": len(questions),
+        "deadline": deadline_payload(stored)
     })
 
+@app.route('/api/session/<session_id>/draft', methods=['PUT'])
+def save_answer_draft(session_id):
+    """Autosave of the answer being typed; submitted in its place if the question times out."""
+    data = request.json or {}
+    try:
+        session = save_draft(session_id, data.get('question_index', 0), data.get('answer', ''))
+    except KeyError:
+        return jsonify({"error": "Session not found"}), 404
+    except QuestionClosed:
+        return jsonify({"error": "Time is up for this question", "expired": True}), 409
+    return jsonify({"saved": True, "deadline": deadline_payload(session)})
+
 @app.route('/api/session/<session_id>/complete', methods=['POST'])
 def complete_interview(session_id):
-    if session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         return jsonify({"error": "Session not found"}), 404
     
-    session = sessions[session_id]
     scores = session["scores"]
     answers = session["answers"]
     
-    overall_score = sum(s.get('score', 0) for s in scores) / len(scores) if scores else 0
-    clarity = sum(s.get('clarity', 0) for s in scores) / len(scores) if scores else 0
-    accuracy = sum(s.get('accuracy', 0) for s in scores) / len(scores) if scores else 0
-    completeness = sum(s.get('completeness', 0) for s in scores) / len(scores) if scores else 0
-    confidence = sum(s.get('confidence', 0) for s in scores) / len(scores) if scores else 0
-    
     print("\n" + "="*60)
     print("🎯 GENERATING AI RECOMMENDATIONS...")
     
-    try:
-        recommendations = llm_agent.generate_recommendations(answers, scores)
-        print(f"✅ RECOMMENDATIONS GENERATED:")
-        for rec in recommendations.get('recommendations', []):
-            print(f"   • {rec}")
-    except Exception as e:
-        print(f"❌ ERROR GENERATING RECOMMENDATIONS: {e}")
-        recommendations = {"recommendations": ["Review fundamentals", "Practice more", "Build projects"]}
+    key, profile, cached = recommendation_lookup(session)
+    if cached is not None:
+        print(f"♻️ RECOMMENDATIONS FROM CACHE ({key})")
+        recommendations = {"recommendations": cached}
+    else:
+        try:
+            if key is None:
+                recommendations = llm_scheduler.run(
+                    Priority.RECOMMENDATIONS, llm_agent.generate_recommendations, answers, scores,
+                    session_id=session_id
+                )
+            else:
+                recommendations = llm_scheduler.run(
+                    Priority.RECOMMENDATIONS, llm_agent.generate_profile_recommendations, profile
+                )
+                recommendation_cache.put(key, recommendations['recommendations'])
+            print(f"✅ RECOMMENDATIONS GENERATED:")
+            for rec in recommendations.get('recommendations', []):
+                print(f"   • {rec}")
+        except Exception as e:
+            print(f"❌ ERROR GENERATING RECOMMENDATIONS: {e}")
+            recommendations = DEFAULT_RECOMMENDATIONS
     
     print("="*60 + "\n")
     
-    report_data = {
-        "candidate_name": session["candidate_name"],
-        "candidate_email": session["candidate_email"],
-        "role": session["role"],
-        "experience": session["experience"],
-        "domain": session["domain"],
-        "overall_score": overall_score,
-        "clarity": clarity,
-        "accuracy": accuracy,
-        "completeness": completeness,
-        "confidence": confidence,
-        "answers": answers,
-        "scores": scores,
-        "recommendations": recommendations.get('recommendations', []),
-        "timestamp": datetime.now().isoformat()
-    }
-    
-    html_report = report_generator.generate_html_report(report_data)
-    
-    report_dir = os.path.join(os.path.dirname(__file__), 'reports')
-    os.makedirs(report_dir, exist_ok=True)
-    
-    filename = f"{session['candidate_name'].replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    llm_agent.forget_session(session_id)
     
-    with open(os.path.join(report_dir, f"{filename}.json"), 'w') as f:
-        json.dump(report_data, f, indent=2)
+    report_data = build_report(session, recommendations)
+    report_id = save_report(report_data)
+    mark_reported(session_id, report_id)
     
-    with open(os.path.join(report_dir, f"{filename}.html"), 'w') as f:
-        f.write(html_report)
+    response = {
+        "success": True,
+        "report": client_report(report_data),
+        "report_id": report_id,
+        "html_url": f"/api/reports/{report_id}/html"
+    }
+    if request.args.get('include_html') == '1' or \
+            config_manager.get_report_storage_settings().get('include_html_in_response', False):
+        response["html_report"] = report_generator.render_report_html(report_data)
     
+    return jsonify(response)
+
+@app.route('/api/health', methods=['GET'])
+def health():
+    """Liveness plus LLM model residency; "degraded" while live calls would fall back."""
+    llm = model_keeper.get_status(llm_agent.usage)
     return jsonify({
-        "success": True,
-        "report": report_data,
-        "html_report": html_report
+        "status": "ok" if llm['ready'] or not llm['managed'] else "degraded",
+        "llm": llm
     })
 
+def admin_check(header_token):
+    """(error, status) unless header_token is the ADMIN_TOKEN (admin routes are off without one)."""
+    token = os.getenv('ADMIN_TOKEN')
+    if not token:
+        return "Admin endpoints are disabled (set ADMIN_TOKEN)", 404
+    if not hmac.compare_digest(header_token or '', token):
+        return "Forbidden", 403
+    return None
+
+def admin_denied():
+    """Error response unless the request carries the ADMIN_TOKEN."""
+    denied = admin_check(request.headers.get('X-Admin-Token', ''))
+    return (jsonify({"error": denied[0]}), denied[1]) if denied else None
+
+@app.route('/api/admin/profile/start', methods=['POST'])
+def start_profile():
+    denied = admin_denied()
+    if denied:
+        return denied
+    data = request.get_json(silent=True) or {}
+    interval_ms = data.get('interval_ms')
+    started = profiler.start(float(data.get('seconds', 30)), interval=interval_ms / 1000 if interval_ms else None)
+    if not started:
+        return jsonify({"error": "Profiler already running", **profiler.get_stats()}), 409
+    return jsonify(profiler.get_stats()), 202
+
+@app.route('/api/admin/profile/stop', methods=['POST'])
+def stop_profile():
+    denied = admin_denied()
+    if denied:
+        return denied
+    profiler.stop()
+    return jsonify(profiler.get_stats())
+
+@app.route('/api/admin/profile', methods=['GET'])
+def profile_stats():
+    """Per-route wall vs CPU time and the hottest frames of the current or last run."""
+    denied = admin_denied()
+    if denied:
+        return denied
+    return jsonify(profiler.get_stats())
+
+@app.route('/api/admin/profile/collapsed', methods=['GET'])
+def profile_collapsed():
+    """Collapsed stacks for flamegraph.pl or speedscope."""
+    denied = admin_denied()
+    if denied:
+        return denied
+    return Response(profiler.collapsed(), mimetype='text/plain',
+                    headers={"Content-Disposition": f"attachment; filename=profile_{os.getpid()}.collapsed"})
+
+@app.route('/api/llm/metrics', methods=['GET'])
+def llm_metrics():
+    return jsonify({
+        "scheduler": llm_scheduler.get_metrics(),
+        "usage": llm_agent.usage.get_stats(),
+        "models": llm_agent.usage.get_model_stats(),
+        "recommendation_cache": recommendation_cache.get_stats(),
+        "transport": llm_transport.get_stats() if llm_transport is not None else None,
+        "answer_journal": answer_journal.get_stats() if answer_journal is not None else None,
+        "deadlines": deadline_scheduler.get_stats()
+    })
+
+@app.route('/api/reports/export', methods=['GET'])
+def export_all_reports():
+    """Stream every stored report matching the filters as NDJSON or CSV (admin only)."""
+    denied = admin_denied()
+    if denied:
+        return denied
+    try:
+        chunks, mimetype, export_format = report_export(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=reports.{export_format}"}
+    )
+
+@app.route('/api/reports/<report_id>/html', methods=['GET'])
+def get_report_html(report_id):
+    return report_html_response(report_id)
+
+@app.route('/api/reports/<report_id>/pdf', methods=['POST'])
+def render_report_pdf(report_id):
+    """Queue a PDF render in the worker pool; poll the job for the file (admin only)."""
+    denied = admin_denied()
+    if denied:
+        return denied
+    payload, status = queue_report_pdf(report_id)
+    return jsonify(payload), status
+
+@app.route('/api/reports/pdf/batch', methods=['POST'])
+def render_report_pdf_batch():
+    """Queue PDFs for every report matching the filters (default: this week's reports; admin only)."""
+    denied = admin_denied()
+    if denied:
+        return denied
+    payload, status = queue_report_pdf_batch(request.get_json(silent=True) or {})
+    return jsonify(payload), status
+
+@app.route('/api/reports/pdf/batches/<batch_id>', methods=['GET'])
+def get_pdf_batch(batch_id):
+    denied = admin_denied()
+    if denied:
+        return denied
+    batch = pdf_service.get_batch(batch_id)
+    if batch is None:
+        return jsonify({"error": "Batch not found"}), 404
+    return jsonify(batch)
+
+@app.route('/api/reports/pdf/jobs/<job_id>', methods=['GET'])
+def get_pdf_job(job_id):
+    denied = admin_denied()
+    if denied:
+        return denied
+    job = pdf_service.get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(pdf_job_response(job))
+
+@app.route('/api/reports/pdf/jobs/<job_id>/file', methods=['GET'])
+def get_pdf_file(job_id):
+    denied = admin_denied()
+    if denied:
+        return denied
+    job = pdf_service.get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if job['status'] != 'done':
+        return jsonify(pdf_job_response(job)), 409
+    return send_file(job['pdf_path'], mimetype='application/pdf', as_attachment=True,
+                     download_name=f"{job['report_id']}.pdf", conditional=True)
+
+@app.route('/api/reports/search', methods=['GET'])
+def search_reports():
+    """Paginated report search (admin only), e.g. ?role=DevOps Engineer&experience=Senior&since=2026-09-01"""
+    denied = admin_denied()
+    if denied:
+        return denied
+    try:
+        page = report_search(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return jsonify(page)
+
 @app.route('/api/session/<session_id>/export/<format>', methods=['GET'])
 def export_report(session_id, format):
-    if session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         return jsonify({"error": "Session not found"}), 404
     
-    session = sessions[session_id]
     scores = session["scores"]
     
     if format == 'json':
         return jsonify({"candidate": session["candidate_name"], "scores": scores})
     
+    if format == 'html':
+        if not session.get("report_id"):
+            return jsonify({"error": "Interview not completed"}), 409
+        return report_html_response(session["report_id"])
+    
     return jsonify({"error": "Invalid format"}), 400
 
 if __name__ == '__main__':
     print("\n" + "🎯 "*20)
     print("INTERVIEW ENGINE STARTED")
     print("🎯 "*20 + "\n")
+    start_config_watcher()
+    start_indexing()
+    start_model_keeper()
+    start_deadline_scheduler()
+    install_profile_signal()
     app.run(debug=True, port=5000, host='0.0.0.0')
\ No newline at end of file
@@ -0,0 +1,618 @@
+#!/usr/bin/env python3
+"""
+ASGI variant of the interview API (requires quart, quart-cors and httpx).
+
+Run from the backend directory:
+    hypercorn asgi:app --bind 0.0.0.0:5000
+
+Routes and payloads match app.py, except the /api/admin/profile routes: the
+sampling profiler follows the thread serving each request, and here every
+request shares the event loop's thread. LLM calls go through
+AsyncInterviewAgent, so a candidate waiting on Ollama holds a coroutine
+rather than a thread and one process can keep hundreds of interviews in
+flight. Blocking work (SQLite, report files, scoring heuristics) runs in
+worker threads.
+
+/ws/interview carries a whole interview over one WebSocket. Each message is a
+JSON object with a "type":
+
+    client -> server: start (candidate fields), resume (session_id), answer
+                      (question_index, answer), complete, render_pdf
+    server -> client: session, score, token (follow-up text as generated),
+                      followup, complete, pdf_ready, pdf_failed, error
+
+Payloads of session/followup/complete match the HTTP responses. A malformed
+message (not an object, missing candidate fields, a non-integer
+question_index) gets an error event and the socket stays open. Drafts are
+autosaved over HTTP (PUT /api/session/<id>/draft); an answer that arrives
+after its question's time limit gets a followup with "expired": true and the
+score of the draft submitted in its place.
+"""
+import asyncio
+from quart import Quart, Response, request, jsonify, websocket, send_file
+from quart_cors import cors
+
+from app import (
+    config_manager,
+    sessions,
+    answer_journal,
+    response_cache,
+    llm_scheduler,
+    heuristic_score,
+    check_duplicate,
+    client_duplicate,
+    client_report,
+    create_session,
+    create_sessions_bulk,
+    begin_session,
+    bulk_candidates,
+    bulk_results_stream,
+    admin_check,
+    client_question,
+    client_questions,
+    session_start_payload,
+    fallback_score,
+    record_answer,
+    mark_reported,
+    build_report,
+    save_report,
+    report_generator,
+    DEFAULT_RECOMMENDATIONS,
+    recommendation_cache,
+    recommendation_lookup,
+    start_config_watcher,
+    start_indexing,
+    start_model_keeper,
+    start_deadline_scheduler,
+    deadline_scheduler,
+    reap_hooks,
+    claim_question,
+    save_draft,
+    deadline_payload,
+    timed_out_payload,
+    QuestionClosed,
+    model_keeper,
+    pdf_service,
+    pdf_job_response,
+    queue_report_pdf,
+    queue_report_pdf_batch,
+    report_html,
+    report_export,
+    report_search,
+    llm_transport,
+)
+from llm_agent import AsyncInterviewAgent
+from reports.report_archive import find_report_path
+from llm.scheduler import Priority, SchedulerOverloaded
+from llm.model_keeper import ModelNotReady
+from sessions.bulk import CANDIDATE_FIELDS, validate_candidate
+
+app = cors(Quart(__name__))
+
+llm_agent = AsyncInterviewAgent.from_settings(config_manager.get_llm_settings())
+if llm_transport is not None:
+    llm_transport.install(llm_agent)
+reap_hooks.append(llm_agent.forget_session)
+
+@app.before_serving
+async def watch_config():
+    start_config_watcher()
+    start_indexing()
+    start_model_keeper()
+    start_deadline_scheduler()
+
+@app.after_serving
+async def close_llm_client():
+    await llm_agent.aclose()
+
+async def _score(session_id, question, answer):
+    """LLM score under the scheduler, falling back to the heuristic or neutral score."""
+    try:
+        model_keeper.check_ready('score')
+        return await llm_scheduler.run_async(
+            Priority.LIVE_SCORING,
+            llm_agent.score_answer,
+            question=question.get('text', ''),
+            answer=answer,
+            expected_concepts=question.get('keywords', []),
+            session_id=session_id
+        )
+    except (SchedulerOverloaded, ModelNotReady):
+        return await asyncio.to_thread(heuristic_score, question, answer)
+    except Exception as e:
+        print(f"❌ ERROR SCORING ANSWER: {e}")
+        return fallback_score(e)
+
+async def _followup(session_id, question, answer, on_token=None):
+    """Follow-up question or None; with on_token, the text is passed on as it is generated."""
+    kwargs = dict(
+        question=question.get('text', ''),
+        answer=answer,
+        question_context=question.get('context', ''),
+        session_id=session_id
+    )
+    try:
+        model_keeper.check_ready('followup')
+        if on_token is None:
+            return await llm_scheduler.run_async(Priority.FOLLOWUP, llm_agent.generate_followup, **kwargs)
+
+        await llm_scheduler.acquire_async(Priority.FOLLOWUP)
+        try:
+            parts = []
+            async for text in llm_agent.stream_followup(**kwargs):
+                parts.append(text)
+                await on_token(text)
+            return ''.join(parts).strip()
+        finally:
+            llm_scheduler.release(Priority.FOLLOWUP)
+    except (SchedulerOverloaded, ModelNotReady):
+        return question.get('follow_up')
+    except Exception as e:
+        print(f"❌ ERROR GENERATING FOLLOW-UP: {e}")
+        return None
+
+async def _complete(session_id, session, include_html=False):
+    """Recommendations, report and storage for a finished interview; returns the response payload."""
+    key, profile, cached = recommendation_lookup(session)
+    try:
+        if cached is not None:
+            recommendations = {"recommendations": cached}
+        elif key is None:
+            recommendations = await llm_scheduler.run_async(
+                Priority.RECOMMENDATIONS, llm_agent.generate_recommendations, session["answers"], session["scores"],
+                session_id=session_id
+            )
+        else:
+            recommendations = await llm_scheduler.run_async(
+                Priority.RECOMMENDATIONS, llm_agent.generate_profile_recommendations, profile
+            )
+            recommendation_cache.put(key, recommendations['recommendations'])
+    except Exception as e:
+        print(f"❌ ERROR GENERATING RECOMMENDATIONS: {e}")
+        recommendations = DEFAULT_RECOMMENDATIONS
+
+    llm_agent.forget_session(session_id)
+
+    report_data = build_report(session, recommendations)
+    # Compression and file writes are blocking; keep them off the event loop
+    report_id = await asyncio.to_thread(save_report, report_data)
+    await asyncio.to_thread(mark_reported, session_id, report_id)
+
+    response = {
+        "success": True,
+        "report": client_report(report_data),
+        "report_id": report_id,
+        "html_url": f"/api/reports/{report_id}/html"
+    }
+    if include_html or config_manager.get_report_storage_settings().get('include_html_in_response', False):
+        response["html_report"] = report_generator.render_report_html(report_data)
+    return response
+
+def admin_denied():
+    """Error response unless the request carries the ADMIN_TOKEN."""
+    denied = admin_check(request.headers.get('X-Admin-Token', ''))
+    return (jsonify({"error": denied[0]}), denied[1]) if denied else None
+
+async def _report_html_response(report_id):
+    status, html, headers = await asyncio.to_thread(report_html, report_id, request.if_none_match)
+    if status == 404:
+        return jsonify({"error": "Report not found"}), 404
+    return Response(html or '', status=status, mimetype='text/html', headers=headers)
+
+async def _encoded_in_thread(chunks):
+    """Stream a blocking generator of text (report files being read) without blocking the event loop."""
+    chunks = iter(chunks)
+    while True:
+        chunk = await asyncio.to_thread(next, chunks, None)
+        if chunk is None:
+            return
+        yield chunk.encode('utf-8')
+
+@app.route('/api/config', methods=['GET'])
+async def get_config():
+    cached = response_cache.get_or_build('config', lambda: {
+        "roles": config_manager.get_roles(),
+        "experience_levels": config_manager.get_experience_levels(),
+        "domains": config_manager.get_domains(),
+        "difficulties": config_manager.get_difficulty_levels(),
+        "settings": config_manager.get_interview_settings()
+    }, "public, max-age=300")
+    return cached.to_response(request, Response)
+
+@app.route('/api/session/start', methods=['POST'])
+async def start_session():
+    data = await request.get_json()
+    # Question selection and the journal's commit wait are blocking
+    session_id, session = await asyncio.to_thread(create_session, data)
+    include_questions = bool(data.get('include_questions')) or request.args.get('include') == 'questions'
+    return jsonify(session_start_payload(session_id, session, include_questions))
+
+@app.route('/api/session/<session_id>/begin', methods=['POST'])
+async def begin_interview(session_id):
+    try:
+        session = await asyncio.to_thread(begin_session, session_id)
+    except KeyError:
+        return jsonify({"error": "Session not found"}), 404
+    return jsonify(dict(session_start_payload(session_id, session, include_questions=True),
+                        answered=len(session["answers"])))
+
+@app.route('/api/sessions/bulk', methods=['POST'])
+async def create_bulk_sessions():
+    denied = admin_denied()
+    if denied:
+        return denied
+    output_format = request.args.get('format', 'ndjson')
+    if output_format not in ('ndjson', 'csv'):
+        return jsonify({"error": "Invalid format"}), 400
+
+    settings = config_manager.get_bulk_session_settings()
+    files = await request.files
+    try:
+        candidates = bulk_candidates(b'' if files else await request.get_data(), request.content_type or '', files)
+    except ValueError as e:
+        return jsonify({"error": f"Could not read candidates: {e}"}), 400
+    if len(candidates) > settings.get('max_candidates', 10000):
+        return jsonify({"error": f"At most {settings.get('max_candidates', 10000)} candidates per request"}), 413
+
+    # Validation, pooling and the store transaction are blocking
+    results = await asyncio.to_thread(create_sessions_bulk, candidates,
+                                      request.args.get('link_base') or settings.get('link_base', ''))
+    chunks, mimetype = bulk_results_stream(results, output_format)
+
+    async def stream():
+        for chunk in chunks:
+            yield chunk.encode('utf-8')
+
+    return Response(stream(), mimetype=mimetype,
+                    headers={"Content-Disposition": f"attachment; filename=sessions.{output_format}"})
+
+@app.route('/api/session/<session_id>/questions', methods=['GET'])
+async def get_question_set(session_id):
+    cached = response_cache.get(('questions', session_id))
+    if cached is not None:
+        return cached.to_response(request, Response)
+
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Session not found"}), 404
+
+    payload = {"questions": client_questions(session["questions"])}
+    cached = response_cache.put(('questions', session_id), payload, "private, max-age=3600")
+    return cached.to_response(request, Response)
+
+@app.route('/api/session/<session_id>/question/<int:index>', methods=['GET'])
+async def get_question(session_id, index):
+    cached = response_cache.get(('question', session_id, index))
+    if cached is not None:
+        return cached.to_response(request, Response)
+
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Session not found"}), 404
+
+    questions = session["questions"]
+    if index >= len(questions):
+        return jsonify({"error": "Index out of range"}), 400
+
+    cached = response_cache.put(('question', session_id, index), client_question(questions[index]),
+                                "private, max-age=3600")
+    return cached.to_response(request, Response)
+
+@app.route('/api/session/<session_id>/answer', methods=['POST'])
+async def submit_answer(session_id):
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Session not found"}), 404
+
+    data = await request.get_json()
+    question_index = data.get('question_index', 0)
+    answer = data.get('answer', '')
+
+    questions = session["questions"]
+    question = questions[question_index]
+
+    try:
+        await asyncio.to_thread(claim_question, session_id, question_index)
+    except QuestionClosed:
+        payload = await asyncio.to_thread(timed_out_payload, session_id, question_index, len(questions))
+        return jsonify(payload), 409
+
+    duplicate, score_result = await asyncio.to_thread(check_duplicate, question, answer)
+    if score_result is None and llm_agent.shares_context(session_id):
+        # The follow-up continues the scoring call's context instead of
+        # re-encoding the question and answer, so it has to wait for it
+        score_result = await _score(session_id, question, answer)
+        followup_question = await _followup(session_id, question, answer)
+    elif score_result is None:
+        score_result, followup_question = await asyncio.gather(
+            _score(session_id, question, answer), _followup(session_id, question, answer))
+    else:
+        followup_question = await _followup(session_id, question, answer)
+
+    stored = await asyncio.to_thread(record_answer, session_id, question_index, question, answer, score_result,
+                                     duplicate)
+
+    return jsonify({
+        "score": score_result,
+        "duplicate": client_duplicate(duplicate),
+        "followup_question": followup_question,
+        "next_question_index": question_index + 1,
+        "total_questions": len(questions),
+        "deadline": deadline_payload(stored)
+    })
+
+@app.route('/api/session/<session_id>/draft', methods=['PUT'])
+async def save_answer_draft(session_id):
+    data = await request.get_json() or {}
+    try:
+        session = await asyncio.to_thread(save_draft, session_id, data.get('question_index', 0),
+                                          data.get('answer', ''))
+    except KeyError:
+        return jsonify({"error": "Session not found"}), 404
+    except QuestionClosed:
+        return jsonify({"error": "Time is up for this question", "expired": True}), 409
+    return jsonify({"saved": True, "deadline": deadline_payload(session)})
+
+@app.route('/api/session/<session_id>/complete', methods=['POST'])
+async def complete_interview(session_id):
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Session not found"}), 404
+
+    return jsonify(await _complete(session_id, session, request.args.get('include_html') == '1'))
+
+@app.route('/api/health', methods=['GET'])
+async def health():
+    llm = model_keeper.get_status(llm_agent.usage)
+    return jsonify({
+        "status": "ok" if llm['ready'] or not llm['managed'] else "degraded",
+        "llm": llm
+    })
+
+@app.route('/api/llm/metrics', methods=['GET'])
+async def llm_metrics():
+    return jsonify({
+        "scheduler": llm_scheduler.get_metrics(),
+        "usage": llm_agent.usage.get_stats(),
+        "models": llm_agent.usage.get_model_stats(),
+        "recommendation_cache": recommendation_cache.get_stats(),
+        "transport": llm_transport.get_stats() if llm_transport is not None else None,
+        "answer_journal": answer_journal.get_stats() if answer_journal is not None else None,
+        "deadlines": deadline_scheduler.get_stats()
+    })
+
+@app.route('/api/session/<session_id>/export/<format>', methods=['GET'])
+async def export_report(session_id, format):
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Session not found"}), 404
+
+    scores = session["scores"]
+
+    if format == 'json':
+        return jsonify({"candidate": session["candidate_name"], "scores": scores})
+
+    if format == 'html':
+        if not session.get("report_id"):
+            return jsonify({"error": "Interview not completed"}), 409
+        return await _report_html_response(session["report_id"])
+
+    return jsonify({"error": "Invalid format"}), 400
+
+@app.route('/api/reports/export', methods=['GET'])
+async def export_all_reports():
+    """Stream every stored report matching the filters as NDJSON or CSV (admin only)."""
+    denied = admin_denied()
+    if denied:
+        return denied
+    try:
+        chunks, mimetype, export_format = report_export(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return Response(_encoded_in_thread(chunks), mimetype=mimetype,
+                    headers={"Content-Disposition": f"attachment; filename=reports.{export_format}"})
+
+@app.route('/api/reports/search', methods=['GET'])
+async def search_reports():
+    """Paginated report search (admin only)."""
+    denied = admin_denied()
+    if denied:
+        return denied
+    try:
+        page = await asyncio.to_thread(report_search, request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(page)
+
+@app.route('/api/reports/<report_id>/html', methods=['GET'])
+async def get_report_html(report_id):
+    return await _report_html_response(report_id)
+
+@app.route('/api/reports/<report_id>/pdf', methods=['POST'])
+async def render_report_pdf(report_id):
+    """Queue a PDF render in the worker pool; poll the job for the file (admin only)."""
+    denied = admin_denied()
+    if denied:
+        return denied
+    payload, status = await asyncio.to_thread(queue_report_pdf, report_id)
+    return jsonify(payload), status
+
+@app.route('/api/reports/pdf/batch', methods=['POST'])
+async def render_report_pdf_batch():
+    """Queue PDFs for every report matching the filters (default: this week's reports; admin only)."""
+    denied = admin_denied()
+    if denied:
+        return denied
+    data = await request.get_json(silent=True) or {}
+    payload, status = await asyncio.to_thread(queue_report_pdf_batch, data)
+    return jsonify(payload), status
+
+@app.route('/api/reports/pdf/batches/<batch_id>', methods=['GET'])
+async def get_pdf_batch(batch_id):
+    denied = admin_denied()
+    if denied:
+        return denied
+    batch = pdf_service.get_batch(batch_id)
+    if batch is None:
+        return jsonify({"error": "Batch not found"}), 404
+    return jsonify(batch)
+
+@app.route('/api/reports/pdf/jobs/<job_id>', methods=['GET'])
+async def get_pdf_job(job_id):
+    denied = admin_denied()
+    if denied:
+        return denied
+    job = pdf_service.get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(pdf_job_response(job))
+
+@app.route('/api/reports/pdf/jobs/<job_id>/file', methods=['GET'])
+async def get_pdf_file(job_id):
+    denied = admin_denied()
+    if denied:
+        return denied
+    job = pdf_service.get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if job['status'] != 'done':
+        return jsonify(pdf_job_response(job)), 409
+    return await send_file(job['pdf_path'], mimetype='application/pdf', as_attachment=True,
+                           attachment_filename=f"{job['report_id']}.pdf", conditional=True)
+
+class _Channel:
+    """Serializes sends on one socket; background tasks push events through it too."""
+
+    def __init__(self):
+        self.session_id = None
+        self.tasks = set()
+        self._send_lock = asyncio.Lock()
+
+    async def send(self, event, **data):
+        async with self._send_lock:
+            await websocket.send_json({"type": event, **data})
+
+    def spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+async def _push_pdf_when_ready(channel, job):
+    while (pdf_service.get_job(job['job_id']) or job)['status'] == 'queued':
+        await asyncio.sleep(0.5)
+    if job['status'] == 'done':
+        await channel.send('pdf_ready', job_id=job['job_id'], report_id=job['report_id'],
+                           pdf_url=f"/api/reports/pdf/jobs/{job['job_id']}/file")
+    else:
+        await channel.send('pdf_failed', job_id=job['job_id'], error=job['error'])
+
+async def _ws_start(channel, message):
+    candidate = {field: str(message.get(field) or '').strip() for field in CANDIDATE_FIELDS}
+    error = validate_candidate(candidate, config_manager)
+    if error:
+        await channel.send('error', error=error)
+        return
+    session_id, session = await asyncio.to_thread(create_session, message)
+    channel.session_id = session_id
+    await channel.send('session', **session_start_payload(session_id, session, include_questions=True))
+
+async def _ws_resume(channel, message):
+    if message.get('session_id') not in sessions:
+        await channel.send('error', error="Session not found")
+        return
+    channel.session_id = message['session_id']
+    session = sessions[channel.session_id]
+    await channel.send('session', **session_start_payload(channel.session_id, session, include_questions=True),
+                       answered=len(session["answers"]))
+
+async def _ws_answer(channel, message, session):
+    question_index = message.get('question_index', 0)
+    answer = message.get('answer', '')
+    if type(question_index) is not int or not isinstance(answer, str):
+        await channel.send('error', error="question_index must be an integer and answer a string")
+        return
+    questions = session["questions"]
+    if not 0 <= question_index < len(questions):
+        await channel.send('error', error="Index out of range")
+        return
+    question = questions[question_index]
+
+    try:
+        await asyncio.to_thread(claim_question, channel.session_id, question_index)
+    except QuestionClosed:
+        # Answered too late: the saved draft was submitted instead
+        payload = await asyncio.to_thread(timed_out_payload, channel.session_id, question_index, len(questions))
+        await channel.send('followup', **{k: v for k, v in payload.items() if k != 'error'})
+        return
+
+    duplicate, score_result = await asyncio.to_thread(check_duplicate, question, answer)
+    score_result = score_result or await _score(channel.session_id, question, answer)
+    stored = await asyncio.to_thread(record_answer, channel.session_id, question_index, question, answer,
+                                     score_result, duplicate)
+    await channel.send('score', question_index=question_index, score=score_result,
+                       duplicate=client_duplicate(duplicate))
+
+    async def on_token(text):
+        await channel.send('token', question_index=question_index, text=text)
+
+    followup_question = await _followup(channel.session_id, question, answer, on_token)
+    await channel.send('followup', score=score_result, duplicate=client_duplicate(duplicate),
+                       followup_question=followup_question,
+                       next_question_index=question_index + 1, total_questions=len(questions),
+                       deadline=deadline_payload(stored))
+
+async def _ws_render_pdf(channel, session):
+    if not session.get("report_id"):
+        await channel.send('error', error="Interview not completed")
+    elif not pdf_service.available():
+        await channel.send('error', error="PDF generation requires weasyprint")
+    else:
+        path = find_report_path(session["report_id"])
+        if path is None:
+            await channel.send('error', error="Report not found")
+            return
+        job = await asyncio.to_thread(pdf_service.submit, session["report_id"], path)
+        channel.spawn(_push_pdf_when_ready(channel, job))
+
+@app.websocket('/ws/interview')
+async def interview_channel():
+    """One socket per interview; see the module docstring for the message types."""
+    channel = _Channel()
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except ValueError:
+                await channel.send('error', error="Invalid JSON")
+                continue
+            if not isinstance(message, dict):
+                await channel.send('error', error="Expected a JSON object")
+                continue
+
+            kind = message.get('type')
+            if kind == 'start':
+                await _ws_start(channel, message)
+                continue
+            if kind == 'resume':
+                await _ws_resume(channel, message)
+                continue
+
+            session = sessions.get(channel.session_id) if channel.session_id else None
+            if session is None:
+                await channel.send('error', error="No session; send start or resume first")
+            elif kind == 'answer':
+                await _ws_answer(channel, message, session)
+            elif kind == 'complete':
+                await channel.send('complete', **await _complete(channel.session_id, session,
+                                                                 bool(message.get('include_html'))))
+            elif kind == 'render_pdf':
+                await _ws_render_pdf(channel, session)
+            else:
+                await channel.send('error', error=f"Unknown message type: {kind}")
+    finally:
+        for task in channel.tasks:
+            task.cancel()
+
+if __name__ == '__main__':
+    app.run(port=5000, host='0.0.0.0')
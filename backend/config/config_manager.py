@@ -1,6 +1,34 @@
 import json
 import os
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, Callable
+
+class ConfigSnapshot:
+    """
+    One immutable view of defaults.json with its lookups precomputed.
+    
+    ConfigManager swaps whole snapshots, so a request that reads several
+    values from one snapshot never sees half of a reload.
+    """
+    
+    def __init__(self, config: Dict[str, Any], version: int = 1):
+        self.raw = config
+        self.version = version
+    
+        self.roles: List[str] = list(config.get('roles', []))
+        self.experience_levels: List[str] = list(config.get('experience_levels', []))
+        self.domains: List[str] = list(config.get('domains', []))
+        self.difficulty_levels: List[str] = list(config.get('difficulty_levels', []))
+        self.role_set = frozenset(self.roles)
+        self.experience_level_set = frozenset(self.experience_levels)
+        self.domain_set = frozenset(self.domains)
+    
+        self.rubric: Dict[str, Dict[str, str]] = config.get('scoring_rubric', {})
+        self.interview_settings: Dict[str, Any] = config.get('interview_settings', {})
+        self.max_questions = int(self.interview_settings.get('max_questions', 5))
+        self.max_followups_per_question = int(self.interview_settings.get('max_followups_per_question', 1))
+        self.time_per_question_minutes = float(self.interview_settings.get('time_per_question_minutes', 5))
+        self.reveal_scores = bool(self.interview_settings.get('reveal_scores', False))
 
 class ConfigManager:
     """Manages interview configuration and settings."""
@@ -9,7 +37,14 @@ class ConfigManager:
         self.config_path = config_path or os.path.join(
             os.path.dirname(__file__), 'defaults.json'
         )
-        self.config = self._load_config()
+        self._subscribers: List[Callable[[ConfigSnapshot], None]] = []
+        self._reload_lock = threading.Lock()
+        self.snapshot = ConfigSnapshot(self._load_config())
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Raw configuration dict of the current snapshot."""
+        return self.snapshot.raw
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from JSON file."""
@@ -19,34 +54,101 @@ class ConfigManager:
         except FileNotFoundError:
             raise FileNotFoundError(f"Config file not found: {self.config_path}")
     
+    def subscribe(self, callback: Callable[[ConfigSnapshot], None]):
+        """Call callback(snapshot) after every successful reload."""
+        self._subscribers.append(callback)
+    
+    def reload(self) -> bool:
+        """
+        Re-read the configuration file and swap in a new snapshot.
+    
+        A file that is missing or not valid JSON (e.g. caught mid-edit) keeps
+        the current snapshot. Returns whether a new snapshot was installed.
+        """
+        with self._reload_lock:
+            try:
+                snapshot = ConfigSnapshot(self._load_config(), self.snapshot.version + 1)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Keeping current config, reload failed: {e}")
+                return False
+            self.snapshot = snapshot
+    
+        print(f"🔄 Config reloaded (version {snapshot.version})")
+        for callback in self._subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"⚠️ Config subscriber failed: {e}")
+        return True
+    
     def get_roles(self) -> List[str]:
         """Get list of available roles."""
-        return self.config.get('roles', [])
+        return self.snapshot.roles
     
     def get_experience_levels(self) -> List[str]:
         """Get list of experience levels."""
-        return self.config.get('experience_levels', [])
+        return self.snapshot.experience_levels
     
     def get_domains(self) -> List[str]:
         """Get list of interview domains."""
-        return self.config.get('domains', [])
+        return self.snapshot.domains
     
     def get_difficulty_levels(self) -> List[str]:
         """Get list of difficulty levels."""
-        return self.config.get('difficulty_levels', [])
+        return self.snapshot.difficulty_levels
     
     def get_rubric(self) -> Dict[str, Dict[str, str]]:
         """Get scoring rubric."""
-        return self.config.get('scoring_rubric', {})
+        return self.snapshot.rubric
     
     def get_interview_settings(self) -> Dict[str, Any]:
         """Get interview settings."""
-        return self.config.get('interview_settings', {})
+        return self.snapshot.interview_settings
+    
+    def get_report_storage_settings(self) -> Dict[str, Any]:
+        """Get report storage format and HTML options."""
+        return self.config.get('report_storage', {})
+    
+    def get_llm_settings(self) -> Dict[str, Any]:
+        """Get LLM model and prompt-reuse settings."""
+        return self.config.get('llm', {})
+    
+    def get_llm_keeper_settings(self) -> Dict[str, Any]:
+        """Get model warm-up and keep-alive settings."""
+        return self.config.get('llm_keeper', {})
+    
+    def get_llm_scheduler_settings(self) -> Dict[str, Any]:
+        """Get LLM scheduler settings (concurrency is per server process)."""
+        return self.config.get('llm_scheduler', {})
+    
+    def get_pdf_rendering_settings(self) -> Dict[str, Any]:
+        """Get PDF render pool settings (max_workers defaults to one per core)."""
+        return self.config.get('pdf_rendering', {})
+    
+    def get_recommendation_cache_settings(self) -> Dict[str, Any]:
+        """Get score-profile bucketing for cached recommendations."""
+        return self.config.get('recommendation_cache', {})
+    
+    def get_duplicate_detection_settings(self) -> Dict[str, Any]:
+        """Get near-duplicate answer detection and score reuse settings."""
+        return self.config.get('duplicate_detection', {})
+    
+    def get_answer_journal_settings(self) -> Dict[str, Any]:
+        """Get write-ahead answer journal durability and compaction settings."""
+        return self.config.get('answer_journal', {})
+    
+    def get_question_timeout_settings(self) -> Dict[str, Any]:
+        """Get per-question time limit enforcement and abandoned-session reaping settings."""
+        return self.config.get('question_timeouts', {})
+    
+    def get_bulk_session_settings(self) -> Dict[str, Any]:
+        """Get bulk session creation limits and the candidate link base URL."""
+        return self.config.get('bulk_sessions', {})
     
     def validate_role(self, role: str) -> bool:
         """Validate if role exists."""
-        return role in self.get_roles()
+        return role in self.snapshot.role_set
     
     def validate_experience_level(self, level: str) -> bool:
         """Validate if experience level exists."""
-        return level in self.get_experience_levels()
+        return level in self.snapshot.experience_level_set
@@ -0,0 +1,70 @@
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+class FileWatcher:
+    """
+    Polls file modification times on one daemon thread and runs callbacks on change.
+
+    Threads do not survive fork, so pre-forked servers start the watcher in
+    each worker (see gunicorn.conf.py); start() is a no-op if this process
+    already runs it.
+    """
+
+    def __init__(self, interval: float = 2.0):
+        self.interval = interval
+        self._callbacks: Dict[str, List[Callable[[], None]]] = {}
+        self._mtimes: Dict[str, Optional[int]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    @staticmethod
+    def _mtime(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def watch(self, path: str, callback: Callable[[], None]):
+        """Run callback whenever path changes; callbacks for one path run in registration order."""
+        with self._lock:
+            if path not in self._callbacks:
+                self._callbacks[path] = []
+                self._mtimes[path] = self._mtime(path)
+            self._callbacks[path].append(callback)
+
+    def check(self) -> List[str]:
+        """Poll once; returns the paths that changed."""
+        with self._lock:
+            changed = []
+            for path in self._callbacks:
+                mtime = self._mtime(path)
+                if mtime != self._mtimes[path]:
+                    self._mtimes[path] = mtime
+                    changed.append(path)
+            callbacks = [(path, list(self._callbacks[path])) for path in changed]
+
+        for path, path_callbacks in callbacks:
+            for callback in path_callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"⚠️ Reload after change to {path} failed: {e}")
+        return changed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        self._stop.clear()
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='config-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
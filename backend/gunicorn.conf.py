@@ -0,0 +1,31 @@
+# Gunicorn settings for wsgi.py (pre-fork worker mode)
+import multiprocessing
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+
+# One worker per core; threads cover requests blocked on the LLM.
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+# The app sizes per-worker pools (PDF rendering) from it
+os.environ['WEB_CONCURRENCY'] = str(workers)
+threads = int(os.getenv('WORKER_THREADS', 4))
+worker_class = 'gthread'
+timeout = 120
+
+# Import wsgi.py (and freeze the shared data) in the master before forking.
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Threads started in the master do not survive fork
+    from app import start_config_watcher, start_indexing, start_model_keeper, start_deadline_scheduler
+    start_config_watcher()
+    start_indexing()
+    start_model_keeper()
+    start_deadline_scheduler()
+
+
+def post_worker_init(worker):
+    # The worker resets its signal handlers after post_fork, so install this one last
+    from app import install_profile_signal
+    install_profile_signal()
@@ -0,0 +1,91 @@
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from flask import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+class CachedResponse:
+    """A JSON payload serialized once, with its strong ETag and pre-compressed bodies."""
+
+    def __init__(self, payload: Any, cache_control: str, min_compress_size: int = 1024):
+        self.body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+        self.cache_control = cache_control
+        self.encoded: Dict[str, bytes] = {}
+        if len(self.body) >= min_compress_size:
+            if brotli is not None:
+                self.encoded['br'] = brotli.compress(self.body, quality=5)
+            self.encoded['gzip'] = gzip.compress(self.body, compresslevel=6)
+
+    def to_response(self, request, response_class=Response):
+        """
+        Serve as 304 if the client's copy is current, else the best encoding it accepts.
+
+        response_class lets the Quart app pass its own Response type.
+        """
+        encoding = next((e for e in ('br', 'gzip') if e in self.encoded and e in request.accept_encodings), None)
+        # Strong ETags are per representation, so compressed bodies get their own
+        etag = f"{self.etag}-{encoding}" if encoding else self.etag
+        headers = {"ETag": f'"{etag}"', "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+
+        if request.if_none_match.contains(etag):
+            return response_class(b'', status=304, headers=headers)
+
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            return response_class(self.encoded[encoding], mimetype='application/json', headers=headers)
+        return response_class(self.body, mimetype='application/json', headers=headers)
+
+
+class ResponseCache:
+    """
+    Pre-serialized JSON responses for payloads that rarely change (LRU).
+
+    app.py clears it whenever the config or question bank is reloaded.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, payload: Any, cache_control: str) -> CachedResponse:
+        entry = CachedResponse(payload, cache_control)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get_or_build(self, key, builder: Callable[[], Any], cache_control: str) -> CachedResponse:
+        entry = self.get(key)
+        if entry is None:
+            entry = self.put(key, builder(), cache_control)
+        return entry
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
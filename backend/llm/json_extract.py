@@ -0,0 +1,115 @@
+import json
+import re
+from typing import Dict, Any, Optional, Sequence
+
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+_SMART_QUOTES = str.maketrans({'“': '"', '”': '"'})
+
+def _loads_lenient(text: str) -> Optional[Any]:
+    """json.loads, retrying once with trailing commas and smart quotes fixed."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    try:
+        return json.loads(_TRAILING_COMMA.sub(r'\1', text.translate(_SMART_QUOTES)))
+    except ValueError:
+        return None
+
+
+class JSONObjectExtractor:
+    """
+    Incrementally finds the first JSON object in noisy, streamed LLM output.
+
+    Text outside braces (prose, ```json fences) is skipped. Feed tokens as they
+    arrive; feed() returns the object as soon as its closing brace is seen, so
+    the caller can stop the generation there. Each character is scanned once
+    unless a brace-balanced span fails to parse, in which case scanning resumes
+    just after its opening brace to look for a nested object.
+    """
+
+    def __init__(self, required: Sequence[str] = ()):
+        self.required = tuple(required)
+        self.result = None
+        self._text = ''
+        self._pos = 0
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def _reset_scan(self, pos: int):
+        self._pos = pos
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def _accept(self, obj: Any) -> bool:
+        return isinstance(obj, dict) and all(key in obj for key in self.required)
+
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        """Add streamed text; returns the object once one is complete."""
+        if self.result is not None:
+            return self.result
+        self._text += chunk
+        text = self._text
+
+        while self._pos < len(text):
+            ch = text[self._pos]
+            self._pos += 1
+
+            if self._depth == 0:
+                if ch == '{':
+                    self._start = self._pos - 1
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == '{':
+                self._depth += 1
+            elif ch == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    obj = _loads_lenient(text[self._start:self._pos])
+                    if self._accept(obj):
+                        self.result = obj
+                        return obj
+                    self._reset_scan(self._start + 1)
+
+        return None
+
+    def finish(self) -> Optional[Dict[str, Any]]:
+        """
+        Salvage an object from output that ended early (e.g. hit num_predict).
+
+        Closes an open string and any open braces of the pending object and
+        tries to parse what is there; failing that, drops the last partial
+        member and tries again.
+        """
+        if self.result is not None or self._start < 0:
+            return self.result
+        tail = self._text[self._start:]
+        candidates = [tail + ('"' if self._in_string else '')]
+        if ',' in tail:
+            candidates.append(tail[:tail.rfind(',')])
+        for candidate in candidates:
+            obj = _loads_lenient(candidate.rstrip().rstrip(',') + '}' * self._depth)
+            if self._accept(obj):
+                self.result = obj
+                break
+        return self.result
+
+
+def extract_json_object(text: str, required: Sequence[str] = ()) -> Optional[Dict[str, Any]]:
+    """First JSON object in text that has all required keys, or None."""
+    extractor = JSONObjectExtractor(required)
+    return extractor.feed(text) or extractor.finish()
@@ -0,0 +1,220 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+import requests
+
+
+class ModelNotReady(Exception):
+    """Raised instead of making a live call wait while Ollama loads a model."""
+
+
+class ModelKeeper:
+    """
+    Keeps the agent's models loaded in Ollama so live calls never pay the load.
+
+    A daemon thread warms every model the agent routes to as soon as it
+    starts, then polls /api/ps. During business hours it re-warms models that
+    were unloaded and pings resident ones (an empty generate with keep_alive)
+    so they never expire. Outside business hours models may expire; the next
+    live call that needs one gets ModelNotReady and wakes the thread to load
+    it, so the caller falls back right away instead of waiting on the load.
+
+    Like FileWatcher, the thread is started per serving process (start() is
+    a no-op if this process already runs it). Until it is started, every
+    model counts as ready.
+    """
+
+    def __init__(self,
+                 agent,
+                 check_interval: float = 60.0,
+                 ping_interval: float = 300.0,
+                 business_hours: Dict[str, Any] = None,
+                 keep_alive: str = None,
+                 cold_start_policy: str = 'fallback',
+                 load_timeout: float = 600.0):
+        self.agent = agent
+        self.base_url = agent.api_url.rsplit('/api/', 1)[0]
+        self.check_interval = check_interval
+        self.ping_interval = ping_interval
+        self.business_hours = business_hours or {}
+        self.keep_alive = keep_alive or agent.keep_alive
+        self.cold_start_policy = cold_start_policy
+        self.load_timeout = load_timeout
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._demand = False
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self._deferred: Dict[str, int] = {}
+
+    @classmethod
+    def from_settings(cls, agent, settings: Dict[str, Any]) -> 'ModelKeeper':
+        """Build a keeper from the llm_keeper section of defaults.json."""
+        return cls(
+            agent,
+            check_interval=settings.get('check_interval_seconds', 60),
+            ping_interval=settings.get('ping_interval_seconds', 300),
+            business_hours=settings.get('business_hours'),
+            keep_alive=settings.get('keep_alive'),
+            cold_start_policy=settings.get('cold_start_policy', 'fallback'),
+            load_timeout=settings.get('load_timeout_seconds', 600)
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+
+    def _state(self, model: str) -> Dict[str, Any]:
+        if model not in self._models:
+            self._models[model] = {
+                'resident': False, 'expires_at': None, 'size_vram': None, 'warmups': 0, 'pings': 0,
+                'failures': 0, 'last_load_ms': None, 'last_ping': 0.0, 'last_error': None
+            }
+        return self._models[model]
+
+    def in_business_hours(self, now: datetime = None) -> bool:
+        """Whether now falls in the configured business hours (always, if none are set)."""
+        if not self.business_hours:
+            return True
+        now = now or datetime.now()
+        if now.weekday() not in self.business_hours.get('days', range(7)):
+            return False
+        clock = now.strftime('%H:%M')
+        return self.business_hours.get('start', '00:00') <= clock < self.business_hours.get('end', '24:00')
+
+    def residency(self) -> Dict[str, Dict[str, Any]]:
+        """Models Ollama currently holds in memory (/api/ps), by name."""
+        response = requests.get(f"{self.base_url}/api/ps", timeout=5)
+        response.raise_for_status()
+        return {entry.get('name') or entry.get('model'): entry for entry in response.json().get('models', [])}
+
+    @staticmethod
+    def _find(resident: Dict[str, Dict[str, Any]], model: str) -> Optional[Dict[str, Any]]:
+        # /api/ps reports the full tag ("mistral:latest") for a configured "mistral"
+        return resident.get(model) or (resident.get(f"{model}:latest") if ':' not in model else None)
+
+    def warm(self, model: str, ping: bool = False) -> bool:
+        """Load model (or refresh its keep_alive) with an empty generate request."""
+        payload = {"model": model}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        started = time.perf_counter()
+        try:
+            response = requests.post(f"{self.base_url}/api/generate", json=payload, timeout=self.load_timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            with self._lock:
+                state = self._state(model)
+                state['failures'] += 1
+                if state['last_error'] != str(e):
+                    print(f"⚠️ Could not load model {model}: {e}")
+                state['last_error'] = str(e)
+                state['resident'] = False
+            return False
+
+        with self._lock:
+            state = self._state(model)
+            state['resident'] = True
+            state['last_ping'] = time.time()
+            state['last_error'] = None
+            if ping:
+                state['pings'] += 1
+            else:
+                state['warmups'] += 1
+                state['last_load_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        if not ping:
+            print(f"✅ Model {model} loaded in {state['last_load_ms']:.0f} ms")
+        return True
+
+    def check(self, startup: bool = False):
+        """One keeper pass: refresh residency, then load or ping models as needed."""
+        models = self.agent.all_models()
+        try:
+            resident = self.residency()
+        except (requests.RequestException, ValueError) as e:
+            with self._lock:
+                for model in models:
+                    state = self._state(model)
+                    state['resident'] = False
+                    state['last_error'] = str(e)
+            return
+
+        in_hours = self.in_business_hours()
+        with self._lock:
+            demand, self._demand = self._demand, False
+            for model in models:
+                state = self._state(model)
+                info = self._find(resident, model)
+                state['resident'] = info is not None
+                state['expires_at'] = info.get('expires_at') if info else None
+                state['size_vram'] = info.get('size_vram') if info else None
+            states = {model: dict(self._models[model]) for model in models}
+
+        for model, state in states.items():
+            if not state['resident']:
+                if startup or in_hours or demand:
+                    self.warm(model)
+            elif in_hours and time.time() - state['last_ping'] >= self.ping_interval:
+                self.warm(model, ping=True)
+
+    def _run(self):
+        self.check(startup=True)
+        while not self._stop.is_set():
+            self._wake.wait(self.check_interval)
+            self._wake.clear()
+            if not self._stop.is_set():
+                self.check()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='model-keeper', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def ready(self, call_type: str) -> bool:
+        """Whether every model in call_type's cascade is loaded (True when unmanaged)."""
+        if not self.running or self.cold_start_policy == 'wait':
+            return True
+        with self._lock:
+            return all(self._state(model)['resident'] for model in self.agent.models_for(call_type))
+
+    def check_ready(self, call_type: str):
+        """Raise ModelNotReady (and have the keeper load the models) if call_type would cold-start."""
+        if self.ready(call_type):
+            return
+        with self._lock:
+            self._deferred[call_type] = self._deferred.get(call_type, 0) + 1
+            self._demand = True
+        self._wake.set()
+        raise ModelNotReady(f"{', '.join(self.agent.models_for(call_type))} not loaded")
+
+    def get_status(self, usage=None) -> Dict[str, Any]:
+        """Residency and load counters per model; live cold starts come from the agent's UsageStats."""
+        model_stats = usage.get_model_stats() if usage is not None else {}
+        with self._lock:
+            models = {}
+            for model in self.agent.all_models():
+                state = dict(self._state(model))
+                state.pop('last_ping')
+                state['live_cold_starts'] = sum(stats.get('cold_starts', 0)
+                                                for stats in model_stats.get(model, {}).values())
+                models[model] = state
+            return {
+                'managed': self.running,
+                'business_hours': self.in_business_hours(),
+                'ready': all(state['resident'] for state in models.values()),
+                'deferred_calls': dict(self._deferred),
+                'models': models
+            }
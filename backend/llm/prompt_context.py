@@ -0,0 +1,57 @@
+import threading
+from array import array
+from collections import OrderedDict
+from typing import List, Optional
+
+class PromptContextCache:
+    """
+    Session-scoped Ollama context tokens, kept so later calls skip re-encoding.
+
+    Ollama returns the encoded conversation as `context` with every generate
+    response. Passing it back on the next call for the same question means the
+    interviewer instructions, question and answer are not evaluated again; only
+    the new task instruction is. Entries are stored as compact int arrays in a
+    bounded LRU, keyed by session and turn (question plus answer).
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(session_id: str, turn: str = None) -> str:
+        """Cache key for a turn in a session (None means the session's latest context)."""
+        return f"{session_id}\x00{turn}" if turn is not None else session_id
+
+    def get(self, session_id: str, turn: str = None) -> Optional[List[int]]:
+        """Get stored context tokens, or None if nothing is cached."""
+        key = self.key(session_id, turn)
+        with self._lock:
+            tokens = self._entries.get(key)
+            if tokens is None:
+                return None
+            self._entries.move_to_end(key)
+        return tokens.tolist()
+
+    def put(self, session_id: str, turn: str, tokens: List[int]):
+        """Store context for a turn; it also becomes the session's latest context."""
+        if not tokens:
+            return
+        packed = array('i', tokens)
+        with self._lock:
+            for key in (self.key(session_id, turn), self.key(session_id)):
+                self._entries[key] = packed
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def forget(self, session_id: str):
+        """Drop every context stored for a session."""
+        prefix = self.key(session_id, '')
+        with self._lock:
+            for key in [k for k in self._entries if k == session_id or k.startswith(prefix)]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Recommendations cached per quantized score profile.
+
+Precompute every profile for the configured roles and domains from the
+backend directory (safe to stop and re-run; finished profiles are kept):
+    python -m llm.recommendation_cache --warm
+    python -m llm.recommendation_cache --warm --model llama3 --workers 2
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import product
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+CACHE_PATH = os.getenv('RECOMMENDATION_CACHE_PATH') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'recommendation_cache.json')
+
+DIMENSIONS = ('clarity', 'accuracy', 'completeness', 'confidence')
+
+
+class RecommendationCache:
+    """
+    Recommendations by (role, domain, bucketed dimension scores), served from memory.
+
+    Each dimension's average 0-100 score is cut into buckets at bucket_edges,
+    so every candidate with the same role, domain and bucket profile gets the
+    same recommendations. The file written by the warm job is loaded at
+    startup (and reloaded when it changes); profiles generated live on a miss
+    are kept in memory until the next warm run.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, bucket_edges: List[float] = (50, 75)):
+        self.path = path
+        self.bucket_edges = sorted(bucket_edges)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.reload()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'RecommendationCache':
+        """Build a cache from the recommendation_cache section of defaults.json."""
+        return cls(bucket_edges=settings.get('bucket_edges', [50, 75]))
+
+    def reload(self) -> bool:
+        """Load the warm job's file; a missing file or one cut at other bucket edges is ignored."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Keeping current recommendation cache, reload failed: {e}")
+            return False
+        if data.get('bucket_edges') != self.bucket_edges:
+            print("⚠️ Recommendation cache was built with other bucket edges - ignoring it (re-run --warm)")
+            return False
+        with self._lock:
+            self._entries.update(data.get('entries', {}))
+        return True
+
+    def save(self):
+        """Write every entry atomically (the server picks the new file up on its next poll)."""
+        with self._lock:
+            data = {'bucket_edges': self.bucket_edges, 'entries': dict(sorted(self._entries.items()))}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def _range(self, bucket: int) -> str:
+        edges = [0, *self.bucket_edges, 100]
+        return f"{edges[bucket]:g}-{edges[bucket + 1]:g}"
+
+    def profile(self, scores: List[Dict[str, Any]], role: str, domain: str) -> Tuple[str, Dict[str, Any]]:
+        """Cache key and profile for a session's 0-100 per-answer scores."""
+        buckets = []
+        for dimension in DIMENSIONS:
+            given = [s[dimension] for s in scores if s.get(dimension) is not None]
+            average = sum(given) / len(given) if given else 0
+            buckets.append(sum(1 for edge in self.bucket_edges if average >= edge))
+        return self._profile(role, domain, buckets)
+
+    def _profile(self, role: str, domain: str, buckets) -> Tuple[str, Dict[str, Any]]:
+        key = f"{role}|{domain}|{'.'.join(str(b) for b in buckets)}"
+        return key, {
+            'role': role,
+            'domain': domain,
+            'dimensions': {dimension: self._range(b) for dimension, b in zip(DIMENSIONS, buckets)}
+        }
+
+    def all_profiles(self, roles: List[str], domains: List[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Every (key, profile) for these roles and domains."""
+        levels = range(len(self.bucket_edges) + 1)
+        for role, domain in product(roles, domains):
+            for buckets in product(levels, repeat=len(DIMENSIONS)):
+                yield self._profile(role, domain, buckets)
+
+    def get(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def put(self, key: str, recommendations: List[str]):
+        with self._lock:
+            self._entries[key] = list(recommendations)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None
+            }
+
+
+def warm(cache: RecommendationCache, agent, roles: List[str], domains: List[str],
+         workers: int = 1, save_every: int = 50) -> Dict[str, int]:
+    """Generate recommendations for every profile not yet cached, saving as it goes."""
+    todo = [(key, profile) for key, profile in cache.all_profiles(roles, domains) if key not in cache]
+    done = failed = 0
+    with ThreadPoolExecutor(workers) as pool:
+        futures = {pool.submit(agent.generate_profile_recommendations, profile): key for key, profile in todo}
+        for future in as_completed(futures):
+            try:
+                cache.put(futures[future], future.result()['recommendations'])
+                done += 1
+            except Exception as e:
+                failed += 1
+                print(f"\n⚠️ {futures[future]}: {e}", file=sys.stderr)
+            if done and done % save_every == 0:
+                cache.save()
+            print(f"\r{done}/{len(todo)} profiles generated", end='', file=sys.stderr)
+    cache.save()
+    print(file=sys.stderr)
+    return {'generated': done, 'failed': failed, 'cached': len(cache)}
+
+
+def main(argv=None):
+    from config.config_manager import ConfigManager
+    from llm_agent import InterviewAgent
+
+    parser = argparse.ArgumentParser(description="Precompute recommendations for every score profile")
+    parser.add_argument('--warm', action='store_true', help="generate every profile not yet cached")
+    parser.add_argument('--model', help="Ollama model (default: the configured recommendations route)")
+    parser.add_argument('--workers', type=int, default=1, help="concurrent LLM calls")
+    parser.add_argument('--path', default=CACHE_PATH)
+    args = parser.parse_args(argv)
+
+    config = ConfigManager()
+    cache = RecommendationCache(args.path, config.get_recommendation_cache_settings().get('bucket_edges', [50, 75]))
+    total = sum(1 for _ in cache.all_profiles(config.get_roles(), config.get_domains()))
+    if args.warm:
+        settings = dict(config.get_llm_settings(), reuse_context=False)
+        if args.model:
+            settings.update(model=args.model, routing={})
+        result = warm(cache, InterviewAgent.from_settings(settings), config.get_roles(), config.get_domains(),
+                      args.workers)
+        print(f"{result['generated']} generated, {result['failed']} failed")
+    print(f"{len(cache)} of {total} profiles cached in {args.path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Record and replay /api/generate traffic for reproducible benchmarks.
+
+Record real traffic, then serve it back without a model:
+    LLM_RECORD=llm_traffic.ndjson.gz python app.py
+    LLM_REPLAY=llm_traffic.ndjson.gz LLM_REPLAY_SPEED=1 python app.py
+
+Under gunicorn each worker records to its own log (LLM_RECORD=traffic_{pid}.ndjson.gz
+names them explicitly); replay them together with LLM_REPLAY=a.gz,b.gz.
+
+LLM_REPLAY_SPEED scales the recorded latency (0 replays instantly).
+
+Question selection is random, and the question text is part of every
+prompt, so a recording also stores the seed of `random` and numpy's global
+generator (LLM_SEED, or a fresh one printed at startup). Replay restores
+it (LLM_SEED overrides), so the same interviews draw the same questions and
+the same prompts. The sequence is reproduced per process: replay with as
+many workers as were recorded, and one worker for an exact run.
+
+Inspect a log from the backend directory:
+    python -m llm.replay llm_traffic.ndjson.gz
+"""
+import argparse
+import asyncio
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import random
+import secrets
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Any, Iterator, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ReplayMiss(Exception):
+    """Raised when a request was never recorded; callers fall back as for any LLM error."""
+
+
+def request_key(payload: Dict[str, Any]) -> str:
+    """Identity of a generate request; keep_alive and stream do not change the output."""
+    relevant = {k: v for k, v in payload.items() if k not in ('keep_alive', 'stream')}
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True, separators=(',', ':')).encode()).hexdigest()[:32]
+
+
+def _open(path: str, mode: str):
+    return gzip.open(path, mode + 't') if path.endswith('.gz') else open(path, mode)
+
+
+def seed_random(seed: int):
+    """Seed random and numpy's global generator (question selection draws from both)."""
+    random.seed(seed)
+    if np is not None:
+        np.random.seed(seed % 2 ** 32)
+
+
+def _iter_lines(path: str) -> Iterator[Dict[str, Any]]:
+    with _open(path, 'r') as f:
+        try:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+        except EOFError:
+            return  # gzip stream without its trailer
+
+
+def iter_log(path: str) -> Iterator[Dict[str, Any]]:
+    """Recorded exchanges; a log cut off by a crash yields everything up to its last complete line."""
+    return (entry for entry in _iter_lines(path) if 'key' in entry)
+
+
+def log_seed(path: str) -> Optional[int]:
+    """The RNG seed a log was recorded with (its first header line), or None."""
+    for entry in _iter_lines(path):
+        if 'key' not in entry and 'seed' in entry:
+            return int(entry['seed'])
+    return None
+
+
+class TrafficRecorder:
+    """
+    Wraps an agent's _post/_stream and appends every exchange, with timings, to an NDJSON log.
+
+    Streamed exchanges keep each chunk's offset from the request start; a
+    stream closed early (early-stopped JSON) is recorded up to that point,
+    which is exactly what a replay of the same code will consume.
+
+    The log is opened on the first exchange of each process, like the answer
+    journal, so a recorder created in a pre-fork master gives every worker
+    its own file: "{pid}" in the path is replaced by the writing process's
+    id, and a forked process whose path has no "{pid}" gets its id inserted
+    before the extension. Each opening writes a header line with seed.
+    """
+
+    def __init__(self, path: str, seed: int = None):
+        self.template = path
+        self.seed = seed
+        self._owner_pid = os.getpid()
+        self._start_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._file = None
+        self._pid = None
+        self._inherited = []
+        self.exchanges = 0
+        atexit.register(self.close)
+
+    @property
+    def path(self) -> str:
+        pid = os.getpid()
+        if '{pid}' in self.template:
+            return self.template.replace('{pid}', str(pid))
+        if pid == self._owner_pid:
+            return self.template
+        directory, name = os.path.split(self.template)
+        stem, dot, extension = name.partition('.')
+        return os.path.join(directory, f"{stem}.{pid}{dot}{extension}")
+
+    def _ensure_file(self):
+        """Open this process's log (after fork, anew)."""
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            if self._file is not None:
+                # The parent's file: closing it here would write into the parent's log
+                self._inherited.append(self._file)
+            self._lock = threading.Lock()
+            self.exchanges = 0
+            self._file = _open(self.path, 'a')
+            self._file.write(json.dumps({'seed': self.seed, 'pid': os.getpid()}) + '\n')
+            self._pid = os.getpid()
+
+    def _write(self, entry: Dict[str, Any]):
+        line = json.dumps(entry, separators=(',', ':')) + '\n'
+        if self._pid != os.getpid():
+            self._ensure_file()
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.exchanges += 1
+
+    @staticmethod
+    def _entry(payload: Dict[str, Any], stream: bool) -> Dict[str, Any]:
+        return {
+            'key': request_key(payload),
+            'model': payload.get('model'),
+            'stream': stream,
+            'request': {k: v for k, v in payload.items() if k != 'context'}
+        }
+
+    def install(self, agent):
+        post, stream = agent._post, agent._stream
+        recorder = self
+
+        if asyncio.iscoroutinefunction(post):
+            async def recorded_post(payload):
+                started = time.perf_counter()
+                data = await post(payload)
+                recorder._write(dict(recorder._entry(payload, False), wall=time.perf_counter() - started,
+                                     response=data))
+                return data
+
+            async def recorded_stream(payload):
+                started = time.perf_counter()
+                offsets, chunks = [], []
+                try:
+                    async for chunk in stream(payload):
+                        offsets.append(round(time.perf_counter() - started, 4))
+                        chunks.append(chunk)
+                        yield chunk
+                finally:
+                    recorder._write(dict(recorder._entry(payload, True), wall=time.perf_counter() - started,
+                                         offsets=offsets, chunks=chunks))
+        else:
+            def recorded_post(payload):
+                started = time.perf_counter()
+                data = post(payload)
+                recorder._write(dict(recorder._entry(payload, False), wall=time.perf_counter() - started,
+                                     response=data))
+                return data
+
+            def recorded_stream(payload):
+                started = time.perf_counter()
+                offsets, chunks = [], []
+                try:
+                    for chunk in stream(payload):
+                        offsets.append(round(time.perf_counter() - started, 4))
+                        chunks.append(chunk)
+                        yield chunk
+                finally:
+                    recorder._write(dict(recorder._entry(payload, True), wall=time.perf_counter() - started,
+                                         offsets=offsets, chunks=chunks))
+
+        agent._post = recorded_post
+        agent._stream = recorded_stream
+        return self
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'recording': self.path, 'exchanges': self.exchanges if self._pid == os.getpid() else 0,
+                'seed': self.seed}
+
+    def close(self):
+        if self._pid != os.getpid():
+            return
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class TrafficReplayer:
+    """
+    Serves recorded exchanges back in place of an agent's _post/_stream.
+
+    Requests are matched by request_key. A request recorded several times is
+    answered with its recordings in order (then the last one again), so a
+    replayed run sees the same sequence as the recorded one. Latency is the
+    recorded latency times speed.
+    """
+
+    def __init__(self, paths: List[str], speed: float = 1.0):
+        self.speed = speed
+        self.seed = next((seed for seed in map(log_seed, paths) if seed is not None), None)
+        self._lock = threading.Lock()
+        self._exchanges: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._served: Dict[tuple, int] = defaultdict(int)
+        self.misses = 0
+        for path in paths:
+            for entry in iter_log(path):
+                self._exchanges[entry['key']].append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._exchanges.values())
+
+    def _next(self, payload: Dict[str, Any], stream: bool) -> Dict[str, Any]:
+        key = request_key(payload)
+        with self._lock:
+            entries = [e for e in self._exchanges.get(key, ()) if e['stream'] == stream]
+            if not entries:
+                self.misses += 1
+                raise ReplayMiss(f"No recorded {'stream' if stream else 'response'} for request {key} "
+                                 f"({payload.get('model')})")
+            index = self._served[(key, stream)]
+            self._served[(key, stream)] = index + 1
+        return entries[min(index, len(entries) - 1)]
+
+    def post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        entry = self._next(payload, False)
+        time.sleep(entry['wall'] * self.speed)
+        return entry['response']
+
+    def stream(self, payload: Dict[str, Any]):
+        entry = self._next(payload, True)
+        started = time.perf_counter()
+        for offset, chunk in zip(entry['offsets'], entry['chunks']):
+            delay = offset * self.speed - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+            yield chunk
+
+    async def post_async(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        entry = self._next(payload, False)
+        await asyncio.sleep(entry['wall'] * self.speed)
+        return entry['response']
+
+    async def stream_async(self, payload: Dict[str, Any]):
+        entry = self._next(payload, True)
+        started = time.perf_counter()
+        for offset, chunk in zip(entry['offsets'], entry['chunks']):
+            delay = offset * self.speed - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield chunk
+
+    def install(self, agent):
+        if asyncio.iscoroutinefunction(agent._post):
+            agent._post, agent._stream = self.post_async, self.stream_async
+        else:
+            agent._post, agent._stream = self.post, self.stream
+        return self
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'recorded': len(self), 'served': sum(self._served.values()), 'misses': self.misses,
+                    'speed': self.speed, 'seed': self.seed}
+
+
+def transport_from_env(agent) -> Optional[Any]:
+    """
+    Install a recorder (LLM_RECORD) or replayer (LLM_REPLAY, comma-separated logs) on agent,
+    and seed the global RNGs with the recorded seed (LLM_SEED overrides).
+    """
+    seed = int(os.environ['LLM_SEED']) if os.getenv('LLM_SEED') else None
+    if os.getenv('LLM_REPLAY'):
+        paths = [p for p in os.getenv('LLM_REPLAY').split(',') if p]
+        replayer = TrafficReplayer(paths, float(os.getenv('LLM_REPLAY_SPEED', 1.0))).install(agent)
+        if seed is not None:
+            replayer.seed = seed
+        if replayer.seed is not None:
+            seed_random(replayer.seed)
+        print(f"🔄 Replaying {len(replayer)} recorded LLM exchanges (speed {replayer.speed:g}, seed {replayer.seed})")
+        return replayer
+    if os.getenv('LLM_RECORD'):
+        seed = secrets.randbits(32) if seed is None else seed
+        seed_random(seed)
+        # Opened per process on first use, so each pre-forked worker writes its own log
+        recorder = TrafficRecorder(os.getenv('LLM_RECORD'), seed).install(agent)
+        print(f"⏺️ Recording LLM traffic to {recorder.template} (one log per process, seed {seed})")
+        return recorder
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize recorded LLM traffic")
+    parser.add_argument('paths', nargs='+', help="recorded NDJSON logs (.ndjson or .ndjson.gz)")
+    args = parser.parse_args(argv)
+
+    totals = defaultdict(lambda: {'exchanges': 0, 'streamed': 0, 'wall_seconds': 0.0})
+    keys = set()
+    for path in args.paths:
+        for entry in iter_log(path):
+            row = totals[entry.get('model')]
+            row['exchanges'] += 1
+            row['streamed'] += int(entry['stream'])
+            row['wall_seconds'] += entry['wall']
+            keys.add(entry['key'])
+
+    print(f"{sum(r['exchanges'] for r in totals.values())} exchanges, {len(keys)} distinct requests")
+    print(f"{'model':<24}{'exchanges':>10}{'streamed':>10}{'avg ms':>10}")
+    for model, row in sorted(totals.items(), key=lambda item: str(item[0])):
+        print(f"{str(model):<24}{row['exchanges']:>10}{row['streamed']:>10}"
+              f"{row['wall_seconds'] / row['exchanges'] * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
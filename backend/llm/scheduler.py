@@ -0,0 +1,224 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Dict, Any, Optional, Callable
+
+class Priority(IntEnum):
+    """
+    LLM request classes of the API process; lower value is served first.
+
+    Offline jobs (python -m scoring.rescore) run in their own processes and
+    are not scheduled here.
+    """
+    LIVE_SCORING = 0
+    FOLLOWUP = 1
+    RECOMMENDATIONS = 2
+
+
+class SchedulerOverloaded(Exception):
+    """Raised when a request is shed because its class queue is full or it waited too long."""
+
+
+class _Ticket:
+    __slots__ = ('priority', 'seq', 'enqueued_at', 'granted', 'wake')
+
+    def __init__(self, priority: Priority, seq: int, wake: Callable[[], None]):
+        self.priority = priority
+        self.seq = seq
+        self.enqueued_at = time.perf_counter()
+        self.granted = False
+        self.wake = wake
+
+    def __lt__(self, other: '_Ticket') -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class _ClassStats:
+    __slots__ = ('submitted', 'completed', 'shed', 'queued', 'wait_total', 'wait_max', 'recent_waits')
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.shed = 0
+        self.queued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.recent_waits = deque(maxlen=1000)
+
+    def record_wait(self, seconds: float):
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+        self.recent_waits.append(seconds)
+
+
+class LLMScheduler:
+    """
+    Bounded, priority-ordered gate in front of the LLM server.
+
+    At most max_concurrency calls run at once (per process). Waiting calls are
+    served strictly by priority, then arrival order; a finishing call hands its
+    slot straight to the next waiter. Each class has a queue-depth limit and an
+    optional maximum wait, past which the call is shed with SchedulerOverloaded
+    so the caller can use its heuristic fallback instead.
+
+    Both threads (Flask) and coroutines (ASGI) can wait on the same scheduler.
+    """
+
+    def __init__(self,
+                 max_concurrency: int = 2,
+                 queue_limits: Dict[str, int] = None,
+                 max_wait_seconds: Dict[str, Optional[float]] = None):
+        self.max_concurrency = max_concurrency
+        self.queue_limits = {p: None for p in Priority}
+        self.max_wait = {p: None for p in Priority}
+        # Classes that are no longer scheduled (batch_rescoring in older configs) are ignored
+        for name, limit in (queue_limits or {}).items():
+            if name.upper() in Priority.__members__:
+                self.queue_limits[Priority[name.upper()]] = limit
+        for name, seconds in (max_wait_seconds or {}).items():
+            if name.upper() in Priority.__members__:
+                self.max_wait[Priority[name.upper()]] = seconds
+
+        self._lock = threading.Lock()
+        self._waiting = []
+        self._active = 0
+        self._seq = itertools.count()
+        self._stats = {p: _ClassStats() for p in Priority}
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'LLMScheduler':
+        """Build a scheduler from the llm_scheduler section of defaults.json."""
+        return cls(
+            max_concurrency=settings.get('max_concurrency', 2),
+            queue_limits=settings.get('queue_limits'),
+            max_wait_seconds=settings.get('max_wait_seconds')
+        )
+
+    def _admit_or_enqueue(self, priority: Priority, wake: Callable[[], None]) -> Optional[_Ticket]:
+        """Take a free slot (returns None) or queue a ticket. Caller holds the lock."""
+        stats = self._stats[priority]
+        stats.submitted += 1
+
+        if self._active < self.max_concurrency and not self._waiting:
+            self._active += 1
+            stats.record_wait(0.0)
+            return None
+
+        limit = self.queue_limits[priority]
+        if limit is not None and stats.queued >= limit:
+            stats.shed += 1
+            raise SchedulerOverloaded(f"{priority.name} queue full ({limit} waiting)")
+
+        ticket = _Ticket(priority, next(self._seq), wake)
+        heapq.heappush(self._waiting, ticket)
+        stats.queued += 1
+        return ticket
+
+    def _granted(self, ticket: _Ticket):
+        self._stats[ticket.priority].record_wait(time.perf_counter() - ticket.enqueued_at)
+
+    def _abandon(self, ticket: _Ticket, shed: bool = True) -> bool:
+        """Drop a waiting ticket; False if it was granted in the meantime."""
+        with self._lock:
+            if ticket.granted:
+                return False
+            self._waiting.remove(ticket)
+            heapq.heapify(self._waiting)
+            stats = self._stats[ticket.priority]
+            stats.queued -= 1
+            if shed:
+                stats.shed += 1
+            else:
+                stats.submitted -= 1
+            return True
+
+    def acquire(self, priority: Priority):
+        """Block the calling thread until a slot is free for this priority."""
+        event = threading.Event()
+        with self._lock:
+            ticket = self._admit_or_enqueue(priority, event.set)
+        if ticket is None:
+            return
+
+        if not event.wait(self.max_wait[priority]) and self._abandon(ticket):
+            raise SchedulerOverloaded(f"{priority.name} waited over {self.max_wait[priority]}s")
+        self._granted(ticket)
+
+    async def acquire_async(self, priority: Priority):
+        """Wait in the event loop until a slot is free for this priority."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        with self._lock:
+            ticket = self._admit_or_enqueue(priority, wake)
+        if ticket is None:
+            return
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.max_wait[priority])
+        except asyncio.TimeoutError:
+            if self._abandon(ticket):
+                raise SchedulerOverloaded(f"{priority.name} waited over {self.max_wait[priority]}s")
+        except asyncio.CancelledError:
+            # Client went away: give the slot back if it was already handed to us
+            if not self._abandon(ticket, shed=False):
+                self.release(priority)
+            raise
+        self._granted(ticket)
+
+    def release(self, priority: Priority):
+        """Finish a call and hand the slot to the highest-priority waiter."""
+        with self._lock:
+            self._stats[priority].completed += 1
+            if self._waiting:
+                ticket = heapq.heappop(self._waiting)
+                ticket.granted = True
+                self._stats[ticket.priority].queued -= 1
+                ticket.wake()
+            else:
+                self._active -= 1
+
+    def run(self, priority: Priority, fn: Callable, *args, **kwargs) -> Any:
+        """Call fn under the scheduler (threaded servers)."""
+        self.acquire(priority)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.release(priority)
+
+    async def run_async(self, priority: Priority, fn: Callable, *args, **kwargs) -> Any:
+        """Await fn(*args, **kwargs) under the scheduler (ASGI server)."""
+        await self.acquire_async(priority)
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            self.release(priority)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, shed counts and queue-wait statistics per priority class."""
+        with self._lock:
+            classes = {}
+            for priority, stats in self._stats.items():
+                admitted = stats.submitted - stats.shed - stats.queued
+                waits = sorted(stats.recent_waits)
+                classes[priority.name.lower()] = {
+                    'queued': stats.queued,
+                    'submitted': stats.submitted,
+                    'completed': stats.completed,
+                    'shed': stats.shed,
+                    'wait_avg_ms': round(stats.wait_total / admitted * 1000, 2) if admitted else 0,
+                    'wait_p95_ms': round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 2) if waits else 0,
+                    'wait_max_ms': round(stats.wait_max * 1000, 2),
+                }
+            return {
+                'max_concurrency': self.max_concurrency,
+                'in_flight': self._active,
+                'classes': classes
+            }
@@ -0,0 +1,112 @@
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Any
+
+class UsageStats:
+    """
+    Per call-type timing and token counters taken from Ollama responses.
+
+    Ollama reports durations in nanoseconds; they are kept as totals here and
+    converted to averages in milliseconds by get_stats(). Recent output token
+    counts are kept per call type, with how often the num_predict cap was hit,
+    so the caps can be tuned from real traffic. The same counters are kept per
+    model and call type, with recent latencies and cascade escalations, so
+    routing choices can be compared on latency, tokens and quality.
+    """
+
+    FIELDS = ('prompt_eval_count', 'prompt_eval_duration', 'eval_count', 'eval_duration', 'load_duration')
+
+    # A load_duration above this means the call had to load the model first
+    COLD_START_SECONDS = 1.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = defaultdict(lambda: defaultdict(float))
+        self._output_tokens = defaultdict(lambda: deque(maxlen=1000))
+        self._caps = {}
+        self._model_totals = defaultdict(lambda: defaultdict(float))
+        self._model_latencies = defaultdict(lambda: deque(maxlen=1000))
+        self._escalations = defaultdict(lambda: defaultdict(int))
+
+    def record(self, call_type: str, response: Dict[str, Any], wall_seconds: float = 0.0,
+               reused_context: bool = False, cap: int = None, model: str = None):
+        """Add one generate response to the totals for call_type (and for model, if given)."""
+        with self._lock:
+            if model:
+                key = (model, call_type)
+                totals = self._model_totals[key]
+                totals['calls'] += 1
+                totals['wall_seconds'] += wall_seconds
+                for field in self.FIELDS:
+                    totals[field] += response.get(field) or 0
+                self._model_latencies[key].append(wall_seconds)
+                if (response.get('load_duration') or 0) > self.COLD_START_SECONDS * 1e9:
+                    totals['cold_starts'] += 1
+
+            totals = self._totals[call_type]
+            totals['calls'] += 1
+            totals['wall_seconds'] += wall_seconds
+            if reused_context:
+                totals['reused_context'] += 1
+            for field in self.FIELDS:
+                totals[field] += response.get(field) or 0
+
+            output_tokens = response.get('eval_count') or 0
+            self._output_tokens[call_type].append(output_tokens)
+            self._caps[call_type] = cap
+            if response.get('done_reason') == 'length' or (cap and output_tokens >= cap):
+                totals['hit_cap'] += 1
+
+    def record_escalation(self, call_type: str, model: str, reason: str):
+        """Count a cascade step where model's result for call_type was passed to the next model."""
+        with self._lock:
+            self._escalations[(model, call_type)][reason] += 1
+
+    def get_model_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Latency, token and escalation figures per model and call type."""
+        with self._lock:
+            stats = defaultdict(dict)
+            for (model, call_type), totals in self._model_totals.items():
+                calls = totals['calls'] or 1
+                latencies = sorted(self._model_latencies[(model, call_type)])
+                escalations = dict(self._escalations.get((model, call_type), {}))
+                stats[model][call_type] = {
+                    'calls': int(totals['calls']),
+                    'avg_wall_ms': round(totals['wall_seconds'] / calls * 1000, 2),
+                    'p95_wall_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 2)
+                    if latencies else 0,
+                    'avg_prompt_tokens': round(totals['prompt_eval_count'] / calls, 1),
+                    'avg_output_tokens': round(totals['eval_count'] / calls, 1),
+                    'output_tokens_per_second': round(totals['eval_count'] / (totals['eval_duration'] / 1e9), 1)
+                    if totals['eval_duration'] else None,
+                    'avg_load_ms': round(totals['load_duration'] / calls / 1e6, 2),
+                    'cold_starts': int(totals['cold_starts']),
+                    'escalated': sum(escalations.values()),
+                    'escalation_reasons': escalations,
+                }
+            return dict(stats)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Averages per call type."""
+        with self._lock:
+            stats = {}
+            for call_type, totals in self._totals.items():
+                calls = totals['calls'] or 1
+                outputs = sorted(self._output_tokens[call_type])
+                stats[call_type] = {
+                    'calls': int(totals['calls']),
+                    'reused_context': int(totals['reused_context']),
+                    'avg_prompt_tokens': round(totals['prompt_eval_count'] / calls, 1),
+                    'avg_output_tokens': round(totals['eval_count'] / calls, 1),
+                    'p95_output_tokens': outputs[min(len(outputs) - 1, int(len(outputs) * 0.95))] if outputs else 0,
+                    'max_output_tokens': outputs[-1] if outputs else 0,
+                    'total_prompt_tokens': int(totals['prompt_eval_count']),
+                    'total_output_tokens': int(totals['eval_count']),
+                    'num_predict': self._caps.get(call_type),
+                    'hit_cap': int(totals['hit_cap']),
+                    'avg_prompt_eval_ms': round(totals['prompt_eval_duration'] / calls / 1e6, 2),
+                    'avg_eval_ms': round(totals['eval_duration'] / calls / 1e6, 2),
+                    'avg_load_ms': round(totals['load_duration'] / calls / 1e6, 2),
+                    'avg_wall_ms': round(totals['wall_seconds'] / calls * 1000, 2),
+                }
+            return stats
@@ -1,77 +1,510 @@
 import json
+import time
 import requests
 
+from llm.json_extract import JSONObjectExtractor, extract_json_object
+from llm.prompt_context import PromptContextCache
+from llm.usage import UsageStats
+
+# Every prompt starts with the same text so the model server can reuse its
+# cached encoding of it across calls and sessions.
+INTERVIEWER_PREFIX = "You are an expert technical interviewer evaluating a candidate's answer."
+
+SCORE_FIELDS = ("score", "clarity", "accuracy", "completeness", "confidence")
+
+# JSON schemas passed as Ollama's `format`, so decoding is constrained to
+# exactly these objects and no prose is generated around them.
+SCORE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        **{field: {"type": "integer", "minimum": 0, "maximum": 100} for field in SCORE_FIELDS},
+        "feedback": {"type": "string"}
+    },
+    "required": [*SCORE_FIELDS, "feedback"]
+}
+
+RECOMMENDATIONS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "recommendations": {"type": "array", "items": {"type": "string"}, "minItems": 3, "maxItems": 3}
+    },
+    "required": ["recommendations"]
+}
+
+OUTPUT_SCHEMAS = {
+    "score": SCORE_SCHEMA,
+    "recommendations": RECOMMENDATIONS_SCHEMA
+}
+
+CALL_TYPES = ("score", "followup", "recommendations")
+
 class InterviewAgent:
     """LLM-powered interview agent using Ollama (local)"""
 
-    def __init__(self, model_name="mistral"):
+    def __init__(self, model_name="mistral", keep_alive=None, reuse_context=True, context_cache_size=512,
+                 early_stop=True, structured_output=True, num_predict=None, routing=None, cascade=None):
         self.api_url = "http://localhost:11434/api/generate"
         self.model = model_name
+        # Models to try per call type, cheapest first; later ones only run when
+        # the earlier result fails the cascade checks
+        self.routing = {
+            call_type: [models] if isinstance(models, str) else list(models)
+            for call_type, models in (routing or {}).items() if models
+        }
+        self.cascade = cascade or {}
+        self.keep_alive = keep_alive
+        self.early_stop = early_stop
+        self.structured_output = structured_output
+        self.num_predict = num_predict or {}
+        self.contexts = PromptContextCache(context_cache_size) if reuse_context else None
+        self.usage = UsageStats()
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Build an agent from the llm section of defaults.json."""
+        return cls(
+            model_name=settings.get('model', 'mistral'),
+            keep_alive=settings.get('keep_alive'),
+            reuse_context=settings.get('reuse_context', True),
+            context_cache_size=settings.get('context_cache_size', 512),
+            early_stop=settings.get('early_stop_json', True),
+            structured_output=settings.get('structured_output', True),
+            num_predict=settings.get('num_predict'),
+            routing=settings.get('routing'),
+            cascade=settings.get('cascade')
+        )
+
+    def models_for(self, call_type):
+        """The cascade for a call type: its configured models, or the default model."""
+        return self.routing.get(call_type) or [self.model]
+
+    def all_models(self):
+        """Every model this agent may call, default first."""
+        models = [self.model]
+        for call_type in CALL_TYPES:
+            models.extend(m for m in self.models_for(call_type) if m not in models)
+        return models
+
+    def _payload(self, call_type, prompt, context=None, model=None):
+        payload = {
+            "model": model or self.model,
+            "prompt": prompt,
+            "stream": False
+        }
+        if context:
+            payload["context"] = context
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        if self.structured_output and call_type in OUTPUT_SCHEMAS:
+            payload["format"] = OUTPUT_SCHEMAS[call_type]
+        if self.num_predict.get(call_type):
+            payload["options"] = {"num_predict": self.num_predict[call_type]}
+        return payload
+
+    def _post(self, payload):
+        return requests.post(self.api_url, json=payload).json()
+
+    def _stream(self, payload):
+        """Yield the NDJSON chunks of a streamed generation; closing the generator cancels it."""
+        with requests.post(self.api_url, json=dict(payload, stream=True), stream=True) as response:
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    def _generate(self, call_type, prompt, context=None, model=None):
+        started = time.perf_counter()
+        data = self._post(self._payload(call_type, prompt, context, model))
+        self.usage.record(call_type, data, time.perf_counter() - started, reused_context=bool(context),
+                          cap=self.num_predict.get(call_type), model=model or self.model)
+        return data
+
+    def _generate_json(self, call_type, prompt, context=None, required=(), model=None, early_stop=None):
+        """
+        Stream a generation and extract the first JSON object with the required keys.
+
+        With early_stop (default: the agent's setting) the stream is closed as
+        soon as the object is complete, which makes Ollama abort the rest of
+        the generation. The final chunk (token stats and context) is then never
+        received, so the returned data has no context and eval_count counts the
+        streamed chunks instead.
+
+        Returns (parsed object or None, response data).
+        """
+        early_stop = self.early_stop if early_stop is None else early_stop
+        started = time.perf_counter()
+        extractor = JSONObjectExtractor(required)
+        parts = []
+        final = None
+        chunks = self._stream(self._payload(call_type, prompt, context, model))
+        try:
+            for chunk in chunks:
+                parts.append(chunk.get('response', ''))
+                parsed = extractor.feed(parts[-1])
+                if chunk.get('done'):
+                    final = chunk
+                    break
+                if parsed is not None and early_stop:
+                    break
+        finally:
+            chunks.close()
 
-    def generate_followup(self, question, answer, question_context=""):
-        prompt = f"""You are an expert technical interviewer. Based on the candidate's answer, generate ONE concise follow-up question.
+        data = dict(final or {'eval_count': len(parts)}, response=''.join(parts))
+        self.usage.record(call_type, data, time.perf_counter() - started, reused_context=bool(context),
+                          cap=self.num_predict.get(call_type), model=model or self.model)
+        return extractor.result or extractor.finish(), data
+
+    def shares_context(self, session_id):
+        """
+        Whether the follow-up continues the scoring call's context.
+
+        Only when scoring streams to the end: the context arrives with the
+        final chunk, so a score stopped early (early_stop) leaves none and the
+        follow-up encodes the question and answer itself. The follow-up can
+        then run alongside scoring instead of after it.
+        """
+        return bool(session_id) and self.contexts is not None and not self.early_stop
+
+    def _context_session(self, session_id, model=None):
+        """Context cache scope: Ollama context tokens are only valid for the model that produced them."""
+        if not session_id or not model or model == self.model:
+            return session_id
+        return f"{session_id}\x00{model}"
+
+    def _turn_prompt(self, session_id, question, answer, task, model=None):
+        """
+        Build the prompt for a task about one answer.
+
+        Returns (prompt, context, turn). When an earlier call to the same
+        model for the same question and answer left its context cached, only
+        the task is sent.
+        """
+        turn = f"{question}\x00{answer}"
+        session_id = self._context_session(session_id, model)
+        context = self.contexts.get(session_id, turn) if session_id and self.contexts else None
+        if context:
+            return task, context, turn
+        prompt = f"""{INTERVIEWER_PREFIX}
 
 Question: {question}
 Candidate Answer: {answer}
-Context: {question_context}
 
-Generate a follow-up that:
+{task}"""
+        return prompt, None, turn
+
+    def _remember(self, session_id, turn, data, model=None):
+        if session_id and self.contexts is not None:
+            self.contexts.put(self._context_session(session_id, model), turn, data.get('context'))
+
+    def _escalation_reason(self, call_type, parsed, text):
+        """
+        Why a cheaper model's result should go to the next model in the cascade, or None.
+
+        Ollama reports no calibrated confidence, so low confidence is read
+        from the result itself: unparseable or incomplete output, a score that
+        contradicts its own dimensions, or a score in the configured
+        borderline band.
+        """
+        if call_type == 'score':
+            if not isinstance(parsed, dict) or 'score' not in parsed:
+                return 'parse_failure'
+            if any(field not in parsed for field in SCORE_FIELDS):
+                return 'incomplete'
+            try:
+                values = [float(parsed[field]) for field in SCORE_FIELDS]
+            except (TypeError, ValueError):
+                return 'parse_failure'
+            max_gap = self.cascade.get('max_score_gap')
+            if max_gap is not None and abs(values[0] - sum(values[1:]) / 4) > max_gap:
+                return 'inconsistent'
+            band = self.cascade.get('escalate_score_band')
+            if band and band[0] <= values[0] <= band[1]:
+                return 'borderline'
+            return None
+        if call_type == 'followup':
+            text = text.strip()
+            if not text or '?' not in text or len(text) > self.cascade.get('max_followup_chars', 400):
+                return 'parse_failure'
+            return None
+        if not isinstance(parsed, dict) or not isinstance(parsed.get('recommendations'), list) \
+                or not parsed['recommendations']:
+            return 'parse_failure'
+        return None
+
+    def _followup_task(self, question_context=""):
+        return f"""Context: {question_context}
+
+Based on the candidate's answer, generate ONE concise follow-up question that:
 1. Probes deeper into their understanding
 2. Tests edge cases or advanced concepts
 3. Is clear and specific
 
 Respond with ONLY the follow-up question."""
-        response = requests.post(self.api_url, json={
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False
-        })
-        return response.json()['response'].strip()
 
-    def score_answer(self, question, answer, expected_concepts=None):
+    def _score_task(self, expected_concepts=None):
         if expected_concepts is None:
             expected_concepts = ["understanding", "approach"]
 
-        prompt = f"""Score this technical answer 0-100.
+        return f"""Expected: {', '.join(expected_concepts)}
 
-Question: {question}
-Answer: {answer}
-Expected: {', '.join(expected_concepts)}
+Score this technical answer 0-100. Evaluate clarity, accuracy, completeness, confidence (25% each).
 
-Evaluate clarity, accuracy, completeness, confidence (25% each).
+Respond in JSON:
+{{"score": <int>, "clarity": <int>, "accuracy": <int>, "completeness": <int>, "confidence": <int>, "feedback": "<one or two sentences>"}}"""
+
+    def _recommendations_prompt(self, answers, scores, session_id=None, model=None):
+        """Returns (prompt, context); continues the session's latest context for this model when cached."""
+        avg_score = sum(s.get('score', 0) for s in scores) / len(scores) if scores else 0
+
+        task = f"""Based on interview (avg score {avg_score:.0f}/100), give 3 actionable recommendations.
 
 Respond in JSON:
-{{"score": <int>, "clarity": <int>, "accuracy": <int>, "completeness": <int>, "confidence": <int>, "feedback": "<string>"}}"""
-        response = requests.post(self.api_url, json={
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False
-        })
-        try:
-            return json.loads(response.json()['response'])
-        except Exception:
+{{"recommendations": ["rec1", "rec2", "rec3"]}}"""
+        session_id = self._context_session(session_id, model)
+        context = self.contexts.get(session_id) if session_id and self.contexts else None
+        if context:
+            return task, context
+        return f"{INTERVIEWER_PREFIX}\n\n{task}", None
+
+    def _profile_recommendations_prompt(self, profile):
+        """Prompt from a quantized score profile only, so the result can be shared by every matching candidate."""
+        levels = ', '.join(f"{dimension} {score_range}" for dimension, score_range in profile['dimensions'].items())
+        return f"""{INTERVIEWER_PREFIX}
+
+A {profile['role']} candidate finished a {profile['domain']} interview with average scores (out of 100): {levels}.
+Give 3 actionable recommendations, focused on the weakest dimensions.
+
+Respond in JSON:
+{{"recommendations": ["rec1", "rec2", "rec3"]}}"""
+
+    def _profile_result(self, parsed, text):
+        if self._escalation_reason('recommendations', parsed, text) is not None:
+            raise ValueError(f"Unparseable recommendations: {text[:200]}")
+        return {"recommendations": [str(r) for r in parsed['recommendations']]}
+
+    def _parse_score(self, parsed, text, truncated=False):
+        """
+        Normalize an extracted score object: fields are ints 0-100 and feedback a string.
+
+        Output salvaged from a truncated or incomplete object keeps only the
+        fields the model gave and is marked "partial": missing dimensions are
+        left out rather than filled in, and feedback may be cut short.
+        """
+        result = {}
+        for field in SCORE_FIELDS if isinstance(parsed, dict) else ():
+            try:
+                result[field] = max(0, min(100, int(round(float(parsed[field])))))
+            except (KeyError, TypeError, ValueError):
+                continue
+        if "score" not in result:
             return {
                 "score": 60,
                 "clarity": 60,
                 "accuracy": 60,
                 "completeness": 60,
                 "confidence": 60,
-                "feedback": response.json()['response']
+                "feedback": text
             }
 
-    def generate_recommendations(self, answers, scores):
-        avg_score = sum(s.get('score', 0) for s in scores) / len(scores) if scores else 0
+        result["feedback"] = str(parsed.get("feedback") or "")
+        if truncated or "feedback" not in parsed or any(field not in result for field in SCORE_FIELDS):
+            result["partial"] = True
+        return result
 
-        prompt = f"""Based on interview (avg score {avg_score:.0f}/100), give 3 actionable recommendations.
+    def _parse_recommendations(self, text):
+        parsed = extract_json_object(text, required=("recommendations",))
+        if parsed is None or not isinstance(parsed["recommendations"], list):
+            return {"recommendations": [text]}
+        return parsed
 
-Respond in JSON:
-{{"recommendations": ["rec1", "rec2", "rec3"]}}"""
-        response = requests.post(self.api_url, json={
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False
-        })
+    def _escalate(self, call_type, models, index, parsed, text):
+        """Whether to try the next model; records the escalation when it does."""
+        if index == len(models) - 1:
+            return False
+        reason = self._escalation_reason(call_type, parsed, text)
+        if reason is not None:
+            self.usage.record_escalation(call_type, models[index], reason)
+        return reason is not None
+
+    def generate_followup(self, question, answer, question_context="", session_id=None):
+        models = self.models_for('followup')
+        for index, model in enumerate(models):
+            prompt, context, turn = self._turn_prompt(session_id, question, answer,
+                                                      self._followup_task(question_context), model)
+            data = self._generate('followup', prompt, context, model)
+            self._remember(session_id, turn, data, model)
+            if not self._escalate('followup', models, index, None, data['response']):
+                return data['response'].strip()
+
+    def score_answer(self, question, answer, expected_concepts=None, session_id=None):
+        models = self.models_for('score')
+        for index, model in enumerate(models):
+            prompt, context, turn = self._turn_prompt(session_id, question, answer,
+                                                      self._score_task(expected_concepts), model)
+            parsed, data = self._generate_json('score', prompt, context, required=("score",), model=model)
+            self._remember(session_id, turn, data, model)
+            if not self._escalate('score', models, index, parsed, data['response']):
+                return self._parse_score(parsed, data['response'], truncated=data.get('done_reason') == 'length')
+
+    def generate_recommendations(self, answers, scores, session_id=None):
+        models = self.models_for('recommendations')
+        for index, model in enumerate(models):
+            prompt, context = self._recommendations_prompt(answers, scores, session_id, model)
+            data = self._generate('recommendations', prompt, context, model)
+            parsed = extract_json_object(data['response'], required=("recommendations",))
+            if not self._escalate('recommendations', models, index, parsed, data['response']):
+                return self._parse_recommendations(data['response'])
+
+    def generate_profile_recommendations(self, profile):
+        """Recommendations for a score profile (see llm.recommendation_cache); raises ValueError if unparseable."""
+        prompt = self._profile_recommendations_prompt(profile)
+        models = self.models_for('recommendations')
+        for index, model in enumerate(models):
+            data = self._generate('recommendations', prompt, model=model)
+            parsed = extract_json_object(data['response'], required=("recommendations",))
+            if not self._escalate('recommendations', models, index, parsed, data['response']):
+                return self._profile_result(parsed, data['response'])
+
+    def forget_session(self, session_id):
+        """Release cached prompt context once an interview is complete."""
+        if self.contexts is not None:
+            self.contexts.forget(session_id)
+
+
+class AsyncInterviewAgent(InterviewAgent):
+    """
+    Non-blocking variant of InterviewAgent for the ASGI app (requires httpx).
+
+    All calls share one httpx.AsyncClient, so waiting on Ollama costs a pooled
+    connection instead of an OS thread.
+    """
+
+    def __init__(self, model_name="mistral", max_connections=100, timeout=300.0, **kwargs):
+        super().__init__(model_name, **kwargs)
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections)
+            )
+        return self._client
+
+    async def _post(self, payload):
+        response = await self.client.post(self.api_url, json=payload)
+        return response.json()
+
+    async def _stream(self, payload):
+        async with self.client.stream('POST', self.api_url, json=dict(payload, stream=True)) as response:
+            async for line in response.aiter_lines():
+                if line:
+                    yield json.loads(line)
+
+    async def _generate(self, call_type, prompt, context=None, model=None):
+        started = time.perf_counter()
+        data = await self._post(self._payload(call_type, prompt, context, model))
+        self.usage.record(call_type, data, time.perf_counter() - started, reused_context=bool(context),
+                          cap=self.num_predict.get(call_type), model=model or self.model)
+        return data
+
+    async def _generate_json(self, call_type, prompt, context=None, required=(), model=None, early_stop=None):
+        early_stop = self.early_stop if early_stop is None else early_stop
+        started = time.perf_counter()
+        extractor = JSONObjectExtractor(required)
+        parts = []
+        final = None
+        chunks = self._stream(self._payload(call_type, prompt, context, model))
         try:
-            return json.loads(response.json()['response'])
-        except Exception:
-            return {"recommendations": [response.json()['response']]}
\ No newline at end of file
+            async for chunk in chunks:
+                parts.append(chunk.get('response', ''))
+                parsed = extractor.feed(parts[-1])
+                if chunk.get('done'):
+                    final = chunk
+                    break
+                if parsed is not None and early_stop:
+                    break
+        finally:
+            await chunks.aclose()
+
+        data = dict(final or {'eval_count': len(parts)}, response=''.join(parts))
+        self.usage.record(call_type, data, time.perf_counter() - started, reused_context=bool(context),
+                          cap=self.num_predict.get(call_type), model=model or self.model)
+        return extractor.result or extractor.finish(), data
+
+    async def generate_followup(self, question, answer, question_context="", session_id=None):
+        models = self.models_for('followup')
+        for index, model in enumerate(models):
+            prompt, context, turn = self._turn_prompt(session_id, question, answer,
+                                                      self._followup_task(question_context), model)
+            data = await self._generate('followup', prompt, context, model)
+            self._remember(session_id, turn, data, model)
+            if not self._escalate('followup', models, index, None, data['response']):
+                return data['response'].strip()
+
+    async def stream_followup(self, question, answer, question_context="", session_id=None):
+        """
+        Yield the follow-up question text as the model generates it.
+
+        Text already sent cannot be taken back, so this uses only the first
+        (fastest) model of the follow-up cascade.
+        """
+        model = self.models_for('followup')[0]
+        prompt, context, turn = self._turn_prompt(session_id, question, answer,
+                                                  self._followup_task(question_context), model)
+        started = time.perf_counter()
+        parts = []
+        final = None
+        chunks = self._stream(self._payload('followup', prompt, context, model))
+        try:
+            async for chunk in chunks:
+                if chunk.get('response'):
+                    parts.append(chunk['response'])
+                    yield chunk['response']
+                if chunk.get('done'):
+                    final = chunk
+                    break
+        finally:
+            await chunks.aclose()
+
+        data = dict(final or {'eval_count': len(parts)}, response=''.join(parts))
+        self.usage.record('followup', data, time.perf_counter() - started, reused_context=bool(context),
+                          cap=self.num_predict.get('followup'), model=model)
+        self._remember(session_id, turn, data, model)
+
+    async def score_answer(self, question, answer, expected_concepts=None, session_id=None):
+        models = self.models_for('score')
+        for index, model in enumerate(models):
+            prompt, context, turn = self._turn_prompt(session_id, question, answer,
+                                                      self._score_task(expected_concepts), model)
+            parsed, data = await self._generate_json('score', prompt, context, required=("score",), model=model)
+            self._remember(session_id, turn, data, model)
+            if not self._escalate('score', models, index, parsed, data['response']):
+                return self._parse_score(parsed, data['response'], truncated=data.get('done_reason') == 'length')
+
+    async def generate_recommendations(self, answers, scores, session_id=None):
+        models = self.models_for('recommendations')
+        for index, model in enumerate(models):
+            prompt, context = self._recommendations_prompt(answers, scores, session_id, model)
+            data = await self._generate('recommendations', prompt, context, model)
+            parsed = extract_json_object(data['response'], required=("recommendations",))
+            if not self._escalate('recommendations', models, index, parsed, data['response']):
+                return self._parse_recommendations(data['response'])
+
+    async def generate_profile_recommendations(self, profile):
+        prompt = self._profile_recommendations_prompt(profile)
+        models = self.models_for('recommendations')
+        for index, model in enumerate(models):
+            data = await self._generate('recommendations', prompt, model=model)
+            parsed = extract_json_object(data['response'], required=("recommendations",))
+            if not self._escalate('recommendations', models, index, parsed, data['response']):
+                return self._profile_result(parsed, data['response'])
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
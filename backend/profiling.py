@@ -0,0 +1,202 @@
+"""
+Opt-in sampling profiler for the Flask app.
+
+While running, a daemon thread snapshots the stack of every thread that is
+serving a request (sys._current_frames) at a fixed interval and counts them
+as collapsed stacks ("route;frame;frame count"), ready for flamegraph.pl or
+speedscope. Each request's wall-clock and CPU time (time.thread_time) are
+summed per route, so time spent waiting (LLM, disk) separates from time spent
+computing. Nothing is recorded while the profiler is stopped.
+
+Start it with POST /api/admin/profile/start (requires ADMIN_TOKEN) or by
+sending the worker PROFILE_SIGNAL (SIGUSR2 by default), which writes the
+result to backend/profiles/ when the run ends.
+"""
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+
+
+class SamplingProfiler:
+    """Time-capped stack sampler plus per-route wall/CPU accounting."""
+
+    def __init__(self, interval: float = 0.005, max_seconds: float = 120.0, output_dir: str = PROFILE_DIR):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.output_dir = output_dir
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._active: Dict[int, tuple] = {}
+        self._stacks = Counter()
+        self._routes = defaultdict(lambda: defaultdict(float))
+        self._labels: Dict[Any, str] = {}
+        self._started_at = None
+        self._finished_at = None
+        self._deadline = None
+        self._run_interval = interval
+        self._dump_on_stop = False
+        self.samples = 0
+        self.last_dump = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float = 30.0, interval: float = None, dump: bool = False) -> bool:
+        """Start a run of at most max_seconds; returns False if one is already running."""
+        with self._lock:
+            if self.running:
+                return False
+            self._stacks.clear()
+            self._routes.clear()
+            self.samples = 0
+            self._run_interval = max(0.001, interval or self.interval)
+            self._started_at = time.time()
+            self._finished_at = None
+            self._deadline = time.perf_counter() + min(max(seconds, 0.1), self.max_seconds)
+            self._dump_on_stop = dump
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+            self._thread.start()
+        print(f"🔬 Profiler started for {min(seconds, self.max_seconds):g}s (pid {os.getpid()})")
+        return True
+
+    def stop(self):
+        """End the current run early and wait for the sampler to finish."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+            self._labels[code] = label
+        return label
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.is_set() and time.perf_counter() < self._deadline:
+            frames = sys._current_frames()
+            with self._lock:
+                active = dict(self._active)
+            stacks = []
+            for ident, (route, _, _) in active.items():
+                frame = frames.get(ident)
+                if frame is None or ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(route)
+                stacks.append(';'.join(reversed(stack)))
+            del frames
+            # Walk the frames unlocked; count under the lock that collapsed() and get_stats() read with
+            with self._lock:
+                self._stacks.update(stacks)
+                self.samples += 1
+            self._stop.wait(self._run_interval)
+
+        self._finished_at = time.time()
+        print(f"🔬 Profiler stopped after {self.samples} samples")
+        if self._dump_on_stop:
+            self.last_dump = self.dump()
+
+    def request_started(self, route: str):
+        """Called at the start of every request; a no-op unless a run is active."""
+        if self.running:
+            with self._lock:
+                self._active[threading.get_ident()] = (route, time.perf_counter(), time.thread_time())
+
+    def request_finished(self):
+        """Called at the end of every request; adds its wall and CPU time to its route."""
+        if not self._active:
+            return
+        with self._lock:
+            entry = self._active.pop(threading.get_ident(), None)
+            if entry is None or not self.running:
+                return
+            route, wall_started, cpu_started = entry
+            totals = self._routes[route]
+            totals['requests'] += 1
+            totals['wall_seconds'] += time.perf_counter() - wall_started
+            totals['cpu_seconds'] += time.thread_time() - cpu_started
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, one "frame;frame;... count" line each, heaviest first."""
+        with self._lock:
+            return ''.join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            routes = {}
+            for route, totals in sorted(self._routes.items()):
+                requests = totals['requests'] or 1
+                wall, cpu = totals['wall_seconds'], totals['cpu_seconds']
+                routes[route] = {
+                    'requests': int(totals['requests']),
+                    'avg_wall_ms': round(wall / requests * 1000, 2),
+                    'avg_cpu_ms': round(cpu / requests * 1000, 2),
+                    'avg_wait_ms': round(max(0.0, wall - cpu) / requests * 1000, 2),
+                    'cpu_share': round(cpu / wall, 3) if wall else None
+                }
+            leaves = Counter()
+            for stack, count in self._stacks.items():
+                leaves[stack.rsplit(';', 1)[-1]] += count
+            total = sum(leaves.values()) or 1
+            return {
+                'running': self.running,
+                'pid': os.getpid(),
+                'started_at': datetime.fromtimestamp(self._started_at).isoformat() if self._started_at else None,
+                'duration_seconds': round((self._finished_at or time.time()) - self._started_at, 2)
+                if self._started_at else 0,
+                'interval_ms': round(self._run_interval * 1000, 2),
+                'samples': self.samples,
+                'routes': routes,
+                'top_frames': [{'frame': frame, 'share': round(count / total, 3)}
+                               for frame, count in leaves.most_common(20)],
+                'last_dump': self.last_dump
+            }
+
+    def dump(self) -> Optional[str]:
+        """Write the collapsed stacks to output_dir; returns the file path."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"profile_{os.getpid()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.collapsed")
+        with open(path, 'w') as f:
+            f.write(self.collapsed())
+        print(f"📄 Profile written to {path}")
+        return path
+
+
+def install_signal_handler(profiler: SamplingProfiler, seconds: float = 30.0, signum: int = None) -> bool:
+    """
+    Toggle the profiler on a signal: the first starts a run, the next (or the
+    time cap) stops it and writes the collapsed stacks to disk.
+
+    Signal handlers can only be installed from the main thread; returns
+    whether the handler was installed.
+    """
+    signum = signum or getattr(signal, 'SIGUSR2', None)
+    if signum is None or threading.current_thread() is not threading.main_thread():
+        return False
+
+    def handle(received, frame):
+        if profiler.running:
+            # Stopping joins the sampler thread, so do it off the signal handler
+            threading.Thread(target=profiler.stop, daemon=True).start()
+        else:
+            profiler.start(seconds, dump=True)
+
+    signal.signal(signum, handle)
+    return True
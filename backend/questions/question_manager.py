@@ -1,8 +1,24 @@
 import json
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import random
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # bulk question sets are drawn one candidate at a time
+
+DIFFICULTY_ORDER = ('Easy', 'Intermediate', 'Hard', 'Expert')
+
+# Difficulty a candidate's questions are centred on
+EXPERIENCE_DIFFICULTY = {
+    'Intern': 'Easy',
+    'Junior': 'Easy',
+    'Mid-level': 'Intermediate',
+    'Senior': 'Hard',
+    'Lead': 'Expert'
+}
+
 class QuestionManager:
     """Manages question bank and selection."""
     
@@ -11,6 +27,7 @@ class QuestionManager:
             os.path.dirname(__file__), 'question_bank.json'
         )
         self.questions = self._load_questions()
+        self._ranked: Dict[tuple, List[Tuple[int, Dict[str, Any]]]] = {}
     
     def _load_questions(self) -> Dict[str, Dict[str, List[Dict]]]:
         """Load question bank from JSON file."""
@@ -20,6 +37,18 @@ class QuestionManager:
         except FileNotFoundError:
             raise FileNotFoundError(f"Question bank not found: {self.question_bank_path}")
     
+    def reload(self) -> bool:
+        """Re-read the question bank; a missing or invalid file keeps the current bank."""
+        try:
+            questions = self._load_questions()
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Keeping current question bank, reload failed: {e}")
+            return False
+        self.questions = questions
+        self._ranked = {}
+        print("🔄 Question bank reloaded")
+        return True
+    
     def get_question(self, role: str, difficulty: str, question_id: str = None) -> Optional[Dict[str, Any]]:
         """Get a specific question or random question for role/difficulty."""
         try:
@@ -57,26 +86,74 @@ class QuestionManager:
         """Check if role/difficulty combination exists."""
         return role in self.questions and difficulty in self.questions[role]
    
+    def ranked_questions(self, role, domain, experience_level) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        (tier, question) for every bank question of the role, best fit first.
+        
+        Tier 0 is the experience level's difficulty in the requested domain;
+        each step of difficulty away adds 2 and another domain adds 1.
+        Questions are copies carrying their difficulty. Cached per key until
+        the bank reloads.
+        """
+        key = (role, domain, experience_level)
+        ranked = self._ranked.get(key)
+        if ranked is None:
+            by_difficulty = self.questions.get(role, {}) if isinstance(self.questions, dict) else {}
+            # Distance is measured on the full scale, so a role without the
+            # target difficulty starts from the nearest one it has
+            order = list(DIFFICULTY_ORDER) + [d for d in by_difficulty if d not in DIFFICULTY_ORDER]
+            target_index = order.index(EXPERIENCE_DIFFICULTY.get(experience_level, 'Easy'))
+            ranked = []
+            for index, difficulty in enumerate(order):
+                for question in by_difficulty.get(difficulty, []):
+                    if not isinstance(question, dict):
+                        continue
+                    tier = abs(index - target_index) * 2 + (0 if question.get('domain', domain) == domain else 1)
+                    ranked.append((tier, dict(question, difficulty=difficulty)))
+            ranked.sort(key=lambda entry: entry[0])
+            self._ranked[key] = ranked
+        return ranked
+    
     def get_questions(self, role, domain, experience_level, count=5):
-        import json
-        import os
-
-        questions_path = os.path.join(os.path.dirname(__file__), "question_bank.json")
-        with open(questions_path, "r") as f:
-            all_questions = json.load(f)
-
-        filtered = []
-        for q in all_questions:
-            # If q is a string, wrap it as a dict
-            if isinstance(q, str):
-                filtered.append({"text": q})
-            # If q is a dict, filter by role/domain/experience_level
-            elif isinstance(q, dict):
-                if (
-                    (not q.get("role") or q.get("role") == role) and
-                    (not q.get("domain") or q.get("domain") == domain) and
-                    (not q.get("experience_level") or q.get("experience_level") == experience_level)
-                ):
-                    filtered.append(q)
-        return filtered[:count]
-        return filtered[:count]
+        """
+        A question set for one candidate: the best-fitting tier first, with
+        questions of equal fit in random order so candidates differ.
+        """
+        tiers: Dict[int, List[Dict[str, Any]]] = {}
+        for tier, question in self.ranked_questions(role, domain, experience_level):
+            tiers.setdefault(tier, []).append(question)
+        selected = []
+        for tier in sorted(tiers):
+            random.shuffle(tiers[tier])
+            selected.extend(tiers[tier])
+            if len(selected) >= count:
+                break
+        return selected[:count]
+    
+    def question_sets(self, keys, count=5) -> List[List[Dict[str, Any]]]:
+        """
+        One question set per (role, domain, experience_level) in keys, in order,
+        each drawn as get_questions would (bulk creation).
+        
+        Each distinct key is ranked once; with numpy, the sets of all its
+        candidates are drawn in one pass by sorting tier + uniform noise.
+        """
+        keys = list(keys)
+        by_key: Dict[tuple, List[int]] = {}
+        for position, key in enumerate(keys):
+            by_key.setdefault(tuple(key), []).append(position)
+        
+        sets: List[List[Dict[str, Any]]] = [[] for _ in keys]
+        for key, positions in by_key.items():
+            if np is None:
+                for position in positions:
+                    sets[position] = self.get_questions(*key, count=count)
+                continue
+            ranked = self.ranked_questions(*key)
+            if not ranked:
+                continue
+            tiers = np.array([tier for tier, _ in ranked], dtype=np.float64)
+            order = np.argsort(np.random.random((len(positions), len(ranked))) + tiers, axis=1)[:, :count]
+            for position, row in zip(positions, order.tolist()):
+                sets[position] = [ranked[index][1] for index in row]
+        return sets
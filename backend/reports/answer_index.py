@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+MinHash/LSH index of submitted answers, per question (requires numpy).
+
+Flags answers that are near-duplicates of earlier submissions or of a
+question's sample answer. Rebuild from the backend directory:
+    python -m reports.answer_index --rebuild
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from reports.report_archive import REPORT_DIR, iter_report_paths, load_report, report_id_for, build_lock
+
+INDEX_PATH = os.path.join(REPORT_DIR, 'answer_index.db')
+QUESTION_BANK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'questions', 'question_bank.json')
+
+SCORE_FIELDS = ('score', 'clarity', 'accuracy', 'completeness', 'confidence')
+
+# Smallest prime above 2**32: (a * x + b) % p stays within uint64 for 32-bit shingle hashes
+_PRIME = np.uint64(4294967311)
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def question_key(question_id: Optional[str], text: str = '') -> str:
+    """Bank question id, or a digest of the text for questions without one."""
+    if question_id:
+        return str(question_id)
+    normalized = ' '.join(_WORD.findall((text or '').lower()))
+    return 'text:' + hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+def _report_answers(report: Dict[str, Any]) -> Iterator[Tuple[str, str, Optional[Dict[str, Any]]]]:
+    """(question key, answer, 0-100 score) for every answer in a stored report, either layout."""
+    if 'candidate' in report:
+        for result in report.get('results', []):
+            scores = result.get('scores', {})
+            score = {'score': result.get('overall', 0) * 20,
+                     **{k: scores.get(k, 0) * 20 for k in SCORE_FIELDS[1:]},
+                     'feedback': result.get('feedback', '')}
+            yield question_key(result.get('question_id'), result.get('question_text', '')), \
+                result.get('answer', ''), score
+    else:
+        scores = report.get('scores', [])
+        for index, answer in enumerate(report.get('answers', [])):
+            score = scores[index] if index < len(scores) else None
+            yield question_key(answer.get('question_id'), answer.get('question', '')), answer.get('answer', ''), score
+
+
+class AnswerIndex:
+    """
+    Near-duplicate lookup over every stored answer, bucketed per question.
+
+    Each answer's word 3-gram shingles are MinHashed into num_perm values and
+    split into LSH bands; two answers whose shingle sets have Jaccard
+    similarity s share at least one band with probability 1 - (1 - s^r)^b.
+    Signatures live in SQLite and are mirrored into in-memory buckets, so a
+    lookup is a few dict probes plus one numpy comparison per candidate.
+    Rows written by other worker processes are picked up on the next lookup.
+    """
+
+    def __init__(self, db_path: str = INDEX_PATH, num_perm: int = 64, bands: int = 16,
+                 threshold: float = 0.8, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.db_path = db_path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.threshold = threshold
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, int, bytes], List[int]] = {}
+        self._exact: Dict[Tuple[str, str], int] = {}
+        self._entries: Dict[int, Tuple[str, str, np.ndarray]] = {}
+        self._scores: Dict[int, Optional[str]] = {}
+        self._last_id = 0
+        self._init_schema()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'AnswerIndex':
+        """Build an index from the duplicate_detection section of defaults.json."""
+        return cls(
+            num_perm=settings.get('num_perm', 64),
+            bands=settings.get('bands', 16),
+            threshold=settings.get('threshold', 0.8)
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the connection for the current process/thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS answers ('
+            'id INTEGER PRIMARY KEY, question_key TEXT, report_id TEXT, source TEXT, '
+            'digest TEXT, signature BLOB, score TEXT)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_answers_report_id ON answers (report_id)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_answers_source ON answers (source)')
+        conn.close()
+        self._local.conn = None
+
+    @staticmethod
+    def _words(text: str) -> List[str]:
+        return _WORD.findall((text or '').lower())
+
+    def _digest(self, words: List[str]) -> str:
+        return hashlib.sha1(' '.join(words).encode('utf-8')).hexdigest()
+
+    def signature(self, words: List[str]) -> Optional[np.ndarray]:
+        """MinHash signature of the word 3-gram shingles (single words for very short answers)."""
+        if not words:
+            return None
+        if len(words) < 3:
+            shingles = set(words)
+        else:
+            shingles = {' '.join(words[i:i + 3]) for i in range(len(words) - 2)}
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+        return ((np.outer(hashes, self._a) + self._b) % _PRIME).min(axis=0)
+
+    def _band_keys(self, key: str, signature: np.ndarray) -> Iterator[Tuple[str, int, bytes]]:
+        r = self.rows_per_band
+        for band in range(self.bands):
+            yield key, band, signature[band * r:(band + 1) * r].tobytes()
+
+    def _catch_up(self):
+        """
+        Load rows added since the last call (by this or another process).
+
+        Rows are read and bucketed into fresh tables without the lock; the
+        lock is only held to merge them in (or, on the first load, to swap
+        them in), so a large load never holds up find().
+        """
+        rows = self._connect().execute(
+            'SELECT id, question_key, source, report_id, digest, signature, score FROM answers '
+            'WHERE id > ? ORDER BY id', (self._last_id,)
+        ).fetchall()
+        if not rows:
+            return
+
+        entries, scores, exact, buckets = {}, {}, {}, {}
+        for row_id, key, source, report_id, digest, blob, score in rows:
+            signature = np.frombuffer(blob, dtype=np.uint64)
+            entries[row_id] = (source, report_id, signature)
+            scores[row_id] = score
+            exact.setdefault((key, digest), row_id)
+            for band_key in self._band_keys(key, signature):
+                buckets.setdefault(band_key, []).append(row_id)
+        last_id = rows[-1][0]
+
+        with self._lock:
+            if not self._entries:
+                self._entries, self._scores, self._exact, self._buckets = entries, scores, exact, buckets
+            else:
+                fresh = entries.keys() - self._entries.keys()
+                self._entries.update((row_id, entries[row_id]) for row_id in fresh)
+                self._scores.update((row_id, scores[row_id]) for row_id in fresh)
+                for digest_key, row_id in exact.items():
+                    if row_id in fresh:
+                        self._exact.setdefault(digest_key, row_id)
+                for band_key, row_ids in buckets.items():
+                    row_ids = [row_id for row_id in row_ids if row_id in fresh]
+                    if row_ids:
+                        self._buckets.setdefault(band_key, []).extend(row_ids)
+            self._last_id = max(self._last_id, last_id)
+
+    def warm(self) -> int:
+        """Load every stored signature into memory; returns the number of indexed answers."""
+        self._catch_up()
+        return len(self._entries)
+
+    def ensure_built(self, report_dir: str = None, bank_path: str = QUESTION_BANK_PATH) -> int:
+        """
+        Index the archive if nothing is indexed yet, then warm this process.
+
+        Called by every worker after fork; the build runs under a lock file,
+        so only the first worker indexes and the rest find it done.
+        """
+        with build_lock(self.db_path):
+            if len(self) == 0:
+                self.rebuild(report_dir, bank_path)
+        return self.warm()
+
+    def __len__(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM answers').fetchone()[0]
+
+    def find(self, question: Dict[str, Any], answer: str) -> Optional[Dict[str, Any]]:
+        """
+        Closest earlier answer (or sample answer) to this one, if similar enough.
+
+        Returns {"similarity": float, "exact": bool, "source": "answer" or "sample",
+        "report_id": str or None, "score": dict or None} or None.
+        """
+        words = self._words(answer)
+        signature = self.signature(words)
+        if signature is None:
+            return None
+        key = question_key(question.get('id'), question.get('text', ''))
+        digest = self._digest(words)
+
+        self._catch_up()
+        with self._lock:
+            exact = self._exact.get((key, digest))
+            if exact is not None:
+                best_id, best = exact, 1.0
+            else:
+                candidates = set()
+                for band_key in self._band_keys(key, signature):
+                    candidates.update(self._buckets.get(band_key, ()))
+                best_id, best = None, 0.0
+                for row_id in candidates:
+                    similarity = float(np.count_nonzero(self._entries[row_id][2] == signature)) / self.num_perm
+                    if similarity > best:
+                        best_id, best = row_id, similarity
+            if best_id is None or best < self.threshold:
+                return None
+            source, report_id, _ = self._entries[best_id]
+            score = self._scores[best_id]
+
+        return {
+            "similarity": round(best, 3),
+            "exact": exact is not None,
+            "source": source,
+            "report_id": report_id,
+            "score": json.loads(score) if score else None
+        }
+
+    def _rows(self, key: str, answer: str, source: str, report_id: Optional[str],
+              score: Optional[Dict[str, Any]]) -> Optional[tuple]:
+        words = self._words(answer)
+        signature = self.signature(words)
+        if signature is None:
+            return None
+        if score is not None:
+            score = json.dumps({k: score.get(k) for k in (*SCORE_FIELDS, 'feedback', 'partial') if k in score})
+        return key, report_id, source, self._digest(words), signature.tobytes(), score
+
+    def _write(self, rows: List[tuple], replace_sql: str = None, replace_params: tuple = ()):
+        """Insert rows in one transaction (optionally deleting others first), then load them."""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if replace_sql:
+                conn.execute(replace_sql, replace_params)
+            conn.executemany(
+                'INSERT INTO answers (question_key, report_id, source, digest, signature, score) '
+                'VALUES (?, ?, ?, ?, ?, ?)', rows
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        self._catch_up()
+
+    def add_report(self, report_id: str, report: Dict[str, Any]) -> int:
+        """Index every answer of a stored report (skipped if already indexed); returns the number added."""
+        conn = self._connect()
+        if conn.execute('SELECT 1 FROM answers WHERE report_id = ? LIMIT 1', (report_id,)).fetchone():
+            return 0
+        rows = [row for row in (self._rows(key, answer, 'answer', report_id, score)
+                                for key, answer, score in _report_answers(report)) if row]
+        if rows:
+            self._write(rows)
+        return len(rows)
+
+    def load_samples(self, bank_path: str = QUESTION_BANK_PATH) -> int:
+        """Replace the indexed sample answers with the question bank's current ones."""
+        with open(bank_path, 'r') as f:
+            bank = json.load(f)
+        rows = []
+        for difficulties in bank.values():
+            for questions in difficulties.values():
+                for question in questions:
+                    if question.get('sample_answer'):
+                        row = self._rows(question_key(question.get('id'), question.get('text', '')),
+                                         question['sample_answer'], 'sample', None, None)
+                        if row:
+                            rows.append(row)
+        self._write(rows, "DELETE FROM answers WHERE source = 'sample'")
+        self._reset_memory()
+        return len(rows)
+
+    def _reset_memory(self):
+        with self._lock:
+            self._buckets.clear()
+            self._exact.clear()
+            self._entries.clear()
+            self._scores.clear()
+            self._last_id = 0
+        self._catch_up()
+
+    def rebuild(self, report_dir: str = None, bank_path: str = QUESTION_BANK_PATH) -> int:
+        """Re-index the question bank's sample answers and every archived report; returns the answer count."""
+        self._connect().execute("DELETE FROM answers WHERE source = 'answer'")
+        self.load_samples(bank_path)
+        count = 0
+        for path in iter_report_paths(report_dir or REPORT_DIR):
+            try:
+                count += self.add_report(report_id_for(path), load_report(path))
+            except (OSError, ValueError):
+                continue
+        return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the near-duplicate answer index")
+    parser.add_argument('--rebuild', action='store_true', help="index every archived answer and sample answer")
+    parser.add_argument('--dir', default=REPORT_DIR, help="report directory")
+    parser.add_argument('--db', default=INDEX_PATH, help="index database")
+    args = parser.parse_args(argv)
+
+    index = AnswerIndex(args.db)
+    if args.rebuild:
+        print(f"Indexed {index.rebuild(args.dir)} answers")
+    print(f"{len(index)} answers in {args.db}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Stream the report archive as NDJSON or CSV.
+
+Run from the backend directory:
+    python -m reports.export_reports --format csv --role "DevOps Engineer" --since 2026-01-01 > devops.csv
+"""
+import argparse
+import sys
+
+from reports.report_archive import REPORT_DIR, iter_reports, export_ndjson, export_csv
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export stored interview reports")
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    parser.add_argument('--dir', default=REPORT_DIR, help="report directory")
+    parser.add_argument('--since', help="ISO date/time, inclusive")
+    parser.add_argument('--until', help="ISO date/time, inclusive")
+    parser.add_argument('--role')
+    parser.add_argument('--min-score', type=float, help="overall score, 0-100")
+    parser.add_argument('--max-score', type=float, help="overall score, 0-100")
+    parser.add_argument('--full', action='store_true', help="NDJSON only: whole reports instead of summaries")
+    parser.add_argument('--output', '-o', help="file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    rows = iter_reports(args.dir, since=args.since, until=args.until, role=args.role,
+                        min_score=args.min_score, max_score=args.max_score)
+    chunks = export_csv(rows) if args.format == 'csv' else export_ndjson(rows, full=args.full)
+
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Background PDF rendering for stored reports (requires weasyprint).
+
+Render a batch from the backend directory:
+    python -m reports.pdf_service --since 2026-10-12
+"""
+import argparse
+import hashlib
+import importlib.util
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait as wait_futures
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional
+
+from reports.report_archive import REPORT_DIR, iter_report_paths, load_report, report_id_for
+
+PDF_CACHE_DIR = os.path.join(REPORT_DIR, 'pdf_cache')
+
+
+def render_pdf(report_path: str, pdf_path: str) -> str:
+    """Render one stored report to a PDF file (runs in a worker process)."""
+    from weasyprint import HTML
+    from reports.report_generator import ReportGenerator
+
+    html = ReportGenerator(output_dir=os.path.dirname(pdf_path)).render_report_html(load_report(report_path))
+    # Per-process temp file: two reports with the same content render to the same PDF
+    tmp_path = f"{pdf_path}.{os.getpid()}.tmp"
+    HTML(string=html).write_pdf(tmp_path)
+    os.replace(tmp_path, pdf_path)
+    return pdf_path
+
+
+def render_cached_pdf(report_path: str, cache_dir: str) -> str:
+    """Render a report unless its PDF is already cached; returns the PDF path (runs in a worker process)."""
+    pdf_path = os.path.join(cache_dir, f"{report_hash(report_path)}.pdf")
+    if not os.path.exists(pdf_path):
+        render_pdf(report_path, pdf_path)
+    return pdf_path
+
+
+def report_hash(report_path: str) -> str:
+    """Content hash of a stored report; the PDF cache key."""
+    digest = hashlib.sha256()
+    with open(report_path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_max_workers() -> int:
+    """Cores per serving process: WEB_CONCURRENCY processes each get their share, not one pool per core."""
+    return max(1, (os.cpu_count() or 1) // max(1, int(os.getenv('WEB_CONCURRENCY') or 1)))
+
+
+class PDFRenderService:
+    """
+    Renders report PDFs in a process pool so WeasyPrint never runs on a request thread.
+
+    Jobs are queued on the pool and tracked by id. Finished PDFs are cached on
+    disk by report content hash, so a report is rendered at most once, and a
+    report already being rendered is not queued twice. The hash is computed
+    by the job itself, so submitting reads no report files. Workers are
+    spawned, not forked, because the API process is multi-threaded.
+    """
+
+    def __init__(self, cache_dir: str = PDF_CACHE_DIR, max_workers: int = None, max_jobs: int = 10000):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers or default_max_workers()
+        self.max_jobs = max_jobs
+        self._pool = None
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, Any] = {}
+        self._batches: Dict[str, List[str]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'PDFRenderService':
+        """Build the service from the pdf_rendering section of defaults.json."""
+        return cls(
+            cache_dir=settings.get('cache_dir') or PDF_CACHE_DIR,
+            max_workers=settings.get('max_workers'),
+            max_jobs=settings.get('max_jobs', 10000)
+        )
+
+    @staticmethod
+    def available() -> bool:
+        """Whether weasyprint is installed."""
+        return importlib.util.find_spec('weasyprint') is not None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._pool
+
+    def _prune(self):
+        """Forget the oldest finished jobs once more than max_jobs are tracked. Caller holds the lock."""
+        if len(self._jobs) <= self.max_jobs:
+            return
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[job_id]['status'] in ('done', 'failed'):
+                del self._jobs[job_id]
+
+    def submit(self, report_id: str, report_path: str) -> Dict[str, Any]:
+        """Queue a report for rendering; returns the job (its pdf_path is set once done)."""
+        job_id = f"pdf-{next(self._ids)}"
+        job = {
+            'job_id': job_id,
+            'report_id': report_id,
+            'status': 'queued',
+            'pdf_path': None,
+            'error': None,
+            'submitted_at': time.time(),
+            'finished_at': None
+        }
+
+        with self._lock:
+            self._jobs[job_id] = job
+            self._prune()
+            future = self._inflight.get(report_path)
+            if future is None:
+                try:
+                    future = self.pool.submit(render_cached_pdf, report_path, self.cache_dir)
+                except BrokenProcessPool:
+                    # A worker died (e.g. killed for memory); start a fresh pool
+                    self._pool = None
+                    future = self.pool.submit(render_cached_pdf, report_path, self.cache_dir)
+                self._inflight[report_path] = future
+                future.add_done_callback(lambda _: self._inflight.pop(report_path, None))
+
+        def finished(done):
+            error = done.exception()
+            job.update(
+                status='failed' if error else 'done',
+                pdf_path=None if error else done.result(),
+                error=str(error) if error else None,
+                finished_at=time.time()
+            )
+
+        future.add_done_callback(finished)
+        return job
+
+    def submit_batch(self, reports: List[tuple]) -> Dict[str, Any]:
+        """Queue many (report_id, report_path) pairs; returns the batch status."""
+        job_ids = [self.submit(report_id, path)['job_id'] for report_id, path in reports]
+        batch_id = f"batch-{next(self._ids)}"
+        with self._lock:
+            self._batches[batch_id] = job_ids
+        return self.get_batch(batch_id)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._jobs.get(job_id)
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        job_ids = self._batches.get(batch_id)
+        if job_ids is None:
+            return None
+        counts = {'queued': 0, 'done': 0, 'failed': 0}
+        for job_id in job_ids:
+            job = self.get_job(job_id)
+            if job:
+                counts[job['status']] += 1
+        return {'batch_id': batch_id, 'total': len(job_ids), **counts, 'job_ids': job_ids}
+
+    def wait(self, timeout: float = None):
+        """Block until every queued render has finished."""
+        with self._lock:
+            pending = list(self._inflight.values())
+        wait_futures(pending, timeout=timeout)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def main(argv=None):
+    from reports.report_archive import iter_reports, find_report_path
+
+    parser = argparse.ArgumentParser(description="Render report PDFs on all cores")
+    parser.add_argument('--dir', default=REPORT_DIR, help="report directory")
+    parser.add_argument('--since', help="ISO date/time, inclusive")
+    parser.add_argument('--until', help="ISO date/time, inclusive")
+    parser.add_argument('--role')
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    if not PDFRenderService.available():
+        raise SystemExit("PDF generation requires weasyprint. Install with: pip install weasyprint")
+
+    service = PDFRenderService(max_workers=args.workers or os.cpu_count())
+    if args.since or args.until or args.role:
+        reports = [(s['report_id'], find_report_path(s['report_id'], args.dir))
+                   for s, _ in iter_reports(args.dir, since=args.since, until=args.until, role=args.role)]
+    else:
+        reports = [(report_id_for(path), path) for path in iter_report_paths(args.dir)]
+
+    started = time.time()
+    batch = service.submit_batch(reports)
+    service.wait()
+    batch = service.get_batch(batch['batch_id'])
+    print(f"Rendered {batch['done']} PDFs ({batch['failed']} failed) in {time.time() - started:.1f}s")
+    service.shutdown()
+
+
+if __name__ == '__main__':
+    main()
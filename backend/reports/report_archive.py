@@ -0,0 +1,248 @@
+import csv
+import gzip
+import io
+import json
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime, time
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: index builds are not coordinated across processes
+
+# The archive (and the indexes and PDF cache kept beside it) can live outside the source tree
+REPORT_DIR = os.getenv('REPORT_DIR') or os.path.dirname(os.path.abspath(__file__))
+
+REPORT_EXTENSIONS = ('.json', '.json.gz', '.json.zst')
+
+# Reports are saved as <name>_<YYYYmmdd>_<HHMMSS>.json[.gz|.zst]
+_FILENAME_DATE = re.compile(r'_(\d{8})_\d{6}\.')
+
+SUMMARY_FIELDS = [
+    'report_id', 'timestamp', 'candidate_name', 'candidate_email', 'role', 'experience', 'domain',
+    'overall_score', 'clarity', 'accuracy', 'completeness', 'confidence', 'num_answers', 'recommendations'
+]
+
+DIMENSIONS = ['clarity', 'accuracy', 'completeness', 'confidence']
+
+
+@contextmanager
+def build_lock(db_path: str):
+    """Exclusive lock (across processes) for building the index stored at db_path."""
+    with open(f"{db_path}.lock", 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def iter_report_paths(report_dir: str = None) -> Iterator[str]:
+    """Yield report JSON paths without listing the whole directory into memory."""
+    with os.scandir(report_dir or REPORT_DIR) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(REPORT_EXTENSIONS):
+                yield entry.path
+
+
+def report_id_for(path: str) -> str:
+    """Report id is the file name without its extension."""
+    name = os.path.basename(path)
+    for extension in REPORT_EXTENSIONS:
+        if name.endswith(extension):
+            return name[:-len(extension)]
+    return name
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    """Load one stored report (plain, gzip or zstd JSON)."""
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rt') as f:
+            return json.load(f)
+    if path.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Reading .json.zst reports requires zstandard. Install with: pip install zstandard")
+        with open(path, 'rb') as f:
+            return json.loads(zstandard.ZstdDecompressor().decompress(f.read()))
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def write_report(base_path: str, report: Dict[str, Any], storage_format: str = 'json.gz') -> str:
+    """
+    Write a report as compact JSON, optionally compressed; returns the file path.
+
+    storage_format is "json", "json.gz" or "json.zst" (falls back to gzip if
+    zstandard is not installed). The file is written under a temporary name
+    and renamed, so readers never see a partial report.
+    """
+    data = json.dumps(report, separators=(',', ':')).encode('utf-8')
+
+    if storage_format == 'json.zst':
+        try:
+            import zstandard
+            data = zstandard.ZstdCompressor(level=10).compress(data)
+        except ImportError:
+            print("⚠️ zstandard not installed - storing report as json.gz")
+            storage_format = 'json.gz'
+    if storage_format == 'json.gz':
+        data = gzip.compress(data, compresslevel=6)
+    elif storage_format not in ('json', 'json.zst'):
+        raise ValueError(f"Unsupported report storage format: {storage_format}")
+
+    path = f"{base_path}.{storage_format}"
+    with open(path + '.tmp', 'wb') as f:
+        f.write(data)
+    os.replace(path + '.tmp', path)
+    return path
+
+
+def find_report_path(report_id: str, report_dir: str = None) -> Optional[str]:
+    """Path of a stored report by id, whichever format it was saved in."""
+    if os.path.basename(report_id) != report_id:
+        return None
+    for extension in REPORT_EXTENSIONS:
+        path = os.path.join(report_dir or REPORT_DIR, report_id + extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def summarize_report(report: Dict[str, Any], report_id: str = None) -> Dict[str, Any]:
+    """
+    Flatten a stored report into one export row.
+
+    Handles both layouts in the archive: the flat API report (scores 0-100)
+    and the ReportGenerator report with candidate/results/analysis (rubric
+    scores 1-5, multiplied by 20 here so every row uses the 0-100 scale).
+    """
+    if 'candidate' in report:
+        candidate = report.get('candidate', {})
+        aggregates = report.get('analysis', {}).get('aggregate_scores', {})
+        summary = {
+            'candidate_name': candidate.get('name'),
+            'candidate_email': candidate.get('email'),
+            'role': candidate.get('role'),
+            'experience': candidate.get('experience_level'),
+            'domain': candidate.get('domain'),
+            'timestamp': report.get('report_metadata', {}).get('generated_at'),
+            'overall_score': round(aggregates.get('overall', 0) * 20, 2),
+            'num_answers': len(report.get('results', [])),
+            'recommendations': report.get('analysis', {}).get('recommendations', []),
+        }
+        for dimension in DIMENSIONS:
+            summary[dimension] = round(aggregates.get(dimension, 0) * 20, 2)
+    else:
+        summary = {
+            'candidate_name': report.get('candidate_name'),
+            'candidate_email': report.get('candidate_email'),
+            'role': report.get('role'),
+            'experience': report.get('experience'),
+            'domain': report.get('domain'),
+            'timestamp': report.get('timestamp'),
+            'overall_score': round(report.get('overall_score', 0), 2),
+            'num_answers': len(report.get('answers', [])),
+            'recommendations': report.get('recommendations', []),
+        }
+        for dimension in DIMENSIONS:
+            summary[dimension] = round(report.get(dimension, 0), 2)
+
+    summary['report_id'] = report_id
+    return summary
+
+
+def _local_naive(value: datetime) -> datetime:
+    """Reports are stamped in naive local time; aware datetimes are converted to match."""
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def parse_date(value, end_of_day: bool = False) -> Optional[datetime]:
+    """
+    ISO string to naive local datetime; a bare date used as an upper bound
+    covers that whole day. Raises ValueError for anything else.
+    """
+    if value is None or isinstance(value, datetime):
+        return _local_naive(value) if value is not None else None
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid date: {value!r}")
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid date: {value!r}")
+    if end_of_day and len(value) == 10:
+        parsed = datetime.combine(parsed.date(), time.max)
+    return _local_naive(parsed)
+
+
+def iter_reports(report_dir: str = None,
+                 since: datetime = None,
+                 until: datetime = None,
+                 role: str = None,
+                 min_score: float = None,
+                 max_score: float = None) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Stream (summary, report) pairs matching the filters, one file at a time.
+
+    Dates are ISO strings or datetimes (an invalid one raises ValueError
+    before anything is yielded); scores use the 0-100 scale. Files whose
+    name shows they were saved on a day outside the date range are skipped
+    without being opened.
+    """
+    since, until = parse_date(since), parse_date(until, end_of_day=True)
+    since_day = since.strftime('%Y%m%d') if since else None
+    until_day = until.strftime('%Y%m%d') if until else None
+
+    for path in iter_report_paths(report_dir):
+        match = _FILENAME_DATE.search(path)
+        if match:
+            day = match.group(1)
+            if (since_day and day < since_day) or (until_day and day > until_day):
+                continue
+
+        try:
+            report = load_report(path)
+        except (OSError, ValueError):
+            continue
+
+        summary = summarize_report(report, report_id_for(path))
+        if role and summary['role'] != role:
+            continue
+        if min_score is not None and summary['overall_score'] < min_score:
+            continue
+        if max_score is not None and summary['overall_score'] > max_score:
+            continue
+        if since or until:
+            try:
+                timestamp = _local_naive(datetime.fromisoformat(summary['timestamp']))
+            except (TypeError, ValueError):
+                continue
+            if (since and timestamp < since) or (until and timestamp > until):
+                continue
+
+        yield summary, report
+
+
+def export_ndjson(rows: Iterator, full: bool = False) -> Iterator[str]:
+    """One JSON line per report: the summary, or the whole report with full=True."""
+    for summary, report in rows:
+        record = dict(report, report_id=summary['report_id']) if full else summary
+        yield json.dumps(record, separators=(',', ':')) + '\n'
+
+
+def export_csv(rows: Iterator) -> Iterator[str]:
+    """Header line, then one CSV line per report summary."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=SUMMARY_FIELDS, extrasaction='ignore')
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for summary, _ in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(dict(summary, recommendations=' | '.join(map(str, summary['recommendations']))))
+        yield buffer.getvalue()
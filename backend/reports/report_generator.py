@@ -83,6 +83,48 @@ class ReportGenerator:
         except ImportError:
             return "PDF generation requires weasyprint. Install with: pip install weasyprint"
     
+    def render_report_html(self, report_data: Dict[str, Any]) -> str:
+        """Render a stored report to HTML in memory (no file is written)."""
+        if 'candidate' in report_data:
+            return self._build_html_report(
+                report_data['candidate'],
+                report_data.get('results', []),
+                report_data.get('analysis', {})
+            )
+        return self._build_html_report(*self._from_session_report(report_data))
+    
+    def _from_session_report(self, report_data: Dict[str, Any]):
+        """
+        Map a flat API report (LLM scores 0-100) onto the candidate/results/analysis
+        layout of the HTML template, which shows the 1-5 rubric scale.
+        """
+        dimensions = ['clarity', 'accuracy', 'completeness', 'confidence']
+        candidate_info = {
+            'name': report_data.get('candidate_name'),
+            'email': report_data.get('candidate_email'),
+            'role': report_data.get('role'),
+            'experience_level': report_data.get('experience'),
+            'domain': report_data.get('domain')
+        }
+        
+        results = []
+        for answer, score in zip(report_data.get('answers', []), report_data.get('scores', [])):
+            results.append({
+                'question_text': answer.get('question', ''),
+                'scores': {d: round(score.get(d, 0) / 20, 1) for d in dimensions},
+                'overall': score.get('score', 0) / 20
+            })
+        
+        aggregate_scores = {d: round(report_data.get(d, 0) / 20, 2) for d in dimensions}
+        aggregate_scores['overall'] = round(report_data.get('overall_score', 0) / 20, 2)
+        analysis = {
+            'aggregate_scores': aggregate_scores,
+            'summary': {},
+            'patterns': [],
+            'recommendations': report_data.get('recommendations', [])
+        }
+        return candidate_info, results, analysis
+    
     def _build_html_report(self,
                           candidate_info: Dict[str, str],
                           results: List[Dict[str, Any]],
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+SQLite index over the report archive.
+
+Rebuild from the backend directory:
+    python -m reports.report_index --rebuild
+"""
+import argparse
+import base64
+import os
+import sqlite3
+import threading
+from typing import Dict, Any, List, Optional
+
+from reports.report_archive import (
+    REPORT_DIR, iter_report_paths, load_report, report_id_for, summarize_report, parse_date, build_lock
+)
+
+INDEX_PATH = os.path.join(REPORT_DIR, 'report_index.db')
+
+SCORE_COLUMNS = ['overall_score', 'clarity', 'accuracy', 'completeness', 'confidence']
+FILTER_COLUMNS = ['role', 'experience', 'domain', 'candidate_email']
+
+_COLUMNS = ['report_id', 'path', 'timestamp', 'candidate_name', 'candidate_email', 'role',
+            'experience', 'domain', *SCORE_COLUMNS, 'num_answers']
+
+
+class ReportIndex:
+    """
+    Queryable index of report summaries (one row per stored report).
+
+    Rows hold the 0-100 summary produced by report_archive.summarize_report
+    and the report's file path. Every filterable column is indexed, and
+    search() pages with a keyset cursor on (timestamp, report_id) so deep
+    pages cost the same as the first one.
+    """
+
+    def __init__(self, db_path: str = INDEX_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the connection for the current process/thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS reports ('
+            'report_id TEXT PRIMARY KEY, path TEXT, timestamp TEXT, candidate_name TEXT, '
+            'candidate_email TEXT, role TEXT, experience TEXT, domain TEXT, '
+            'overall_score REAL, clarity REAL, accuracy REAL, completeness REAL, confidence REAL, '
+            'num_answers INTEGER)'
+        )
+        for column in ['timestamp', *FILTER_COLUMNS, *SCORE_COLUMNS]:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS idx_reports_{column} ON reports ({column})')
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_reports_role_experience_timestamp '
+            'ON reports (role, experience, timestamp)'
+        )
+        conn.execute("UPDATE reports SET timestamp = '' WHERE timestamp IS NULL")
+        conn.close()
+        self._local.conn = None
+
+    @staticmethod
+    def _row(summary: Dict[str, Any], path: str = None) -> tuple:
+        # A missing timestamp is stored as '' (sorting oldest), never NULL, so the keyset cursor can encode it
+        row = dict(summary, path=path, timestamp=summary.get('timestamp') or '')
+        return tuple(row.get(column) for column in _COLUMNS)
+
+    def add(self, summary: Dict[str, Any], path: str = None):
+        """Insert or replace one report summary."""
+        placeholders = ', '.join('?' * len(_COLUMNS))
+        self._connect().execute(
+            f'INSERT OR REPLACE INTO reports ({", ".join(_COLUMNS)}) VALUES ({placeholders})',
+            self._row(summary, path)
+        )
+
+    def remove(self, report_id: str):
+        self._connect().execute('DELETE FROM reports WHERE report_id = ?', (report_id,))
+
+    def __len__(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM reports').fetchone()[0]
+
+    def rebuild(self, report_dir: str = None, batch_size: int = 1000) -> int:
+        """Re-index every report in the archive; returns the number indexed."""
+        conn = self._connect()
+        placeholders = ', '.join('?' * len(_COLUMNS))
+        sql = f'INSERT OR REPLACE INTO reports ({", ".join(_COLUMNS)}) VALUES ({placeholders})'
+        report_dir = report_dir or REPORT_DIR
+
+        count = 0
+        batch = []
+        for path in iter_report_paths(report_dir):
+            try:
+                summary = summarize_report(load_report(path), report_id_for(path))
+            except (OSError, ValueError):
+                continue
+            batch.append(self._row(summary, path))
+            if len(batch) >= batch_size:
+                count += self._write_batch(conn, sql, batch)
+                batch = []
+        if batch:
+            count += self._write_batch(conn, sql, batch)
+        return count
+
+    def ensure_built(self, report_dir: str = None) -> int:
+        """Index the archive if the index is empty (first run); one process builds, under a lock file."""
+        with build_lock(self.db_path):
+            if len(self) == 0:
+                return self.rebuild(report_dir)
+        return 0
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection, sql: str, batch: List[tuple]) -> int:
+        """One transaction per batch instead of one per row."""
+        conn.execute('BEGIN')
+        try:
+            conn.executemany(sql, batch)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return len(batch)
+
+    def get(self, report_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute('SELECT * FROM reports WHERE report_id = ?', (report_id,)).fetchone()
+        return dict(row) if row else None
+
+    def search(self,
+               filters: Dict[str, Any] = None,
+               since: str = None,
+               until: str = None,
+               limit: int = 50,
+               cursor: str = None) -> Dict[str, Any]:
+        """
+        Find reports, newest first.
+
+        Args:
+            filters: exact matches on role/experience/domain/candidate_email and
+                     min_<score>/max_<score> bounds, e.g. {"role": "DevOps Engineer",
+                     "max_accuracy": 50}
+            since/until: ISO date or date-time bounds on the report timestamp
+            limit: page size (max 500)
+            cursor: next_cursor from the previous page
+
+        Returns:
+            {"results": [...], "next_cursor": str or None}
+        """
+        filters = filters or {}
+        clauses, params = [], []
+
+        for column in FILTER_COLUMNS:
+            if filters.get(column):
+                clauses.append(f'{column} = ?')
+                params.append(filters[column])
+        for column in SCORE_COLUMNS:
+            for bound, op in (('min', '>='), ('max', '<=')):
+                value = filters.get(f'{bound}_{column}')
+                if value is not None:
+                    clauses.append(f'{column} {op} ?')
+                    params.append(float(value))
+        if since:
+            clauses.append('timestamp >= ?')
+            params.append(parse_date(since).isoformat())
+        if until:
+            clauses.append('timestamp <= ?')
+            params.append(parse_date(until, end_of_day=True).isoformat())
+        if cursor:
+            timestamp, report_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('\x00', 1)
+            clauses.append('(timestamp, report_id) < (?, ?)')
+            params.extend([timestamp, report_id])
+
+        limit = max(1, min(int(limit), 500))
+        where = f'WHERE {" AND ".join(clauses)}' if clauses else ''
+        rows = self._connect().execute(
+            f'SELECT * FROM reports {where} ORDER BY timestamp DESC, report_id DESC LIMIT ?',
+            (*params, limit + 1)
+        ).fetchall()
+
+        results: List[Dict[str, Any]] = [dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = results[-1]
+            next_cursor = base64.urlsafe_b64encode(
+                f"{last['timestamp'] or ''}\x00{last['report_id']}".encode()
+            ).decode()
+        return {"results": results, "next_cursor": next_cursor}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the report index")
+    parser.add_argument('--rebuild', action='store_true', help="index every report in the archive")
+    parser.add_argument('--dir', default=REPORT_DIR, help="report directory")
+    parser.add_argument('--db', default=INDEX_PATH, help="index database")
+    args = parser.parse_args(argv)
+
+    index = ReportIndex(args.db)
+    if args.rebuild:
+        print(f"Indexed {index.rebuild(args.dir)} reports")
+    print(f"{len(index)} reports in {args.db}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Embedding-based key-point coverage (requires numpy; CPU only).
+
+SentenceTransformerEmbedder gives semantic matching and is the default when
+sentence-transformers is installed. Otherwise HashingEmbedder is used, which
+is lexical: it tolerates inflection, word order and spelling variants but
+knows nothing of meaning, so a key point restated in different words is not
+matched.
+
+Precompute the question bank matrix from the backend directory:
+    python -m scoring.embeddings
+    python -m scoring.embeddings --embedder hashing
+
+The matrix is written next to the question bank. If it is missing, or was
+built from a different version of the bank, it is rebuilt in memory at load.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import zlib
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+QUESTIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'questions')
+QUESTION_BANK_PATH = os.path.join(QUESTIONS_DIR, 'question_bank.json')
+EMBEDDINGS_PATH = os.path.join(QUESTIONS_DIR, 'question_embeddings.npz')
+
+# Cosine similarity at which a key point counts as covered by some span of the answer, when the
+# matrix carries no threshold calibrated for its embedder (see calibrate_threshold)
+COVERAGE_THRESHOLD = 0.5
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#\-']*")
+_SENTENCE = re.compile(r'(?<=[.!?;])\s+|\n+')
+_SUFFIXES = ('ations', 'ation', 'ings', 'ing', 'ages', 'age', 'ers', 'er', 'ed', 'es', 's', 'e', 'ly')
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were "
+    "will with we you i they it's can do does".split()
+)
+
+
+class HashingEmbedder:
+    """
+    Lexical character n-gram hashing embedder: no model, no training, deterministic.
+
+    A word's vector is the signed hash of its padded 3-5 character n-grams,
+    the word itself and a crude stem, so inflections and compounds
+    ("storage", "stores", "cache-aside") land close together; synonyms do
+    not ("fast" and "quick" share nothing). The stem is weighted so that
+    two words sharing it outweigh their differing n-grams. A span's
+    vector is the sum of its words' vectors, which lets embed_spans() embed
+    every short span of an answer at once from prefix sums.
+    """
+
+    name = 'hashing'
+
+    def __init__(self, dim: int = 512, ngrams: tuple = (3, 4, 5), stem_weight: int = 4):
+        self.dim = dim
+        self.ngrams = ngrams
+        self.stem_weight = stem_weight
+        self._word_cache: Dict[str, np.ndarray] = {}
+
+    @property
+    def spec(self) -> str:
+        return f"hashing:{self.dim}:{self.stem_weight}"
+
+    def _word_vector(self, word: str) -> np.ndarray:
+        vector = self._word_cache.get(word)
+        if vector is None:
+            vector = np.zeros(self.dim, dtype=np.float32)
+            padded = f"<{word}>"
+            stem = '~' + _stem(word)
+            features = [word] + [stem] * self.stem_weight + [padded[i:i + n] for n in self.ngrams for i in range(len(padded) - n + 1)]
+            for feature in features:
+                h = zlib.crc32(feature.encode('utf-8'))
+                vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+            if len(self._word_cache) < 100000:
+                self._word_cache[word] = vector
+        return vector
+
+    def _words(self, text: str) -> List[str]:
+        return [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+    def _word_matrix(self, words: List[str]) -> np.ndarray:
+        if not words:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack([self._word_vector(w) for w in words])
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """One L2-normalized row per text."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = self._words(text)
+            if words:
+                matrix[row] = self._word_matrix(words).sum(axis=0)
+        return _normalize(matrix)
+
+    def embed_spans(self, text: str, max_words: int = 4) -> np.ndarray:
+        """Every run of 1..max_words consecutive words, plus the whole text, one normalized row each."""
+        words = self._words(text)
+        if not words:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        prefix = np.vstack([np.zeros((1, self.dim), dtype=np.float32),
+                            np.cumsum(self._word_matrix(words), axis=0)])
+        n = len(words)
+        starts, ends = [], []
+        for length in range(1, min(max_words, n) + 1):
+            starts.extend(range(0, n - length + 1))
+            ends.extend(range(length, n + 1))
+        spans = prefix[ends] - prefix[starts]
+        return _normalize(np.vstack([spans, prefix[-1:]]))
+
+
+class SentenceTransformerEmbedder:
+    """Semantic embeddings from a sentence-transformers model (optional dependency); spans are sentences."""
+
+    name = 'sentence-transformers'
+
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError("This embedder requires sentence-transformers. "
+                              "Install with: pip install sentence-transformers")
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name, device='cpu')
+
+    @property
+    def spec(self) -> str:
+        return f"sentence-transformers:{self.model_name}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return _normalize(np.asarray(self.model.encode(list(texts)), dtype=np.float32))
+
+    def embed_spans(self, text: str, max_words: int = 4) -> np.ndarray:
+        sentences = [s for s in _SENTENCE.split(text) if s.strip()]
+        return self.embed(sentences + [text]) if sentences else np.zeros((0, 1), dtype=np.float32)
+
+
+def _stem(word: str) -> str:
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def default_embedder():
+    """Sentence-transformers if installed, else the lexical hashing embedder."""
+    try:
+        import sentence_transformers  # noqa: F401
+    except ImportError:
+        return HashingEmbedder()
+    return SentenceTransformerEmbedder()
+
+
+def create_embedder(spec: str):
+    """Embedder from a spec string such as "hashing:512:4" or "sentence-transformers:all-MiniLM-L6-v2"."""
+    kind, _, arg = spec.partition(':')
+    if kind == 'hashing':
+        # Matrices written before the stem weight was in the spec ("hashing:512") used a weight of 2
+        dim, _, stem_weight = arg.partition(':')
+        return HashingEmbedder(int(dim or 512), stem_weight=int(stem_weight or 2))
+    if kind == 'sentence-transformers':
+        return SentenceTransformerEmbedder(arg or 'all-MiniLM-L6-v2')
+    raise ValueError(f"Unknown embedder: {spec}")
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-9)
+
+
+def _bank_hash(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def calibrate_threshold(embedder, questions: List[Dict[str, Any]], min_points: int = 20) -> float:
+    """
+    Coverage threshold for this embedder, from the bank's own sample answers.
+
+    Each key point is scored against its question's sample answer (which
+    should cover it) and against every other sample answer (which should
+    not); the threshold is the similarity that best separates the two
+    (maximum true minus false positive rate). Falls back to
+    COVERAGE_THRESHOLD when the bank has too few sample answers.
+    """
+    questions = [q for q in questions if q.get('sample_answer') and q.get('key_points')]
+    if sum(len(q['key_points']) for q in questions) < min_points or len(questions) < 2:
+        return COVERAGE_THRESHOLD
+
+    spans = [embedder.embed_spans(q['sample_answer']) for q in questions]
+    own, other = [], []
+    for i, question in enumerate(questions):
+        points = embedder.embed(question['key_points'])
+        for j, answer_spans in enumerate(spans):
+            best = (points @ answer_spans.T).max(axis=1)
+            (own if i == j else other).append(best)
+    own, other = np.concatenate(own), np.concatenate(other)
+
+    candidates = np.unique(own)
+    separation = [(own >= t).mean() - (other >= t).mean() for t in candidates]
+    return float(candidates[int(np.argmax(separation))])
+
+
+def build_matrix(embedder, bank_path: str = QUESTION_BANK_PATH) -> Dict[str, np.ndarray]:
+    """Embed every key point and sample answer in the bank, rows grouped by question id, and calibrate the threshold."""
+    with open(bank_path, 'r') as f:
+        bank = json.load(f)
+
+    question_ids, kinds, texts = [], [], []
+    bank_questions = [question for difficulties in bank.values()
+                      for questions in difficulties.values() for question in questions]
+    for question in bank_questions:
+        for point in question.get('key_points', []):
+            question_ids.append(question['id'])
+            kinds.append('key_point')
+            texts.append(point)
+        if question.get('sample_answer'):
+            question_ids.append(question['id'])
+            kinds.append('sample_answer')
+            texts.append(question['sample_answer'])
+
+    return {
+        'vectors': embedder.embed(texts) if texts else np.zeros((0, 1), dtype=np.float32),
+        'question_ids': np.array(question_ids),
+        'kinds': np.array(kinds),
+        'texts': np.array(texts),
+        'embedder': np.array(embedder.spec),
+        'bank_sha256': np.array(_bank_hash(bank_path)),
+        'threshold': np.array(calibrate_threshold(embedder, bank_questions)),
+    }
+
+
+class KeyPointIndex:
+    """
+    Key-point and sample-answer embeddings of the question bank, by question id.
+
+    coverage() embeds the answer once (all of its short spans) and scores
+    every key point of the question with one matrix product.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], embedder=None, threshold: float = None):
+        self.embedder = embedder or create_embedder(str(arrays['embedder']))
+        if threshold is None:
+            threshold = float(arrays['threshold']) if 'threshold' in arrays else COVERAGE_THRESHOLD
+        self.threshold = threshold
+        self.vectors = arrays['vectors']
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        for row, (question_id, kind, text) in enumerate(zip(arrays['question_ids'], arrays['kinds'], arrays['texts'])):
+            entry = self._rows.setdefault(str(question_id), {'points': [], 'rows': [], 'sample': None})
+            if kind == 'key_point':
+                entry['points'].append(str(text))
+                entry['rows'].append(row)
+            else:
+                entry['sample'] = row
+
+    @classmethod
+    def load(cls, path: str = EMBEDDINGS_PATH, bank_path: str = QUESTION_BANK_PATH) -> 'KeyPointIndex':
+        """Load the precomputed matrix; rebuild it in memory if it is missing or stale."""
+        if os.path.exists(path):
+            arrays = dict(np.load(path))
+            if str(arrays['bank_sha256']) == _bank_hash(bank_path):
+                return cls(arrays)
+            print("⚠️ Question embeddings are stale - rebuilding in memory (run python -m scoring.embeddings)")
+            embedder = create_embedder(str(arrays['embedder']))
+        else:
+            embedder = default_embedder()
+        return cls(build_matrix(embedder, bank_path), embedder)
+
+    def __contains__(self, question_id) -> bool:
+        return question_id in self._rows
+
+    def coverage(self, question: Dict[str, Any], response: str) -> Optional[Dict[str, Any]]:
+        """
+        Similarity of the answer to each key point and to the sample answer.
+
+        Returns {"points": {point: similarity}, "covered": [points], "sample_similarity": float or None},
+        or None if the question is not in the index.
+        """
+        entry = self._rows.get(question.get('id'))
+        if entry is None:
+            return None
+
+        spans = self.embedder.embed_spans(response)
+        if len(spans) == 0:
+            return {'points': {p: 0.0 for p in entry['points']}, 'covered': [], 'sample_similarity': 0.0}
+
+        similarities = {}
+        if entry['rows']:
+            best = (self.vectors[entry['rows']] @ spans.T).max(axis=1)
+            similarities = {point: float(s) for point, s in zip(entry['points'], best)}
+        sample = float(self.vectors[entry['sample']] @ spans[-1]) if entry['sample'] is not None else None
+
+        return {
+            'points': similarities,
+            'covered': [p for p, s in similarities.items() if s >= self.threshold],
+            'sample_similarity': sample
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute question bank embeddings")
+    parser.add_argument('--embedder', choices=['hashing', 'sentence-transformers'],
+                        help="default: sentence-transformers if installed, else hashing")
+    parser.add_argument('--model', default='all-MiniLM-L6-v2', help="sentence-transformers model")
+    parser.add_argument('--dim', type=int, default=512, help="hashing embedder dimensions")
+    parser.add_argument('--bank', default=QUESTION_BANK_PATH)
+    parser.add_argument('--output', '-o', default=EMBEDDINGS_PATH)
+    args = parser.parse_args(argv)
+
+    if args.embedder == 'hashing':
+        embedder = HashingEmbedder(args.dim)
+    elif args.embedder == 'sentence-transformers':
+        embedder = SentenceTransformerEmbedder(args.model)
+    else:
+        embedder = default_embedder()
+    arrays = build_matrix(embedder, args.bank)
+    np.savez_compressed(args.output, **arrays)
+    print(f"Wrote {len(arrays['texts'])} embeddings ({embedder.spec}, "
+          f"coverage threshold {float(arrays['threshold']):.2f}) to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Re-score archived answers and compare score distributions.
+
+Run from the backend directory:
+    python -m scoring.rescore --scorer heuristic --out rescore.ndjson --report rescore_diff.json
+    python -m scoring.rescore --scorer llm --model llama3 --workers 4 --out llama3.ndjson --resume
+
+Results are appended to --out as they finish; with --resume, answers already
+in that file are skipped, so an interrupted run picks up where it stopped.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Iterator, List
+
+from reports.report_archive import REPORT_DIR, iter_report_paths, load_report, report_id_for
+
+SCORE_KEYS = ['score', 'clarity', 'accuracy', 'completeness', 'confidence']
+
+QUESTION_BANK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'questions', 'question_bank.json')
+
+
+def load_question_lookup(path: str = QUESTION_BANK_PATH) -> Dict[str, Dict[str, Any]]:
+    """Question bank entries by id and by text."""
+    with open(path, 'r') as f:
+        bank = json.load(f)
+    lookup = {}
+    for difficulties in bank.values():
+        for questions in difficulties.values():
+            for question in questions:
+                lookup[question['id']] = question
+                lookup[question['text']] = question
+    return lookup
+
+
+def iter_answers(report_dir: str = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream every archived answer with its stored score (0-100), one report file at a time.
+
+    Each item has a stable key "<report_id>#<index>" used for checkpointing.
+    """
+    for path in iter_report_paths(report_dir):
+        try:
+            report = load_report(path)
+        except (OSError, ValueError):
+            continue
+        report_id = report_id_for(path)
+
+        if 'candidate' in report:
+            role = report['candidate'].get('role')
+            for index, result in enumerate(report.get('results', [])):
+                scores = result.get('scores', {})
+                yield {
+                    'key': f"{report_id}#{index}",
+                    'role': role,
+                    'question_id': result.get('question_id'),
+                    'question': result.get('question_text', ''),
+                    'answer': result.get('answer', ''),
+                    'old': {'score': result.get('overall', 0) * 20,
+                            **{k: scores.get(k, 0) * 20 for k in SCORE_KEYS[1:]}}
+                }
+        else:
+            for index, (answer, score) in enumerate(zip(report.get('answers', []), report.get('scores', []))):
+                yield {
+                    'key': f"{report_id}#{index}",
+                    'role': report.get('role'),
+                    'question_id': None,
+                    'question': answer.get('question', ''),
+                    'answer': answer.get('answer', ''),
+                    'old': {k: score.get(k, 0) for k in SCORE_KEYS}
+                }
+
+
+# Per-process scorer state, set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(scorer: str, model: str, band: tuple):
+    from scoring.scoring_engine import ScoringEngine
+    _worker['scorer'] = scorer
+    _worker['band'] = band
+    _worker['questions'] = load_question_lookup()
+    _worker['engine'] = ScoringEngine()
+    if scorer in ('llm', 'hybrid'):
+        from llm_agent import InterviewAgent
+        _worker['agent'] = InterviewAgent(model_name=model, reuse_context=False)
+
+
+def _score_one(item: Dict[str, Any]) -> Dict[str, Any]:
+    question = _worker['questions'].get(item['question_id']) or _worker['questions'].get(item['question']) \
+        or {'text': item['question']}
+
+    if _worker['scorer'] == 'llm':
+        return _worker['agent'].score_answer(question.get('text', ''), item['answer'],
+                                             expected_concepts=question.get('key_points'))
+
+    result = _worker['engine'].score_response_percent(item['answer'], question)
+    low, high = _worker['band']
+    # Hybrid: trust the heuristic at the extremes, ask the LLM about the middle
+    if _worker['scorer'] == 'hybrid' and low <= result['score'] <= high:
+        return _worker['agent'].score_answer(question.get('text', ''), item['answer'],
+                                             expected_concepts=question.get('key_points'))
+    return result
+
+
+def score_batch(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Score a batch in a worker; failures are recorded per answer, not raised."""
+    rows = []
+    for item in items:
+        row = {'key': item['key'], 'role': item['role'], 'old': item['old']}
+        try:
+            new = _score_one(item)
+            # A partial LLM score lacks the dimensions its truncated output did not reach
+            row['new'] = {k: new[k] for k in SCORE_KEYS if new.get(k) is not None}
+            if new.get('partial'):
+                row['partial'] = True
+        except Exception as e:
+            row['error'] = str(e)
+        rows.append(row)
+    return rows
+
+
+def _batches(items: Iterator[Dict[str, Any]], size: int, skip: set) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for item in items:
+        if item['key'] in skip:
+            continue
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def completed_keys(out_path: str) -> set:
+    """Keys already scored in a previous run's output; answers that failed are tried again."""
+    keys = set()
+    if not os.path.exists(out_path):
+        return keys
+    with open(out_path, 'r') as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if 'new' in row:
+                keys.add(row['key'])
+    return keys
+
+
+def _trim_partial_line(out_path: str):
+    """Drop a half-written last line left by an interrupted run before appending."""
+    if not os.path.exists(out_path):
+        return
+    with open(out_path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        position = size
+        while position > 0:
+            step = min(65536, position)
+            f.seek(position - step)
+            block = f.read(step)
+            newline = block.rfind(b'\n')
+            if newline != -1:
+                position = position - step + newline + 1
+                break
+            position -= step
+        if position != size:
+            f.truncate(position)
+
+
+def run(report_dir: str, out_path: str, scorer: str = 'heuristic', model: str = 'mistral',
+        workers: int = None, batch_size: int = 200, resume: bool = False, band: tuple = (40, 70)) -> int:
+    """
+    Score every archived answer not yet in out_path; returns the number scored.
+
+    At most two batches per worker are in flight, so memory stays flat however
+    large the archive is.
+    """
+    if resume:
+        _trim_partial_line(out_path)
+    skip = completed_keys(out_path) if resume else set()
+    workers = workers or ((os.cpu_count() or 1) if scorer == 'heuristic' else 4)
+    done = 0
+
+    with open(out_path, 'a' if resume else 'w') as out, \
+            ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(scorer, model, band)) as pool:
+        pending = set()
+        for batch in _batches(iter_answers(report_dir), batch_size, skip):
+            pending.add(pool.submit(score_batch, batch))
+            if len(pending) >= workers * 2:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                done += _write(out, finished)
+                print(f"\r{done} answers re-scored", end='', file=sys.stderr)
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            done += _write(out, finished)
+    print(f"\r{done} answers re-scored", file=sys.stderr)
+    return done
+
+
+def _write(out, futures) -> int:
+    count = 0
+    for future in futures:
+        for row in future.result():
+            out.write(json.dumps(row, separators=(',', ':')) + '\n')
+            count += 1
+    # One flush per batch: a crash loses at most the batches still in flight
+    out.flush()
+    return count
+
+
+class _Moments:
+    """Streaming count/mean/stdev and a 10-point histogram of one score."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.histogram = [0] * 10
+
+    def add(self, value: float):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+        self.histogram[min(9, max(0, int(value // 10)))] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'mean': round(self.mean, 2),
+            'stdev': round(math.sqrt(self.m2 / self.n), 2) if self.n else 0.0,
+            'histogram': self.histogram
+        }
+
+
+def diff_report(out_path: str, threshold: float = 10.0) -> Dict[str, Any]:
+    """Score distribution before and after, per dimension and per role, from a run's output."""
+    old = defaultdict(_Moments)
+    new = defaultdict(_Moments)
+    shift = defaultdict(_Moments)
+    moved = defaultdict(int)
+    roles = defaultdict(lambda: [_Moments(), _Moments()])
+    scored, failed = set(), set()
+
+    with open(out_path, 'r') as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if 'new' not in row:
+                failed.add(row['key'])
+                continue
+            scored.add(row['key'])
+            for key in SCORE_KEYS:
+                if key not in row['new']:
+                    continue
+                before, after = row['old'].get(key, 0), row['new'][key]
+                old[key].add(before)
+                new[key].add(after)
+                shift[key].add(abs(after - before))
+                if abs(after - before) > threshold:
+                    moved[key] += 1
+            role = roles[row.get('role') or 'unknown']
+            role[0].add(row['old'].get('score', 0))
+            role[1].add(row['new'].get('score', 0))
+
+    return {
+        'answers': len(scored | failed),
+        'errors': len(failed - scored),
+        'threshold': threshold,
+        'dimensions': {
+            key: {
+                'old': old[key].to_dict(),
+                'new': new[key].to_dict(),
+                'mean_shift': round(new[key].mean - old[key].mean, 2),
+                'mean_abs_change': round(shift[key].mean, 2),
+                'changed_over_threshold': moved[key]
+            } for key in SCORE_KEYS if old[key].n
+        },
+        'roles': {
+            role: {'answers': before.n, 'old_mean': round(before.mean, 2), 'new_mean': round(after.mean, 2)}
+            for role, (before, after) in sorted(roles.items())
+        }
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score archived answers and diff the score distributions")
+    parser.add_argument('--scorer', choices=['heuristic', 'llm', 'hybrid'], default='heuristic')
+    parser.add_argument('--model', default='mistral', help="Ollama model for llm/hybrid")
+    parser.add_argument('--dir', default=REPORT_DIR, help="report directory")
+    parser.add_argument('--out', default='rescore.ndjson', help="per-answer results (also the checkpoint)")
+    parser.add_argument('--report', help="write the distribution diff as JSON here")
+    parser.add_argument('--workers', type=int, help="worker processes (default: cores, or 4 for llm/hybrid)")
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--resume', action='store_true', help="skip answers already in --out")
+    parser.add_argument('--band', type=float, nargs=2, default=(40, 70), metavar=('LOW', 'HIGH'),
+                        help="hybrid: heuristic scores in this range go to the LLM")
+    parser.add_argument('--threshold', type=float, default=10.0, help="a change above this counts as moved")
+    args = parser.parse_args(argv)
+
+    run(args.dir, args.out, args.scorer, args.model, args.workers, args.batch_size, args.resume, tuple(args.band))
+    report = diff_report(args.out, args.threshold)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+    print(f"{report['answers']} answers, {report['errors']} errors")
+    print(f"{'dimension':<14}{'old mean':>10}{'new mean':>10}{'shift':>8}{'|change|':>10}{'moved':>8}")
+    for key, row in report['dimensions'].items():
+        print(f"{key:<14}{row['old']['mean']:>10}{row['new']['mean']:>10}{row['mean_shift']:>8}"
+              f"{row['mean_abs_change']:>10}{row['changed_over_threshold']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,11 +2,51 @@ from typing import Dict, Any, List
 import re
 from datetime import datetime
 
+try:
+    from scoring.embeddings import KeyPointIndex
+except ImportError:
+    KeyPointIndex = None  # numpy not installed: key points are matched as substrings only
+
 class ScoringEngine:
     """Evaluates candidate responses on multiple dimensions."""
     
-    def __init__(self):
+    def __init__(self, key_point_index=None, use_embeddings: bool = True):
         self.dimensions = ['clarity', 'accuracy', 'completeness', 'confidence']
+        self.use_embeddings = use_embeddings and KeyPointIndex is not None
+        self.key_point_index = key_point_index
+        if key_point_index is None and self.use_embeddings:
+            self.reload_key_points()
+    
+    def reload_key_points(self):
+        """(Re)load the precomputed question bank embeddings."""
+        if not self.use_embeddings:
+            return
+        try:
+            self.key_point_index = KeyPointIndex.load()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Key-point embeddings unavailable, using substring matching: {e}")
+            self.key_point_index = None
+    
+    def _key_point_coverage(self, response: str, question: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Key points the response covers, by substring or by embedding similarity
+        to some short span of it, and its similarity to the sample answer.
+        """
+        key_points = question.get('key_points', [])
+        response_lower = response.lower()
+        covered = {point for point in key_points if point.lower() in response_lower}
+        sample_similarity = None
+        
+        if self.key_point_index is not None and response.strip():
+            similar = self.key_point_index.coverage(question, response)
+            if similar is not None:
+                covered.update(similar['covered'])
+                sample_similarity = similar['sample_similarity']
+        
+        return {
+            'covered': [point for point in key_points if point in covered],
+            'sample_similarity': sample_similarity
+        }
     
     def score_response(self, 
                       response: str,
@@ -23,7 +63,9 @@ class ScoringEngine:
         Returns:
             Dict with per-dimension scores (1-5) and insights
         """
-        metadata = metadata or {}
+        metadata = dict(metadata or {})
+        # Embed the response once for all three key-point checks
+        metadata.setdefault('key_point_coverage', self._key_point_coverage(response, question))
         
         scores = {
             'clarity': self._score_clarity(response, metadata),
@@ -40,6 +82,19 @@ class ScoringEngine:
             'insights': self._generate_insights(response, question, scores, metadata)
         }
     
+    def score_response_percent(self,
+                               response: str,
+                               question: Dict[str, Any],
+                               metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+        """score_response on the 0-100 scale of LLM scores, with insights joined into feedback."""
+        result = self.score_response(response, question, metadata)
+        insights = result['insights']
+        return {
+            'score': round(result['overall'] * 20),
+            **{dimension: value * 20 for dimension, value in result['scores'].items()},
+            'feedback': "; ".join(insights['strengths'] + insights['gaps'])
+        }
+    
     def _score_clarity(self, response: str, metadata: Dict[str, Any]) -> int:
         """
         Score clarity (1-5).
@@ -93,11 +148,14 @@ class ScoringEngine:
         
         # Check key points coverage
         key_points = question.get('key_points', [])
-        covered_points = sum(1 for point in key_points 
-                           if point.lower() in response_lower)
+        coverage = metadata.get('key_point_coverage') or self._key_point_coverage(response, question)
+        covered_points = len(coverage['covered'])
         
         # Scoring based on key points
-        if not key_points:
+        if not key_points and coverage['sample_similarity'] is not None:
+            similarity = coverage['sample_similarity']
+            score = 2 if similarity < 0.2 else 3 if similarity < 0.4 else 4 if similarity < 0.6 else 5
+        elif not key_points:
             score = 3
         else:
             coverage_ratio = covered_points / len(key_points)
@@ -164,7 +222,8 @@ class ScoringEngine:
         # Check key points coverage as completeness indicator
         key_points = question.get('key_points', [])
         if key_points:
-            covered = sum(1 for point in key_points if point.lower() in response_lower)
+            coverage = metadata.get('key_point_coverage') or self._key_point_coverage(response, question)
+            covered = len(coverage['covered'])
             if covered < len(key_points) * 0.5:
                 score = max(1, score - 1)
         
@@ -253,8 +312,8 @@ class ScoringEngine:
         
         # Add follow-up specific insights
         key_points = question.get('key_points', [])
-        response_lower = response.lower()
-        missing_points = [p for p in key_points if p.lower() not in response_lower]
+        coverage = metadata.get('key_point_coverage') or self._key_point_coverage(response, question)
+        missing_points = [p for p in key_points if p not in coverage['covered']]
         
         if missing_points:
             gaps.append(f"Missing discussion of: {', '.join(missing_points)}")
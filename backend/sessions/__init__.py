@@ -0,0 +1 @@
+# Sessions package
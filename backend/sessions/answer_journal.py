@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Write-ahead journal of interview progress, so a crash loses no answers.
+
+Every session start, scored answer and completion is appended as one JSON
+line to this process's journal file. A single writer thread group-commits:
+it writes everything appended since its last pass and fsyncs once, so
+concurrent /answer requests share one fsync instead of paying one each.
+On startup the journals are replayed into the session store (restoring
+sessions that are missing or behind) and those of exited processes are
+consolidated; a completed session's records are dropped once its report is
+written, keeping its completion marker while other journals may still
+hold its start.
+
+Inspect the journals from the backend directory:
+    python -m sessions.answer_journal
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: recovery runs without the cross-process lock
+
+JOURNAL_DIR = os.getenv('ANSWER_JOURNAL_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'journal')
+
+TERMINAL_OPS = ('complete', 'reap')
+
+_JOURNAL_PID = re.compile(r'journal_(\d+)\.log$')
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Journal records in file order; a line torn by a crash ends the file."""
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                return
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def replay_records(records: List[Dict[str, Any]]) -> 'OrderedDict[str, Dict[str, Any]]':
+    """Rebuild the sessions that were started but not completed, by session id."""
+    live: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+    for record in sorted(records, key=lambda r: r.get('t', 0)):
+        session_id, op = record.get('sid'), record.get('op')
+        if op == 'start':
+            live[session_id] = dict(record['session'], answers=[], scores=[])
+        elif op == 'answer' and session_id in live:
+            live[session_id]['answers'].append(record['entry'])
+            live[session_id]['scores'].append(record['score'])
+            live[session_id].update(record.get('update', {}))
+        elif op in TERMINAL_OPS:
+            live.pop(session_id, None)
+    return live
+
+
+class AnswerJournal:
+    """
+    Append-only, group-committed log of session starts, answers and completions.
+
+    durability "group" makes append() return once its record is fsynced
+    (sharing the fsync with every record appended meanwhile); "async"
+    returns as soon as the record is buffered and leaves the fsync to the
+    next commit, at most commit_window later. Each process writes its own
+    file, opened lazily, so the journal can be created in a pre-fork master.
+    """
+
+    def __init__(self, directory: str = JOURNAL_DIR, durability: str = 'group',
+                 commit_window: float = 0.002, compact_bytes: int = 8 * 1024 * 1024):
+        if durability not in ('group', 'async'):
+            raise ValueError(f"Unknown journal durability: {durability}")
+        self.directory = directory
+        self.durability = durability
+        self.commit_window = commit_window
+        self.compact_bytes = compact_bytes
+
+        self._start_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._buffer: List[bytes] = []
+        self._appended = 0
+        self._synced = 0
+        self._pid = None
+        self._file = None
+        self._thread = None
+        self._completed = set()
+        self._compact_at = compact_bytes
+        self._error = None
+        self.commits = 0
+        self.records = 0
+        self.compactions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'AnswerJournal':
+        """Build a journal from the answer_journal section of defaults.json."""
+        return cls(
+            durability=settings.get('durability', 'group'),
+            commit_window=settings.get('commit_window_ms', 2) / 1000,
+            compact_bytes=settings.get('compact_bytes', 8 * 1024 * 1024)
+        )
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f"journal_{os.getpid()}.log")
+
+    def _ensure_writer(self):
+        """Open this process's file and start its writer thread (after fork, anew)."""
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._cond = threading.Condition()
+            self._buffer, self._appended, self._synced = [], 0, 0
+            self._completed = set()
+            self._error = None
+            self._file = open(self.path, 'ab')
+            self._thread = threading.Thread(target=self._run, name='answer-journal', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    # --- writing ---
+
+    def append(self, op: str, session_id: str, **fields):
+        """
+        Journal one record; in "group" mode, block until it is on disk.
+
+        op is "start" (with session=, the session without answers), "answer"
+        (entry=, score= and optionally update=, other session fields it set),
+        "complete" (report_id=), which marks the session's records obsolete
+        now that its report holds everything they did, or "reap" for a
+        session dropped as abandoned.
+        """
+        self.append_many([(op, session_id, fields)])
+
+    def append_many(self, records: List[Tuple[str, str, Dict[str, Any]]]):
+        """Journal (op, session_id, fields) records together; "group" mode waits for one commit."""
+        now = time.time()
+        # Serialized before taking the lock; replay keeps file order for equal timestamps
+        lines = [json.dumps(dict(fields, op=op, sid=session_id, t=now), separators=(',', ':')).encode('utf-8') + b'\n'
+                 for op, session_id, fields in records]
+        if self._pid != os.getpid():
+            self._ensure_writer()
+        with self._cond:
+            self._buffer.extend(lines)
+            self._appended += len(lines)
+            self._completed.update(session_id for op, session_id, _ in records if op in TERMINAL_OPS)
+            seq = self._appended
+            self._cond.notify_all()
+            if self.durability == 'group':
+                while self._synced < seq and self._error is None:
+                    self._cond.wait()
+                if self._error is not None and self._synced < seq:
+                    raise OSError(f"Answer journal write failed: {self._error}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._buffer:
+                    self._cond.wait()
+            if self.commit_window:
+                # Let concurrent requests join this commit
+                time.sleep(self.commit_window)
+            with self._cond:
+                batch, self._buffer = self._buffer, []
+                seq = self._appended
+            try:
+                self._file.write(b''.join(batch))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                error = None
+            except OSError as e:
+                error = e
+                print(f"❌ Answer journal write failed: {e}")
+            with self._cond:
+                if error is None:
+                    self._synced = seq
+                    self.commits += 1
+                    self.records += len(batch)
+                self._error = error
+                self._cond.notify_all()
+            if error is None and self._completed and self._file.tell() >= self._compact_at:
+                self._compact_own()
+
+    def _compact_own(self):
+        """
+        Rewrite this process's file without the records of sessions it saw completed.
+
+        A completed session whose start record is in another journal (another
+        worker's, or a recovered one) keeps its complete/reap marker, or
+        replaying that journal would bring the session back.
+        """
+        with self._cond:
+            completed = set(self._completed)
+        path = self.path
+        records = list(iter_records(path))
+        started_here = {r.get('sid') for r in records if r.get('op') == 'start'}
+        kept = [r for r in records if r.get('sid') not in completed
+                or (r.get('op') in TERMINAL_OPS and r.get('sid') not in started_here)]
+        self._write_atomic(path, kept)
+        with self._cond:
+            self._file.close()
+            self._file = open(path, 'ab')
+            self._completed -= completed
+            # Kept markers only go at recovery; don't rewrite the file on every commit meanwhile
+            self._compact_at = max(self.compact_bytes, 2 * self._file.tell())
+            self.compactions += 1
+
+    @staticmethod
+    def _write_atomic(path: str, records: List[Dict[str, Any]]):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        dir_fd = os.open(os.path.dirname(path), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    # --- recovery ---
+
+    def _paths(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, '*.log')))
+
+    def pending(self) -> 'OrderedDict[str, Dict[str, Any]]':
+        """Sessions the journals hold that were never completed."""
+        records = []
+        for path in self._paths():
+            records.extend(iter_records(path))
+        return replay_records(records)
+
+    @staticmethod
+    def _writer_alive(path: str) -> bool:
+        """Whether the process that owns a journal file is still running."""
+        match = _JOURNAL_PID.search(os.path.basename(path))
+        if match is None:
+            return False  # a consolidated recovered_*.log
+        pid = int(match.group(1))
+        if pid == os.getpid():
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def recover(self, store) -> int:
+        """
+        Restore unfinished sessions into store, then fold the journals of exited processes into one file.
+
+        A session is written back if the store lacks it or holds fewer answers
+        than the journal. Every journal is read (a live worker's may hold the
+        completion of a session started in a crashed one), but only files
+        whose writer has exited are consolidated and removed. Runs under an
+        exclusive lock on the journal directory, so processes that import the
+        app side by side recover one at a time. Returns the number of
+        sessions restored.
+        """
+        lock = open(os.path.join(self.directory, 'recover.lock'), 'w')
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            return self._recover(store)
+        finally:
+            lock.close()
+
+    def _recover(self, store) -> int:
+        paths = self._paths()
+        if not paths:
+            return 0
+        records, finished = [], []
+        for path in paths:
+            file_records = list(iter_records(path))
+            records.extend(file_records)
+            if not self._writer_alive(path):
+                finished.append((path, file_records))
+        live = replay_records(records)
+
+        restored = 0
+        for session_id, session in live.items():
+            stored = store.get(session_id)
+            if stored is None or len(stored.get('answers', [])) < len(session['answers']):
+                store[session_id] = session
+                restored += 1
+
+        # Keep the unfinished sessions' records from the exited writers' files
+        # in one file that is not any process's own; live files stay as they are
+        kept = sorted((r for _, file_records in finished for r in file_records if r.get('sid') in live),
+                      key=lambda r: r.get('t', 0))
+        if kept:
+            self._write_atomic(os.path.join(self.directory, f"recovered_{time.time():.6f}.log"), kept)
+        for path, _ in finished:
+            os.remove(path)
+        if restored:
+            print(f"♻️ Restored {restored} unfinished interview(s) from the answer journal")
+        return restored
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'durability': self.durability,
+                'records': self.records,
+                'commits': self.commits,
+                'records_per_commit': round(self.records / self.commits, 2) if self.commits else None,
+                'pending': self._appended - self._synced if self._pid == os.getpid() else 0,
+                'compactions': self.compactions,
+                'error': str(self._error) if self._error else None
+            }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List interviews held in the answer journal")
+    parser.add_argument('--dir', default=JOURNAL_DIR, help="journal directory")
+    args = parser.parse_args(argv)
+
+    live = AnswerJournal(args.dir).pending()
+    for session_id, session in live.items():
+        print(f"{session_id:<48}{len(session['answers']):>3} of {len(session.get('questions', [])):<3}"
+              f"{session.get('role', '')}")
+    print(f"{len(live)} unfinished interview(s) in {args.dir}")
+
+
+if __name__ == '__main__':
+    main()
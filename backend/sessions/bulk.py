@@ -0,0 +1,90 @@
+"""
+Candidate lists for bulk session creation (campus drives).
+
+Candidates come as CSV (a header row naming the columns) or JSON (a list of
+objects, or {"candidates": [...]}) with the fields /api/session/start takes.
+Results go back as NDJSON or CSV, one line per candidate.
+"""
+import csv
+import io
+import json
+import re
+import unicodedata
+from typing import Dict, Any, Iterator, List, Optional
+from urllib.parse import urlencode
+
+CANDIDATE_FIELDS = ('name', 'email', 'role', 'experience', 'domain')
+RESULT_FIELDS = ('row', 'name', 'email', 'session_id', 'link', 'error')
+
+# Column names accepted for each field besides its own
+_ALIASES = {'candidate_name': 'name', 'candidate_email': 'email', 'experience_level': 'experience'}
+
+
+def _normalize(candidate: Dict[str, Any]) -> Dict[str, str]:
+    fields = {}
+    for key, value in candidate.items():
+        key = str(key or '').strip().lower()
+        fields[_ALIASES.get(key, key)] = str(value).strip() if value is not None else ''
+    return {field: fields.get(field, '') for field in CANDIDATE_FIELDS}
+
+
+def parse_candidates(body: bytes, content_type: str = '') -> List[Dict[str, str]]:
+    """Candidates from a CSV or JSON body; raises ValueError if it is neither."""
+    text = body.decode('utf-8-sig')
+    if 'csv' in content_type or (not text.lstrip().startswith(('[', '{')) and 'json' not in content_type):
+        try:
+            return [_normalize(row) for row in csv.DictReader(io.StringIO(text))]
+        except csv.Error as e:
+            raise ValueError(str(e))
+
+    data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get('candidates')
+    if not isinstance(data, list) or not all(isinstance(c, dict) for c in data):
+        raise ValueError("Expected a list of candidate objects")
+    return [_normalize(candidate) for candidate in data]
+
+
+def validate_candidate(candidate: Dict[str, str], config_manager) -> Optional[str]:
+    """Why the candidate cannot get a session, or None."""
+    missing = [field for field in CANDIDATE_FIELDS if not candidate[field]]
+    if missing:
+        return f"Missing {', '.join(missing)}"
+    snapshot = config_manager.snapshot
+    if candidate['role'] not in snapshot.role_set:
+        return f"Unknown role: {candidate['role']}"
+    if candidate['experience'] not in snapshot.experience_level_set:
+        return f"Unknown experience level: {candidate['experience']}"
+    if candidate['domain'] not in snapshot.domain_set:
+        return f"Unknown domain: {candidate['domain']}"
+    return None
+
+
+def session_slug(name: str) -> str:
+    """Candidate name as a session id prefix: ASCII letters, digits and underscores only (safe in URLs and routes)."""
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^A-Za-z0-9]+', '_', ascii_name).strip('_') or 'candidate'
+
+
+def invite_link(link_base: str, session_id: str) -> str:
+    """The candidate's link: link_base with the session id as a (query-encoded) session parameter."""
+    return f"{link_base}{'&' if '?' in link_base else '?'}{urlencode({'session': session_id})}"
+
+
+def results_ndjson(results: List[Dict[str, Any]]) -> Iterator[str]:
+    for result in results:
+        yield json.dumps(result, separators=(',', ':')) + '\n'
+
+
+def results_csv(results: List[Dict[str, Any]]) -> Iterator[str]:
+    """Header line, then one CSV line per candidate."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=RESULT_FIELDS, extrasaction='ignore')
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for result in results:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(result)
+        yield buffer.getvalue()
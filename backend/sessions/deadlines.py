@@ -0,0 +1,123 @@
+"""
+Per-question time limits and abandoned-session cleanup run on timers.
+
+app.py arms a timer when a question opens (firing at its deadline plus
+grace, to submit the saved draft) and one per session for abandonment.
+Timers live in memory: each serving process re-arms those of the sessions
+in the store when its scheduler starts.
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Any
+
+
+class DeadlineScheduler:
+    """
+    Timers for every active session on one daemon thread.
+
+    Pending timers sit in a min-heap of (due, seq, key). Rescheduling a key
+    pushes a new entry and leaves the old one in place; it is skipped when
+    popped (and the heap is rebuilt once stale entries outnumber live ones),
+    so schedule() and cancel() stay O(log n) with tens of thousands of
+    timers. Due keys are handed to a small thread pool, so a slow handler
+    never delays the timers behind it.
+
+    Like FileWatcher, the thread is started per serving process; timers
+    scheduled before start() fire once it runs. Handlers must re-check the
+    state they act on, since any process may have changed it meanwhile.
+    """
+
+    def __init__(self, handler: Callable[[Hashable], None], workers: int = 2):
+        self.handler = handler
+        self.workers = workers
+
+        self._cond = threading.Condition()
+        self._heap = []
+        self._due: Dict[Hashable, float] = {}
+        self._seq = itertools.count()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pool = None
+        self._pid = None
+        self.fired = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+
+    def schedule(self, key: Hashable, due: float):
+        """Run handler(key) at epoch time due, replacing any pending timer for key."""
+        with self._cond:
+            self._due[key] = due
+            heapq.heappush(self._heap, (due, next(self._seq), key))
+            if self._heap[0][2] == key:
+                self._cond.notify()
+
+    def cancel(self, key: Hashable):
+        with self._cond:
+            self._due.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def _compact(self):
+        """Drop stale heap entries; called with the lock held."""
+        self._heap = [entry for entry in self._heap if self._due.get(entry[2]) == entry[0]]
+        heapq.heapify(self._heap)
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._cond:
+                if len(self._heap) > 2 * len(self._due) + 1024:
+                    self._compact()
+                now = time.time()
+                due_keys = []
+                while self._heap and self._heap[0][0] <= now:
+                    due, _, key = heapq.heappop(self._heap)
+                    if self._due.get(key) == due:
+                        del self._due[key]
+                        due_keys.append(key)
+                if not due_keys:
+                    self._cond.wait(min(self._heap[0][0] - now, 60.0) if self._heap else 60.0)
+                    continue
+            for key in due_keys:
+                self._pool.submit(self._fire, key)
+
+    def _fire(self, key: Hashable):
+        try:
+            self.handler(key)
+            self.fired += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"⚠️ Deadline handler failed for {key}: {e}")
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._pid = os.getpid()
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='deadline')
+        self._thread = threading.Thread(target=self._run, name='deadline-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            next_due = min(self._due.values()) if self._due else None
+            return {
+                'running': self.running,
+                'pending': len(self._due),
+                'heap_entries': len(self._heap),
+                'next_due_in_seconds': round(max(0.0, next_due - time.time()), 1) if next_due else None,
+                'fired': self.fired,
+                'failed': self.failed
+            }
@@ -0,0 +1,215 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Any, Optional, Callable, Iterator
+
+class InMemorySessionStore:
+    """Process-local session store (development server, single worker)."""
+
+    def __init__(self):
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def __getitem__(self, session_id: str) -> Dict[str, Any]:
+        return self._sessions[session_id]
+
+    def __setitem__(self, session_id: str, session: Dict[str, Any]):
+        with self._lock:
+            self._sessions[session_id] = session
+
+    def __delitem__(self, session_id: str):
+        with self._lock:
+            del self._sessions[session_id]
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str, default: Any = None) -> Optional[Dict[str, Any]]:
+        """Get a session or default if missing."""
+        return self._sessions.get(session_id, default)
+
+    def keys(self) -> Iterator[str]:
+        """Iterate over session ids."""
+        return iter(list(self._sessions.keys()))
+
+    def put_many(self, sessions: Dict[str, Dict[str, Any]]):
+        """Store several sessions at once."""
+        with self._lock:
+            self._sessions.update(sessions)
+
+    def update(self, session_id: str, mutator: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        """Apply mutator to a session atomically and return the updated session."""
+        with self._lock:
+            session = self._sessions[session_id]
+            mutator(session)
+            return session
+
+    def pop_if(self, session_id: str, predicate: Callable[[Dict[str, Any]], bool]) -> Optional[Dict[str, Any]]:
+        """Remove and return a session if predicate holds for it, atomically; otherwise None."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or not predicate(session):
+                return None
+            return self._sessions.pop(session_id)
+
+
+class SQLiteSessionStore:
+    """
+    Session store shared by all worker processes through one SQLite file.
+
+    Connections are opened lazily per process and thread, so the store can be
+    created in a pre-fork master and used safely by the forked workers.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the connection for the current process/thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self):
+        """Create the sessions table, then drop the master's connection before fork."""
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS sessions ('
+            'session_id TEXT PRIMARY KEY, '
+            'data TEXT NOT NULL, '
+            'updated_at REAL NOT NULL DEFAULT (julianday(\'now\')))'
+        )
+        conn.close()
+        self._local.conn = None
+
+    def __contains__(self, session_id: str) -> bool:
+        row = self._connect().execute(
+            'SELECT 1 FROM sessions WHERE session_id = ?', (session_id,)
+        ).fetchone()
+        return row is not None
+
+    def __getitem__(self, session_id: str) -> Dict[str, Any]:
+        session = self.get(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        return session
+
+    def __setitem__(self, session_id: str, session: Dict[str, Any]):
+        self._connect().execute(
+            'INSERT OR REPLACE INTO sessions (session_id, data, updated_at) '
+            'VALUES (?, ?, julianday(\'now\'))',
+            (session_id, json.dumps(session, separators=(',', ':')))
+        )
+
+    def __delitem__(self, session_id: str):
+        self._connect().execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+
+    def __len__(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+
+    def get(self, session_id: str, default: Any = None) -> Optional[Dict[str, Any]]:
+        """Get a session or default if missing."""
+        row = self._connect().execute(
+            'SELECT data FROM sessions WHERE session_id = ?', (session_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def keys(self) -> Iterator[str]:
+        """Iterate over session ids."""
+        rows = self._connect().execute('SELECT session_id FROM sessions').fetchall()
+        return iter([row[0] for row in rows])
+
+    def put_many(self, sessions: Dict[str, Dict[str, Any]]):
+        """Store several sessions in one transaction (all or none are written)."""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT OR REPLACE INTO sessions (session_id, data, updated_at) '
+                'VALUES (?, ?, julianday(\'now\'))',
+                ((session_id, json.dumps(session, separators=(',', ':'))) for session_id, session in sessions.items())
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def update(self, session_id: str, mutator: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        """
+        Apply mutator to a session inside a write transaction.
+
+        BEGIN IMMEDIATE serializes concurrent read-modify-write cycles from
+        different workers, so appended answers are never lost.
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT data FROM sessions WHERE session_id = ?', (session_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(session_id)
+            session = json.loads(row[0])
+            mutator(session)
+            conn.execute(
+                'UPDATE sessions SET data = ?, updated_at = julianday(\'now\') WHERE session_id = ?',
+                (json.dumps(session, separators=(',', ':')), session_id)
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return session
+
+    def pop_if(self, session_id: str, predicate: Callable[[Dict[str, Any]], bool]) -> Optional[Dict[str, Any]]:
+        """
+        Remove and return a session if predicate holds for it; otherwise None.
+
+        The check and the delete share one write transaction, so an update
+        from another worker cannot land between them.
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT data FROM sessions WHERE session_id = ?', (session_id,)
+            ).fetchone()
+            session = json.loads(row[0]) if row else None
+            if session is not None and predicate(session):
+                conn.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+            else:
+                session = None
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return session
+
+
+def create_session_store(url: str = None):
+    """
+    Create a session store from a URL.
+
+    Args:
+        url: "memory" (default) or "sqlite:///path/to/sessions.db"
+
+    Returns:
+        InMemorySessionStore or SQLiteSessionStore
+    """
+    if not url or url == 'memory':
+        return InMemorySessionStore()
+    if url.startswith('sqlite:///'):
+        return SQLiteSessionStore(url[len('sqlite:///'):])
+    raise ValueError(f"Unsupported session store: {url}")
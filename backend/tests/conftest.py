@@ -0,0 +1,21 @@
+import os
+import shutil
+import sys
+import tempfile
+
+# Tests import backend modules the way the app does, from the backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importing app opens the report indexes, the answer journal and the
+# recommendation cache; point them at a scratch directory, not the source tree.
+# Set before any test module imports them, since the paths are read at import.
+DATA_DIR = tempfile.mkdtemp(prefix='interview-tests-')
+os.environ['REPORT_DIR'] = os.path.join(DATA_DIR, 'reports')
+os.environ['ANSWER_JOURNAL_DIR'] = os.path.join(DATA_DIR, 'journal')
+os.environ['RECOMMENDATION_CACHE_PATH'] = os.path.join(DATA_DIR, 'recommendation_cache.json')
+os.environ['SESSION_STORE'] = 'memory'
+os.makedirs(os.environ['REPORT_DIR'])
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from reports.answer_index import AnswerIndex
+from reports.report_archive import write_report
+
+QUESTION = {'id': 'SE-E-001', 'text': 'What is a variable?'}
+ANSWER = ("A variable is a named location in memory that stores a value which the program can read "
+          "and change while it runs, and its type decides which operations are allowed on it")
+
+
+@pytest.fixture
+def bank(tmp_path):
+    path = tmp_path / 'bank.json'
+    path.write_text(json.dumps({'Software Engineer': {'Easy': [dict(
+        QUESTION, sample_answer="Variables hold data that a program manipulates through a name")]}}))
+    return str(path)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    directory = tmp_path / 'reports'
+    directory.mkdir()
+    write_report(str(directory / 'Ada_20260901_100000'), {
+        'candidate_name': 'Ada', 'answers': [{'question_id': 'SE-E-001', 'question': QUESTION['text'],
+                                              'answer': ANSWER}],
+        'scores': [{'score': 80, 'clarity': 70, 'accuracy': 90, 'completeness': 80, 'confidence': 75,
+                    'feedback': 'Good'}]
+    }, 'json')
+    return str(directory)
+
+
+@pytest.fixture
+def index(tmp_path, archive, bank):
+    index = AnswerIndex(str(tmp_path / 'answers.db'))
+    assert index.ensure_built(archive, bank) == 2
+    return index
+
+
+def test_exact_copy_is_found_with_its_score(index):
+    match = index.find(QUESTION, ANSWER.upper())
+    assert match['exact'] and match['similarity'] == 1.0
+    assert match['source'] == 'answer' and match['report_id'] == 'Ada_20260901_100000'
+    assert match['score']['score'] == 80
+
+
+def test_near_duplicate_is_found(index):
+    edited = ANSWER.replace('allowed on it', 'allowed on them')
+    match = index.find(QUESTION, edited)
+    assert match is not None and not match['exact']
+    assert 0.8 <= match['similarity'] < 1.0
+
+
+def test_unrelated_answer_and_other_question_do_not_match(index):
+    assert index.find(QUESTION, "Recursion is when a function calls itself until a base case stops it") is None
+    assert index.find({'id': 'SE-E-002', 'text': 'Other'}, ANSWER) is None
+
+
+def test_sample_answer_is_matched(index):
+    match = index.find(QUESTION, "Variables hold data that a program manipulates through a name")
+    assert match['source'] == 'sample' and match['report_id'] is None
+
+
+def test_rows_from_another_process_are_picked_up(tmp_path, index):
+    other = AnswerIndex(index.db_path)
+    assert other.add_report('Bob_20260902_100000', {
+        'answers': [{'question_id': 'SE-E-001', 'answer': 'Completely different words about scoping rules '
+                                                           'closures and the lifetime of bindings in python'}],
+        'scores': [{'score': 40}]
+    }) == 1
+    match = index.find(QUESTION, 'Completely different words about scoping rules closures and the lifetime '
+                                 'of bindings in python')
+    assert match['report_id'] == 'Bob_20260902_100000'
+
+
+def test_ensure_built_indexes_only_once(tmp_path, index, archive, bank):
+    again = AnswerIndex(index.db_path)
+    assert again.ensure_built(archive, bank) == 2
+    assert len(again) == 2
@@ -0,0 +1,109 @@
+import json
+import os
+import time
+
+from sessions.answer_journal import AnswerJournal, iter_records, replay_records
+
+DEAD_PID = 2 ** 22 + 1  # above the default pid_max, so never a running process
+
+
+def _write(path, records):
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+def _start(sid, t):
+    return {'op': 'start', 'sid': sid, 't': t, 'session': {'role': 'Software Engineer', 'questions': [{}, {}]}}
+
+
+def _answer(sid, t, index):
+    return {'op': 'answer', 'sid': sid, 't': t, 'entry': {'question_index': index}, 'score': {'score': 70},
+            'update': {'last_activity': t}}
+
+
+def _wait_for_compaction(journal, count=1):
+    deadline = time.time() + 5
+    while journal.compactions < count and time.time() < deadline:
+        time.sleep(0.01)
+    assert journal.compactions >= count
+
+
+def test_replay_restores_unfinished_sessions_in_time_order():
+    records = [_answer('a', 2, 0), _start('a', 1), _start('b', 1), _answer('b', 2, 0),
+               {'op': 'complete', 'sid': 'b', 't': 3}, _start('c', 1), {'op': 'reap', 'sid': 'c', 't': 2}]
+    live = replay_records(records)
+    assert list(live) == ['a']
+    assert live['a']['answers'] == [{'question_index': 0}]
+    assert live['a']['last_activity'] == 2
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = tmp_path / 'journal_1.log'
+    path.write_bytes(json.dumps(_start('a', 1)).encode() + b'\n' + b'{"op": "answer", "si')
+    assert [r['op'] for r in iter_records(str(path))] == ['start']
+
+
+def test_group_commit_appends_are_durable(tmp_path):
+    journal = AnswerJournal(str(tmp_path), commit_window=0)
+    journal.append('start', 'a', session={'questions': []})
+    journal.append_many([('answer', 'a', {'entry': {}, 'score': {}}), ('answer', 'a', {'entry': {}, 'score': {}})])
+    assert [r['op'] for r in iter_records(journal.path)] == ['start', 'answer', 'answer']
+    assert journal.get_stats()['pending'] == 0
+
+
+def test_compaction_drops_sessions_started_and_completed_here(tmp_path):
+    journal = AnswerJournal(str(tmp_path), commit_window=0, compact_bytes=1)
+    journal.append('start', 'a', session={'questions': []})
+    journal.append('start', 'b', session={'questions': []})
+    journal.append('complete', 'a', report_id='r1')
+    _wait_for_compaction(journal)
+    assert {r['sid'] for r in iter_records(journal.path)} == {'b'}
+
+
+def test_compaction_keeps_markers_for_sessions_started_elsewhere(tmp_path):
+    # Another worker (since exited) started the session; this one answered and completed it
+    _write(tmp_path / f'journal_{DEAD_PID}.log', [_start('s', time.time() - 10)])
+    journal = AnswerJournal(str(tmp_path), commit_window=0, compact_bytes=1)
+    journal.append('answer', 's', entry={'question_index': 0}, score={'score': 70})
+    journal.append('complete', 's', report_id='r1')
+    _wait_for_compaction(journal)
+
+    assert [r['op'] for r in iter_records(journal.path)] == ['complete']
+    assert journal.pending() == {}
+    store = {}
+    assert journal.recover(store) == 0
+    assert store == {}
+
+
+def test_recover_restores_and_consolidates_exited_journals(tmp_path):
+    now = time.time()
+    _write(tmp_path / f'journal_{DEAD_PID}.log', [_start('a', now), _answer('a', now + 1, 0), _start('b', now)])
+    _write(tmp_path / f'journal_{DEAD_PID + 1}.log', [{'op': 'complete', 'sid': 'b', 't': now + 2}])
+    store = {'a': {'answers': []}}
+
+    journal = AnswerJournal(str(tmp_path))
+    assert journal.recover(store) == 1
+    assert store['a']['answers'] == [{'question_index': 0}]
+
+    logs = sorted(name for name in os.listdir(tmp_path) if name.endswith('.log'))
+    assert len(logs) == 1 and logs[0].startswith('recovered_')
+    assert {r['sid'] for r in iter_records(str(tmp_path / logs[0]))} == {'a'}
+
+    # Recovering again restores nothing new and keeps the session
+    assert journal.recover(store) == 0
+    assert list(journal.pending()) == ['a']
+
+
+def test_recover_leaves_live_journals_alone(tmp_path):
+    now = time.time()
+    live_path = tmp_path / f'journal_{os.getppid()}.log'
+    _write(live_path, [_start('a', now), {'op': 'complete', 'sid': 'c', 't': now + 2}])
+    _write(tmp_path / f'journal_{DEAD_PID}.log', [_start('c', now)])
+    store = {}
+
+    assert AnswerJournal(str(tmp_path)).recover(store) == 1
+    assert list(store) == ['a']
+    assert live_path.exists()
+    assert not (tmp_path / f'journal_{DEAD_PID}.log').exists()
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('recovered_')]
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip('quart')
+
+ADMIN = {'X-Admin-Token': 'test-token'}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv('ADMIN_TOKEN', 'test-token')
+    from asgi import app
+    return app.test_client()
+
+
+def call(client, method, path, **kwargs):
+    async def request():
+        response = await client.open(path, method=method, **kwargs)
+        return response.status_code, await response.get_data()
+    return asyncio.run(request())
+
+
+@pytest.mark.parametrize('method, path', [
+    ('GET', '/api/reports/export'),
+    ('GET', '/api/reports/search'),
+    ('POST', '/api/reports/Ada_20260901_100000/pdf'),
+    ('POST', '/api/reports/pdf/batch'),
+    ('GET', '/api/reports/pdf/batches/batch-1'),
+    ('GET', '/api/reports/pdf/jobs/pdf-1'),
+    ('GET', '/api/reports/pdf/jobs/pdf-1/file'),
+])
+def test_report_archive_routes_exist_and_require_the_admin_token(client, monkeypatch, method, path):
+    assert call(client, method, path)[0] == 403
+    monkeypatch.delenv('ADMIN_TOKEN')
+    assert call(client, method, path, headers=ADMIN)[0] == 404
+
+
+def test_export_validates_like_the_wsgi_app(client):
+    status, body = call(client, 'GET', '/api/reports/export?format=csv&since=yesterday', headers=ADMIN)
+    assert status == 400 and b'Invalid date' in body
+    assert call(client, 'GET', '/api/reports/export?format=xml', headers=ADMIN)[0] == 400
+
+
+def test_report_html_routes(client):
+    assert call(client, 'GET', '/api/reports/No_Such_Report/html')[0] == 404
+    assert call(client, 'GET', '/api/session/no-such-session/export/html')[0] == 404
@@ -0,0 +1,40 @@
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from sessions.bulk import invite_link, parse_candidates, session_slug
+
+
+@pytest.mark.parametrize('name, slug', [
+    ('Ada Lovelace', 'Ada_Lovelace'),
+    ('Tom & Jerry', 'Tom_Jerry'),
+    ('a/b?c#d', 'a_b_c_d'),
+    ('José Müller-Øst', 'Jose_Muller_st'),
+    ('  ../..  ', 'candidate'),
+    ('李雷', 'candidate'),
+])
+def test_session_slug_is_url_and_route_safe(name, slug):
+    assert session_slug(name) == slug
+
+
+@pytest.mark.parametrize('link_base', ['https://hire.example.com/interview', 'https://hire.example.com/i?drive=fall'])
+def test_invite_link_round_trips_the_session_id(link_base):
+    session_id = 'Tom_Jerry_20261019_090000_0a1b2c3d'
+    link = invite_link(link_base, session_id)
+    query = parse_qs(urlsplit(link).query)
+    assert query['session'] == [session_id]
+    assert link.startswith(link_base)
+    if '?' in link_base:
+        assert query['drive'] == ['fall']
+
+
+def test_invite_link_encodes_reserved_characters():
+    link = invite_link('http://localhost:3000/', 'a&b#c')
+    assert link == 'http://localhost:3000/?session=a%26b%23c'
+
+
+def test_csv_candidates_with_reserved_characters_parse():
+    candidates = parse_candidates(b'name,email,role,experience,domain\n"Tom & Jerry, Jr.",t@x.io,SE,Junior,Technical\n',
+                                  'text/csv')
+    assert candidates[0]['name'] == 'Tom & Jerry, Jr.'
+    assert session_slug(candidates[0]['name']) == 'Tom_Jerry_Jr'
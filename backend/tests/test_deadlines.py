@@ -0,0 +1,140 @@
+import threading
+import time
+
+import pytest
+
+from sessions.deadlines import DeadlineScheduler
+from sessions.session_store import InMemorySessionStore, SQLiteSessionStore
+
+
+def _collecting_scheduler():
+    fired = []
+    event = threading.Event()
+
+    def handler(key):
+        fired.append((key, time.time()))
+        event.set()
+
+    return DeadlineScheduler(handler), fired, event
+
+
+def test_timer_fires_once_when_due():
+    scheduler, fired, event = _collecting_scheduler()
+    scheduler.start()
+    try:
+        due = time.time() + 0.05
+        scheduler.schedule('a', due)
+        assert event.wait(2)
+        time.sleep(0.05)
+        assert [key for key, _ in fired] == ['a']
+        assert fired[0][1] >= due
+        assert len(scheduler) == 0
+    finally:
+        scheduler.stop()
+
+
+def test_reschedule_replaces_and_cancel_drops():
+    scheduler, fired, event = _collecting_scheduler()
+    scheduler.schedule('a', time.time() + 0.05)
+    scheduler.schedule('a', time.time() + 0.15)
+    scheduler.schedule('b', time.time() + 0.05)
+    scheduler.cancel('b')
+    scheduler.start()  # timers scheduled before start fire once it runs
+    try:
+        time.sleep(0.1)
+        assert fired == []
+        assert event.wait(2)
+        time.sleep(0.05)
+        assert [key for key, _ in fired] == ['a']
+    finally:
+        scheduler.stop()
+
+
+def test_failing_handler_is_counted():
+    def handler(key):
+        raise RuntimeError("boom")
+
+    scheduler = DeadlineScheduler(handler)
+    scheduler.start()
+    try:
+        scheduler.schedule('a', time.time())
+        deadline = time.time() + 2
+        while scheduler.failed == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert scheduler.get_stats()['failed'] == 1
+    finally:
+        scheduler.stop()
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return InMemorySessionStore()
+    return SQLiteSessionStore(str(tmp_path / 'sessions.db'))
+
+
+def test_pop_if_checks_and_removes_together(store):
+    store['s'] = {'last_activity': 10}
+    assert store.pop_if('s', lambda s: s['last_activity'] < 5) is None
+    assert 's' in store
+    assert store.pop_if('s', lambda s: s['last_activity'] < 50) == {'last_activity': 10}
+    assert 's' not in store
+    assert store.pop_if('s', lambda s: True) is None
+
+
+@pytest.fixture
+def interview(monkeypatch):
+    import app
+    monkeypatch.setattr(app, 'answer_journal', None)  # keep test sessions out of the real journal
+    monkeypatch.setattr(app.config_manager, 'get_question_timeout_settings',
+                        lambda: {'enabled': True, 'grace_seconds': 0, 'abandon_after_minutes': 30})
+    session_id, session = app.create_session({
+        'name': 'Deadline Test', 'email': 'd@example.com', 'role': 'Software Engineer',
+        'experience': 'Junior', 'domain': 'Technical'
+    })
+    yield app, session_id
+    app.deadline_scheduler.cancel(('question', session_id, 0))
+    app.deadline_scheduler.cancel(('reap', session_id))
+    app.sessions.pop_if(session_id, lambda s: True)
+
+
+def _expire_now(app, session_id):
+    def expire(stored):
+        stored["deadline"]["expires_at"] = time.time() - 1
+    app.sessions.update(session_id, expire)
+
+
+def test_expiry_submits_the_draft(interview):
+    app, session_id = interview
+    app.save_draft(session_id, 0, "A partial answer about caching")
+    _expire_now(app, session_id)
+
+    assert app.expire_question(session_id, 0) is not None
+    session = app.sessions[session_id]
+    assert session["answers"][0]["answer"] == "A partial answer about caching"
+    assert session["answers"][0]["expired"]
+    assert session["deadline"]["question_index"] == 1
+
+    with pytest.raises(app.QuestionClosed):
+        app.claim_question(session_id, 0)
+
+
+def test_claim_holds_off_expiry(interview):
+    app, session_id = interview
+    app.claim_question(session_id, 0)
+    _expire_now(app, session_id)
+
+    assert app.expire_question(session_id, 0) is None
+    assert app.sessions[session_id]["answers"] == []
+
+
+def test_reap_only_drops_abandoned_sessions(interview):
+    app, session_id = interview
+    assert app.reap_session(session_id) is False
+    assert session_id in app.sessions
+
+    def abandon(stored):
+        stored["last_activity"] = time.time() - 31 * 60
+    app.sessions.update(session_id, abandon)
+    assert app.reap_session(session_id) is True
+    assert session_id not in app.sessions
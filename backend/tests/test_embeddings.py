@@ -0,0 +1,78 @@
+import json
+
+import numpy as np
+import pytest
+
+from scoring.embeddings import (
+    COVERAGE_THRESHOLD, QUESTION_BANK_PATH, HashingEmbedder, KeyPointIndex, build_matrix, calibrate_threshold, create_embedder
+)
+
+VARIABLE = {'id': 'SE-E-001'}
+CACHING = {'id': 'SE-H-001'}
+
+
+@pytest.fixture(scope='module')
+def index():
+    return KeyPointIndex(build_matrix(HashingEmbedder()), HashingEmbedder())
+
+
+def _bank_questions():
+    with open(QUESTION_BANK_PATH) as f:
+        bank = json.load(f)
+    return [q for difficulties in bank.values() for questions in difficulties.values() for q in questions]
+
+
+def covered(index, question, answer):
+    return set(index.coverage(question, answer)['covered'])
+
+
+@pytest.mark.parametrize('answer', [
+    "A variable stores data under a name so you can manipulate it",
+    "Variables are named stores of data that the program manipulates",
+    "It is storage named by the programmer, for manipulating data",
+])
+def test_inflected_key_points_are_covered(index, answer):
+    assert covered(index, VARIABLE, answer) == {'storage', 'naming', 'data manipulation'}
+
+
+def test_unrelated_answer_covers_nothing(index):
+    assert covered(index, VARIABLE, "I would ask the team and follow the sprint plan") == set()
+
+
+def test_hashing_embedder_does_not_match_synonyms(index):
+    # Lexical only: "holds" / "label" / "change values" share no stems with the key points
+    assert covered(index, VARIABLE, "It holds a value behind a label, and the value can change") == set()
+
+
+def test_threshold_is_calibrated_per_embedder_and_stored(index):
+    assert index.threshold == pytest.approx(calibrate_threshold(HashingEmbedder(), _bank_questions()))
+    assert index.threshold != COVERAGE_THRESHOLD
+
+
+def test_calibration_falls_back_without_sample_answers():
+    questions = [{'id': 'Q1', 'key_points': ['storage']}]
+    assert calibrate_threshold(HashingEmbedder(), questions) == COVERAGE_THRESHOLD
+
+
+def test_matrix_without_threshold_uses_default():
+    arrays = build_matrix(HashingEmbedder())
+    del arrays['threshold']
+    assert KeyPointIndex(arrays).threshold == COVERAGE_THRESHOLD
+
+
+def test_legacy_hashing_spec_keeps_its_stem_weight():
+    assert create_embedder('hashing:512').stem_weight == 2
+    assert create_embedder('hashing:256:4').spec == 'hashing:256:4'
+
+
+def test_semantic_embedder_matches_paraphrases():
+    pytest.importorskip('sentence_transformers')
+    embedder = create_embedder('sentence-transformers:all-MiniLM-L6-v2')
+    semantic = KeyPointIndex(build_matrix(embedder), embedder)
+    assert 'storage' in covered(semantic, VARIABLE, "It holds a value in memory behind a label")
+    assert covered(semantic, CACHING, "Explain the offside rule in football") == set()
+
+
+def test_spans_embed_to_unit_rows():
+    spans = HashingEmbedder().embed_spans("stores data under a name")
+    assert np.allclose(np.linalg.norm(spans, axis=1), 1.0, atol=1e-5)
@@ -0,0 +1,86 @@
+import gzip
+import json
+
+import pytest
+from flask import Flask, request
+
+from http_cache import CachedResponse, ResponseCache
+
+PAYLOAD = {"roles": ["Software Engineer"] * 200}
+
+
+@pytest.fixture
+def request_with():
+    app = Flask(__name__)
+
+    contexts = []
+
+    def make(**headers):
+        contexts.append(app.test_request_context(headers=headers))
+        contexts[-1].push()
+        return request
+
+    yield make
+    for context in reversed(contexts):
+        context.pop()
+
+
+def test_body_is_compact_json_with_a_stable_etag():
+    first, second = CachedResponse(PAYLOAD, 'public'), CachedResponse(dict(PAYLOAD), 'public')
+    assert json.loads(first.body) == PAYLOAD and b', ' not in first.body
+    assert first.etag == second.etag
+    assert CachedResponse({"roles": []}, 'public').etag != first.etag
+
+
+def test_small_bodies_are_not_compressed():
+    assert CachedResponse({"ok": True}, 'public').encoded == {}
+
+
+def test_gzip_is_served_when_accepted(request_with):
+    entry = CachedResponse(PAYLOAD, 'public, max-age=60')
+    response = entry.to_response(request_with(**{'Accept-Encoding': 'gzip'}))
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['ETag'] == f'"{entry.etag}-gzip"'
+    assert response.headers['Cache-Control'] == 'public, max-age=60'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert json.loads(gzip.decompress(response.get_data())) == PAYLOAD
+
+
+def test_identity_when_no_encoding_is_accepted(request_with):
+    entry = CachedResponse(PAYLOAD, 'public')
+    response = entry.to_response(request_with())
+    assert 'Content-Encoding' not in response.headers
+    assert response.headers['ETag'] == f'"{entry.etag}"' and response.get_data() == entry.body
+
+
+def test_matching_etag_gets_304_per_representation(request_with):
+    entry = CachedResponse(PAYLOAD, 'public')
+    assert entry.to_response(request_with(**{'If-None-Match': f'"{entry.etag}"'})).status_code == 304
+    # The identity ETag does not validate a gzip response
+    stale = request_with(**{'If-None-Match': f'"{entry.etag}"', 'Accept-Encoding': 'gzip'})
+    assert entry.to_response(stale).status_code == 200
+    current = request_with(**{'If-None-Match': f'"{entry.etag}-gzip"', 'Accept-Encoding': 'gzip'})
+    response = entry.to_response(current)
+    assert response.status_code == 304 and response.get_data() == b''
+
+
+def test_cache_builds_once_and_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    calls = []
+    build = lambda: calls.append(1) or PAYLOAD
+    first = cache.get_or_build('config', build, 'public')
+    assert cache.get_or_build('config', build, 'public') is first and len(calls) == 1
+    cache.put('a', {}, 'private')
+    cache.get('config')
+    cache.put('b', {}, 'private')
+    assert cache.get('a') is None and cache.get('config') is first and len(cache) == 2
+
+
+def test_discard_and_clear():
+    cache = ResponseCache()
+    cache.put(('question', 's1', 0), {}, 'private')
+    cache.put('config', {}, 'public')
+    cache.discard(('question', 's1', 0))
+    assert cache.get(('question', 's1', 0)) is None and len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,65 @@
+import pytest
+
+from llm.json_extract import JSONObjectExtractor, extract_json_object
+
+
+def feed_in_chunks(text, size, required=()):
+    extractor = JSONObjectExtractor(required)
+    for i in range(0, len(text), size):
+        if extractor.feed(text[i:i + size]) is not None:
+            return extractor, i + size
+    return extractor, None
+
+
+def test_braces_inside_strings_are_not_structure():
+    text = '{"score": 70, "feedback": "use {} for dicts and } to close"}'
+    assert extract_json_object(text, ('score',)) == {'score': 70, 'feedback': 'use {} for dicts and } to close'}
+
+
+def test_escaped_quotes_do_not_end_the_string():
+    text = r'{"score": 55, "feedback": "said \"it depends\" then {stopped}"}'
+    assert extract_json_object(text, ('score',))['feedback'] == 'said "it depends" then {stopped}'
+
+
+def test_leading_prose_and_fences_are_skipped():
+    text = 'Sure! Here is the evaluation {as requested}:\n```json\n{"score": 80, "clarity": 75}\n```\nHope it helps.'
+    assert extract_json_object(text, ('score',)) == {'score': 80, 'clarity': 75}
+
+
+def test_nested_object_is_found_when_outer_lacks_required_keys():
+    text = '{"result": {"score": 40, "feedback": "ok"}}'
+    assert extract_json_object(text, ('score',)) == {'score': 40, 'feedback': 'ok'}
+
+
+@pytest.mark.parametrize('size', [1, 3, 7])
+def test_object_is_returned_as_soon_as_it_closes(size):
+    text = 'Answer: {"score": 90, "feedback": "a \\"}\\" b"} trailing text the model keeps generating'
+    extractor, consumed = feed_in_chunks(text, size, ('score',))
+    assert extractor.result == {'score': 90, 'feedback': 'a "}" b'}
+    assert consumed < text.index('trailing') + size
+
+
+def test_truncated_output_is_salvaged():
+    extractor = JSONObjectExtractor(('score',))
+    assert extractor.feed('{"score": 65, "clarity": 60, "feedback": "Good structure but miss') is None
+    assert extractor.finish() == {'score': 65, 'clarity': 60, 'feedback': 'Good structure but miss'}
+
+
+def test_truncated_mid_key_drops_the_partial_member():
+    extractor = JSONObjectExtractor(('score',))
+    extractor.feed('{"score": 65, "clarity": 60, "feedb')
+    assert extractor.finish() == {'score': 65, 'clarity': 60}
+
+
+def test_truncated_before_required_key_gives_none():
+    extractor = JSONObjectExtractor(('score',))
+    extractor.feed('{"feedback": "The answer')
+    assert extractor.finish() is None
+
+
+def test_trailing_commas_and_smart_quotes_are_tolerated():
+    assert extract_json_object('{“score”: 70, "feedback": "fine",}', ('score',)) == {'score': 70, 'feedback': 'fine'}
+
+
+def test_no_object_gives_none():
+    assert extract_json_object('I cannot score this answer.', ('score',)) is None
@@ -0,0 +1,93 @@
+from llm_agent import InterviewAgent
+
+SCORE = '{"score": 72, "clarity": 70, "accuracy": 75, "completeness": 68, "confidence": 74, "feedback": "Solid"}'
+
+
+class FakeAgent(InterviewAgent):
+    """Agent with Ollama replaced by canned responses; records every payload sent."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.payloads = []
+        self.chunks_read = 0
+        self.stream_closed = False
+
+    def _post(self, payload):
+        self.payloads.append(payload)
+        return {'response': 'Why?', 'done': True, 'context': [9, 9]}
+
+    def _stream(self, payload):
+        self.payloads.append(payload)
+        try:
+            for token in [SCORE[:20], SCORE[20:], '\n\nLet me explain the score in detail...']:
+                self.chunks_read += 1
+                yield {'response': token, 'done': False}
+            self.chunks_read += 1
+            yield {'response': '', 'done': True, 'eval_count': 40, 'context': [1, 2, 3]}
+        finally:
+            self.stream_closed = True
+
+
+def score_then_followup(agent):
+    score = agent.score_answer("What is a cache?", "Fast storage", session_id='s1')
+    agent.generate_followup("What is a cache?", "Fast storage", session_id='s1')
+    return score, agent.payloads[-1]
+
+
+def test_early_stop_ends_live_scoring_at_the_object():
+    agent = FakeAgent(early_stop=True)
+    score, followup = score_then_followup(agent)
+    assert score['score'] == 72 and score['feedback'] == 'Solid'
+    assert agent.chunks_read == 2 and agent.stream_closed
+    assert not agent.shares_context('s1')
+    # No context arrived, so the follow-up sends the question and answer itself
+    assert 'context' not in followup and 'Candidate Answer: Fast storage' in followup['prompt']
+
+
+def test_without_early_stop_the_followup_continues_the_score_context():
+    agent = FakeAgent(early_stop=False)
+    score, followup = score_then_followup(agent)
+    assert score['score'] == 72
+    assert agent.chunks_read == 4
+    assert agent.shares_context('s1')
+    assert followup['context'] == [1, 2, 3] and 'Candidate Answer' not in followup['prompt']
+
+
+def test_early_stop_still_reads_a_cached_context():
+    agent = FakeAgent(early_stop=True)
+    agent.generate_followup("What is a cache?", "Fast storage", session_id='s1')
+    agent.score_answer("What is a cache?", "Fast storage", session_id='s1')
+    assert agent.payloads[-1]['context'] == [9, 9]
+    assert agent.chunks_read == 2
+
+
+class TruncatedAgent(FakeAgent):
+    """The model hits num_predict inside the feedback string."""
+
+    def _stream(self, payload):
+        self.payloads.append(payload)
+        yield {'response': '{"score": 64, "clarity": 70, "accuracy": 58, "completeness": 60, "confidence": 66, '
+                           '"feedback": "Covers the basics but does not', 'done': False}
+        yield {'response': '', 'done': True, 'done_reason': 'length', 'eval_count': 400}
+
+
+def test_truncated_score_is_marked_partial():
+    score = TruncatedAgent(early_stop=True).score_answer("Q", "A")
+    assert score['partial'] is True
+    assert score['accuracy'] == 58 and score['feedback'] == 'Covers the basics but does not'
+
+
+def test_missing_dimensions_are_left_out_not_invented():
+    score = InterviewAgent()._parse_score({'score': 80, 'clarity': 75}, '{"score": 80, "clarity": 75')
+    assert score == {'score': 80, 'clarity': 75, 'feedback': '', 'partial': True}
+
+
+def test_complete_score_is_not_partial():
+    score = InterviewAgent()._parse_score(
+        {'score': 72, 'clarity': 70, 'accuracy': 75, 'completeness': 68, 'confidence': 74, 'feedback': 'Solid'}, '')
+    assert 'partial' not in score and score['confidence'] == 74
+
+
+def test_unparseable_score_falls_back():
+    assert InterviewAgent()._parse_score(None, 'no json here')['score'] == 60
+    assert InterviewAgent()._parse_score({'score': 'high'}, 'bad')['score'] == 60
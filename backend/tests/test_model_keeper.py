@@ -0,0 +1,155 @@
+import time
+from datetime import datetime
+
+import pytest
+import requests
+
+from llm.model_keeper import ModelKeeper, ModelNotReady
+from llm_agent import InterviewAgent
+
+NEVER = {'days': [], 'start': '09:00', 'end': '18:00'}
+
+
+class FakeOllama:
+    """/api/ps and load requests against an in-memory set of resident models."""
+
+    def __init__(self, resident=(), failures=0):
+        self.resident = set(resident)
+        self.failures = failures
+        self.loads = []
+
+    def get(self, url, timeout=None):
+        assert url.endswith('/api/ps')
+        return FakeResponse({'models': [{'name': name, 'expires_at': '2026-10-19T18:00:00Z'} for name in self.resident]})
+
+    def post(self, url, json=None, timeout=None):
+        assert url.endswith('/api/generate') and 'prompt' not in json
+        self.loads.append(json['model'])
+        if self.failures:
+            self.failures -= 1
+            raise requests.ConnectionError('connection refused')
+        self.resident.add(json['model'] if ':' in json['model'] else f"{json['model']}:latest")
+        return FakeResponse({'done': True})
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    fake = FakeOllama()
+    monkeypatch.setattr(requests, 'get', fake.get)
+    monkeypatch.setattr(requests, 'post', fake.post)
+    return fake
+
+
+def agent():
+    return InterviewAgent(model_name='mistral', routing={'score': ['phi3:mini', 'mistral']})
+
+
+def wait_for(condition, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.01)
+
+
+def test_startup_loads_only_models_that_are_not_resident(ollama):
+    ollama.resident = {'mistral:latest'}
+    keeper = ModelKeeper(agent(), business_hours=NEVER, keep_alive='30m')
+    keeper.check(startup=True)
+    assert ollama.loads == ['phi3:mini']
+    status = keeper.get_status()
+    assert status['ready'] and status['models']['phi3:mini']['warmups'] == 1
+    assert status['models']['mistral']['warmups'] == 0 and status['models']['mistral']['resident']
+
+
+def test_resident_models_are_pinged_in_business_hours_only(ollama):
+    ollama.resident = {'mistral:latest', 'phi3:mini'}
+    keeper = ModelKeeper(agent(), ping_interval=0)
+    keeper.check()
+    assert sorted(ollama.loads) == ['mistral', 'phi3:mini']
+    assert keeper.get_status()['models']['mistral']['pings'] == 1
+
+    ollama.loads.clear()
+    keeper.business_hours = NEVER
+    keeper.check()
+    assert ollama.loads == []
+
+
+def test_expired_models_stay_unloaded_after_hours(ollama):
+    keeper = ModelKeeper(agent(), business_hours=NEVER)
+    keeper.check()
+    assert ollama.loads == [] and not keeper.get_status()['ready']
+
+
+def test_unreachable_ollama_marks_models_not_resident(monkeypatch, ollama):
+    def refuse(url, timeout=None):
+        raise requests.ConnectionError('connection refused')
+    monkeypatch.setattr(requests, 'get', refuse)
+    keeper = ModelKeeper(agent())
+    keeper.check(startup=True)
+    status = keeper.get_status()
+    assert not status['ready'] and ollama.loads == []
+    assert status['models']['mistral']['last_error'] == 'connection refused'
+
+
+def test_failed_load_is_counted(ollama):
+    ollama.failures = 1
+    keeper = ModelKeeper(agent())
+    assert not keeper.warm('mistral')
+    assert keeper.warm('mistral')
+    state = keeper.get_status()['models']['mistral']
+    assert state['failures'] == 1 and state['resident'] and state['last_error'] is None
+
+
+def test_every_model_counts_as_ready_until_started(ollama):
+    keeper = ModelKeeper(agent(), business_hours=NEVER)
+    keeper.check_ready('score')
+    assert keeper.get_status()['managed'] is False
+
+
+def test_cold_call_falls_back_and_wakes_the_keeper(ollama):
+    ollama.failures = 2  # the startup loads fail
+    keeper = ModelKeeper(agent(), check_interval=60, business_hours=NEVER)
+    keeper.start()
+    try:
+        wait_for(lambda: len(ollama.loads) == 2)
+        with pytest.raises(ModelNotReady, match='phi3:mini, mistral'):
+            keeper.check_ready('score')
+        # Demand loads the models after hours without waiting for the next poll
+        wait_for(lambda: keeper.ready('score'))
+        keeper.check_ready('score')
+        assert keeper.get_status()['deferred_calls'] == {'score': 1}
+    finally:
+        keeper.stop()
+
+
+def test_wait_policy_never_defers(ollama):
+    ollama.failures = 2
+    keeper = ModelKeeper(agent(), business_hours=NEVER, cold_start_policy='wait')
+    keeper.start()
+    try:
+        keeper.check_ready('score')
+    finally:
+        keeper.stop()
+
+
+@pytest.mark.parametrize('now, expected', [
+    (datetime(2026, 10, 19, 9, 0), True),     # Monday, opening time
+    (datetime(2026, 10, 19, 17, 59), True),
+    (datetime(2026, 10, 19, 18, 0), False),
+    (datetime(2026, 10, 18, 12, 0), False),   # Sunday
+])
+def test_business_hours(now, expected):
+    keeper = ModelKeeper(agent(), business_hours={'days': [0, 1, 2, 3, 4], 'start': '09:00', 'end': '18:00'})
+    assert keeper.in_business_hours(now) is expected
+    assert ModelKeeper(agent()).in_business_hours(now)
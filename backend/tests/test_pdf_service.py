@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from reports import pdf_service
+from reports.pdf_service import PDFRenderService, default_max_workers
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """A service whose pool is threads and whose renderer writes the report bytes (no weasyprint)."""
+    renders = []
+
+    def render_pdf(report_path, pdf_path):
+        renders.append(report_path)
+        with open(report_path, 'rb') as src, open(pdf_path, 'wb') as dst:
+            dst.write(src.read())
+        return pdf_path
+
+    monkeypatch.setattr(pdf_service, 'render_pdf', render_pdf)
+    service = PDFRenderService(cache_dir=str(tmp_path / 'cache'), max_workers=2)
+    service._pool = ThreadPoolExecutor(max_workers=2)
+    service.renders = renders
+    yield service
+    service.shutdown()
+
+
+def write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content)
+    return str(path)
+
+
+def test_submit_hashes_reports_in_the_job_not_the_caller(service, tmp_path, monkeypatch):
+    hashed_on = []
+    real_hash = pdf_service.report_hash
+    monkeypatch.setattr(pdf_service, 'report_hash', lambda path: hashed_on.append(threading.get_ident()) or real_hash(path))
+
+    job = service.submit('ada', write(tmp_path, 'ada.json', '{"a": 1}'))
+    service.wait()
+    assert job['status'] == 'done' and job['pdf_path'].endswith('.pdf')
+    assert hashed_on and threading.get_ident() not in hashed_on
+
+
+def test_identical_reports_render_once(service, tmp_path):
+    first = service.submit('ada', write(tmp_path, 'ada.json', '{"same": true}'))
+    service.wait()
+    second = service.submit('ada-copy', write(tmp_path, 'ada_copy.json', '{"same": true}'))
+    service.wait()
+    assert second['status'] == 'done' and second['pdf_path'] == first['pdf_path']
+    assert len(service.renders) == 1
+
+
+def test_batch_counts_jobs(service, tmp_path):
+    reports = [(f'r{i}', write(tmp_path, f'r{i}.json', str(i))) for i in range(3)]
+    batch = service.submit_batch(reports + [('missing', str(tmp_path / 'missing.json'))])
+    service.wait()
+    batch = service.get_batch(batch['batch_id'])
+    assert (batch['total'], batch['done'], batch['failed']) == (4, 3, 1)
+
+
+def test_pool_size_is_shared_between_serving_processes(monkeypatch):
+    monkeypatch.setattr(pdf_service.os, 'cpu_count', lambda: 8)
+    monkeypatch.setenv('WEB_CONCURRENCY', '4')
+    assert default_max_workers() == 2
+    monkeypatch.setenv('WEB_CONCURRENCY', '16')
+    assert default_max_workers() == 1
+    monkeypatch.delenv('WEB_CONCURRENCY')
+    assert default_max_workers() == 8
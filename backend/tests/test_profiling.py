@@ -0,0 +1,75 @@
+import threading
+import time
+
+from profiling import SamplingProfiler
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def slow_request(profiler, route, seconds, work):
+    profiler.request_started(route)
+    try:
+        work(seconds)
+    finally:
+        profiler.request_finished()
+
+
+def test_samples_request_stacks_and_splits_wall_from_cpu(tmp_path):
+    profiler = SamplingProfiler(interval=0.002, output_dir=str(tmp_path))
+    assert profiler.start(seconds=5)
+    threads = [threading.Thread(target=slow_request, args=(profiler, 'POST /answer', 0.15, busy)),
+               threading.Thread(target=slow_request, args=(profiler, 'GET /report', 0.15, time.sleep))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    profiler.stop()
+
+    stats = profiler.get_stats()
+    assert not stats['running'] and stats['samples'] > 0
+    assert stats['routes']['POST /answer']['cpu_share'] > 0.5
+    assert stats['routes']['GET /report']['cpu_share'] < 0.5
+    lines = profiler.collapsed().splitlines()
+    assert any(line.startswith('POST /answer;') and 'test_profiling.py:busy' in line for line in lines)
+    assert sum(int(line.rsplit(' ', 1)[1]) for line in lines) <= stats['samples'] * 2
+
+
+def test_reads_during_a_run_are_consistent(tmp_path):
+    profiler = SamplingProfiler(interval=0.001, output_dir=str(tmp_path))
+    profiler.start(seconds=5)
+    stop = threading.Event()
+
+    def requests():
+        while not stop.is_set():
+            slow_request(profiler, 'GET /x', 0.002, busy)
+
+    worker = threading.Thread(target=requests)
+    worker.start()
+    try:
+        for _ in range(200):
+            profiler.collapsed()
+            profiler.get_stats()
+    finally:
+        stop.set()
+        worker.join()
+        profiler.stop()
+    assert profiler.get_stats()['routes']['GET /x']['requests'] > 0
+
+
+def test_nothing_is_recorded_while_stopped(tmp_path):
+    profiler = SamplingProfiler(output_dir=str(tmp_path))
+    slow_request(profiler, 'GET /idle', 0.01, time.sleep)
+    assert profiler.get_stats()['routes'] == {} and profiler.collapsed() == ''
+
+
+def test_only_one_run_at_a_time_and_dump_writes_the_stacks(tmp_path):
+    profiler = SamplingProfiler(interval=0.002, output_dir=str(tmp_path))
+    assert profiler.start(seconds=5, dump=True)
+    assert not profiler.start(seconds=5)
+    slow_request(profiler, 'GET /dump', 0.05, busy)
+    profiler.stop()
+    assert profiler.last_dump and open(profiler.last_dump).read() == profiler.collapsed()
@@ -0,0 +1,83 @@
+from llm.prompt_context import PromptContextCache
+from llm_agent import InterviewAgent
+
+
+class EchoContextAgent(InterviewAgent):
+    """Agent whose Ollama stand-in returns a fresh context per call and records the payloads."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.payloads = []
+
+    def _post(self, payload):
+        self.payloads.append(payload)
+        return {'response': 'Why?', 'done': True, 'context': [len(self.payloads)] * 3}
+
+
+def test_turn_context_is_also_the_session_latest():
+    cache = PromptContextCache()
+    cache.put('s1', 'q\x00a', [1, 2, 3])
+    assert cache.get('s1', 'q\x00a') == [1, 2, 3]
+    assert cache.get('s1') == [1, 2, 3]
+    assert cache.get('s1', 'q\x00other') is None and cache.get('s2') is None
+
+
+def test_empty_context_is_not_stored():
+    cache = PromptContextCache()
+    cache.put('s1', 't', [])
+    cache.put('s1', 't', None)
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = PromptContextCache(max_entries=4)
+    cache.put('s1', 't', [1])
+    cache.put('s2', 't', [2])
+    cache.get('s1', 't')
+    cache.put('s3', 't', [3])
+    assert len(cache) == 4
+    assert cache.get('s1', 't') == [1] and cache.get('s3') == [3]
+    assert cache.get('s2', 't') is None
+
+
+def test_forget_drops_only_that_session():
+    cache = PromptContextCache()
+    cache.put('s1', 't1', [1])
+    cache.put('s1', 't2', [2])
+    cache.put('s10', 't1', [10])
+    cache.forget('s1')
+    assert cache.get('s1') is None and cache.get('s1', 't1') is None
+    assert cache.get('s10', 't1') == [10]
+
+
+def test_followup_for_the_same_answer_sends_only_the_task():
+    agent = EchoContextAgent(model_name='mistral')
+    agent.generate_followup("What is a cache?", "Fast storage", session_id='s1')
+    assert 'context' not in agent.payloads[0]
+    agent.generate_followup("What is a cache?", "Fast storage", session_id='s1')
+    assert agent.payloads[1]['context'] == [1, 1, 1]
+    assert 'Candidate Answer' not in agent.payloads[1]['prompt']
+
+
+def test_a_different_answer_or_session_is_encoded_in_full():
+    agent = EchoContextAgent(model_name='mistral')
+    agent.generate_followup("What is a cache?", "Fast storage", session_id='s1')
+    agent.generate_followup("What is a cache?", "Slow storage", session_id='s1')
+    agent.generate_followup("What is a cache?", "Fast storage", session_id='s2')
+    agent.generate_followup("What is a cache?", "Fast storage")
+    assert all('context' not in payload for payload in agent.payloads)
+
+
+def test_forget_session_releases_the_context():
+    agent = EchoContextAgent(model_name='mistral')
+    agent.generate_followup("What is a cache?", "Fast storage", session_id='s1')
+    agent.forget_session('s1')
+    agent.generate_followup("What is a cache?", "Fast storage", session_id='s1')
+    assert 'context' not in agent.payloads[1]
+
+
+def test_reuse_can_be_turned_off():
+    agent = EchoContextAgent(model_name='mistral', reuse_context=False)
+    agent.generate_followup("What is a cache?", "Fast storage", session_id='s1')
+    agent.generate_followup("What is a cache?", "Fast storage", session_id='s1')
+    assert 'context' not in agent.payloads[1] and not agent.shares_context('s1')
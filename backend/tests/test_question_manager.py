@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from questions.question_manager import QuestionManager
+
+BANK = {
+    "Software Engineer": {
+        "Easy": [{"id": f"E{i}", "text": f"Easy {i}", "domain": "Technical", "key_points": ["k"],
+                  "sample_answer": "s"} for i in range(3)],
+        "Hard": [{"id": "H0", "text": "Hard", "domain": "Technical"},
+                 {"id": "H1", "text": "Hard behavioral", "domain": "Behavioral"}]
+    }
+}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    path = tmp_path / 'bank.json'
+    path.write_text(json.dumps(BANK))
+    return QuestionManager(str(path))
+
+
+def test_questions_come_from_the_bank_by_experience(manager):
+    questions = manager.get_questions('Software Engineer', 'Technical', 'Senior', count=3)
+    assert [q['id'] for q in questions[:2]] == ['H0', 'H1']
+    assert questions[2]['difficulty'] == 'Easy'
+    assert questions[2]['key_points'] == ['k'] and questions[2]['sample_answer'] == 's'
+
+
+def test_missing_difficulty_starts_from_the_nearest(manager):
+    # Lead maps to Expert, which this bank lacks
+    assert manager.get_questions('Software Engineer', 'Technical', 'Lead', count=1)[0]['id'] == 'H0'
+
+
+def test_unknown_role_gets_no_questions(manager):
+    assert manager.get_questions('Chef', 'Technical', 'Junior') == []
+    assert manager.question_sets([('Chef', 'Technical', 'Junior')]) == [[]]
+
+
+def test_question_sets_vary_within_a_tier(manager):
+    sets = manager.question_sets([('Software Engineer', 'Technical', 'Junior')] * 200, count=3)
+    assert all(sorted(q['id'] for q in s) == ['E0', 'E1', 'E2'] for s in sets)
+    assert len({tuple(q['id'] for q in s) for s in sets}) > 1
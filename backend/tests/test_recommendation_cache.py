@@ -0,0 +1,86 @@
+import json
+
+from llm.recommendation_cache import RecommendationCache, warm
+
+
+def score(clarity, accuracy, completeness, confidence):
+    return {'clarity': clarity, 'accuracy': accuracy, 'completeness': completeness, 'confidence': confidence}
+
+
+class ProfileAgent:
+    """Stands in for InterviewAgent.generate_profile_recommendations; fails for one domain."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_profile_recommendations(self, profile):
+        self.calls += 1
+        if profile['domain'] == 'Broken':
+            raise ValueError("Unparseable recommendations")
+        weakest = min(profile['dimensions'], key=lambda dimension: profile['dimensions'][dimension])
+        return {'recommendations': [f"Work on {weakest}", "Practice more", "Build projects"]}
+
+
+def test_profile_buckets_dimension_averages(tmp_path):
+    cache = RecommendationCache(str(tmp_path / 'cache.json'))
+    key, profile = cache.profile([score(40, 80, 70, 75), score(50, 70, 20, 75)], 'SE', 'Technical')
+    assert key == 'SE|Technical|0.2.0.2'
+    assert profile == {'role': 'SE', 'domain': 'Technical',
+                       'dimensions': {'clarity': '0-50', 'accuracy': '75-100', 'completeness': '0-50',
+                                      'confidence': '75-100'}}
+    # Same buckets, same key
+    assert cache.profile([score(45, 99, 10, 80)], 'SE', 'Technical')[0] == key
+
+
+def test_missing_dimensions_do_not_count_as_zero(tmp_path):
+    cache = RecommendationCache(str(tmp_path / 'cache.json'))
+    partial = {'clarity': 80, 'accuracy': 80, 'partial': True}
+    key, _ = cache.profile([score(80, 80, 80, 80), partial], 'SE', 'Technical')
+    assert key == 'SE|Technical|2.2.2.2'
+
+
+def test_every_profile_is_enumerated(tmp_path):
+    cache = RecommendationCache(str(tmp_path / 'cache.json'), bucket_edges=[75, 50])
+    keys = [key for key, _ in cache.all_profiles(['SE', 'DS'], ['Technical'])]
+    assert len(keys) == len(set(keys)) == 2 * 3 ** 4
+    assert cache.profile([score(50, 50, 50, 50)], 'DS', 'Technical')[0] in keys
+
+
+def test_lookups_are_counted(tmp_path):
+    cache = RecommendationCache(str(tmp_path / 'cache.json'))
+    assert cache.get('SE|Technical|0.0.0.0') is None
+    cache.put('SE|Technical|0.0.0.0', ['a', 'b', 'c'])
+    assert cache.get('SE|Technical|0.0.0.0') == ['a', 'b', 'c']
+    assert cache.get_stats() == {'entries': 1, 'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+
+def test_saved_file_is_reloaded_only_with_the_same_edges(tmp_path):
+    path = str(tmp_path / 'cache.json')
+    cache = RecommendationCache(path)
+    cache.put('SE|Technical|1.1.1.1', ['a', 'b', 'c'])
+    cache.save()
+    assert RecommendationCache(path).get('SE|Technical|1.1.1.1') == ['a', 'b', 'c']
+    assert len(RecommendationCache(path, bucket_edges=[40, 60, 80])) == 0
+
+
+def test_unreadable_file_keeps_the_current_entries(tmp_path):
+    path = tmp_path / 'cache.json'
+    cache = RecommendationCache(str(path))
+    cache.put('k', ['a', 'b', 'c'])
+    path.write_text('{"bucket_edges": [50, 75], "entr')
+    assert not cache.reload() and cache.get('k') == ['a', 'b', 'c']
+
+
+def test_warm_generates_missing_profiles_and_resumes(tmp_path):
+    path = str(tmp_path / 'cache.json')
+    cache = RecommendationCache(path, bucket_edges=[50])
+    agent = ProfileAgent()
+    result = warm(cache, agent, ['SE'], ['Technical', 'Broken'], workers=2, save_every=5)
+    assert result == {'generated': 16, 'failed': 16, 'cached': 16}
+    assert cache.get('SE|Technical|1.0.1.1') == ['Work on accuracy', 'Practice more', 'Build projects']
+    assert len(json.load(open(path))['entries']) == 16
+
+    # A second run only retries what is missing
+    agent.calls = 0
+    warm(RecommendationCache(path, bucket_edges=[50]), agent, ['SE'], ['Technical', 'Broken'])
+    assert agent.calls == 16
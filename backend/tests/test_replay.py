@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from llm.replay import ReplayMiss, TrafficRecorder, TrafficReplayer, iter_log, log_seed, transport_from_env
+from llm_agent import InterviewAgent
+from questions.question_manager import QuestionManager
+
+
+class OllamaStub(InterviewAgent):
+    """Stands in for a live model: answers depend on the prompt, so a wrong replay shows."""
+
+    def _post(self, payload):
+        return {'response': f"Why? ({len(payload['prompt'])})", 'done': True, 'context': [7]}
+
+    def _stream(self, payload):
+        score = len(payload['prompt']) % 100
+        yield {'response': f'{{"score": {score}, "feedback": "ok"}}', 'done': False}
+        yield {'response': '', 'done': True, 'eval_count': 12, 'context': [1, 2]}
+
+
+def interview(agent, manager, answers=3):
+    """A short interview as app.py runs it: draw a question set, score and follow up each answer."""
+    questions = manager.get_questions('Software Engineer', 'Technical', 'Mid-level', count=answers)
+    results = []
+    for question in questions:
+        answer = f"My answer to {question['id']}"
+        results.append((question['id'],
+                        agent.score_answer(question['text'], answer, question.get('keywords'), session_id='s1'),
+                        agent.generate_followup(question['text'], answer, question.get('context', ''),
+                                                session_id='s1')))
+    return results
+
+
+@pytest.fixture
+def env(monkeypatch):
+    for name in ('LLM_RECORD', 'LLM_REPLAY', 'LLM_REPLAY_SPEED', 'LLM_SEED'):
+        monkeypatch.delenv(name, raising=False)
+    return monkeypatch
+
+
+def test_record_then_replay_round_trip(env, tmp_path):
+    log = str(tmp_path / 'traffic.ndjson')
+    manager = QuestionManager()
+
+    env.setenv('LLM_RECORD', log)
+    recorded_agent = OllamaStub()
+    recorder = transport_from_env(recorded_agent)
+    recorded = interview(recorded_agent, manager)
+    recorder.close()
+
+    env.delenv('LLM_RECORD')
+    env.setenv('LLM_REPLAY', log)
+    env.setenv('LLM_REPLAY_SPEED', '0')
+    random.seed('something else entirely')
+    replayed_agent = InterviewAgent()
+    replayer = transport_from_env(replayed_agent)
+    replayed = interview(replayed_agent, manager)
+
+    assert replayed == recorded
+    assert replayer.seed == recorder.seed == log_seed(log)
+    assert replayer.get_stats()['misses'] == 0
+    assert replayer.get_stats()['served'] == len(list(iter_log(log))) == 6
+
+
+def test_llm_seed_fixes_the_question_sets(env, tmp_path):
+    env.setenv('LLM_RECORD', str(tmp_path / 'traffic.ndjson'))
+    env.setenv('LLM_SEED', '1234')
+    manager = QuestionManager()
+    draws = []
+    for _ in range(2):
+        transport_from_env(OllamaStub()).close()
+        draws.append([q['id'] for q in manager.get_questions('Software Engineer', 'Technical', 'Mid-level')])
+    assert draws[0] == draws[1]
+
+
+def test_unrecorded_request_misses(tmp_path):
+    log = str(tmp_path / 'traffic.ndjson')
+    agent = OllamaStub()
+    recorder = TrafficRecorder(log, seed=1).install(agent)
+    followup = agent.generate_followup("Q", "A")
+    recorder.close()
+
+    replayed = InterviewAgent()
+    replayer = TrafficReplayer([log], speed=0).install(replayed)
+    assert replayed.generate_followup("Q", "A") == followup
+    with pytest.raises(ReplayMiss):
+        replayed.generate_followup("Q", "a different answer")
+    assert replayer.get_stats()['misses'] == 1
@@ -0,0 +1,138 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from reports.report_archive import export_csv, export_ndjson, iter_reports, parse_date, write_report
+
+
+def _report(name, timestamp, score=70):
+    return {
+        'candidate_name': name,
+        'candidate_email': f"{name.lower()}@example.com",
+        'role': 'Software Engineer',
+        'experience': 'Junior',
+        'domain': 'Technical',
+        'timestamp': timestamp,
+        'overall_score': score,
+        'answers': [{'answer': 'x'}],
+        'recommendations': ['Practice more']
+    }
+
+
+@pytest.fixture
+def report_dir(tmp_path):
+    write_report(str(tmp_path / 'Ada_20260901_100000'), _report('Ada', '2026-09-01T10:00:00'), 'json')
+    write_report(str(tmp_path / 'Bob_20260915_100000'), _report('Bob', '2026-09-15T10:00:00+00:00', 40), 'json.gz')
+    return str(tmp_path)
+
+
+def test_parse_date_rejects_invalid_values():
+    with pytest.raises(ValueError):
+        parse_date('last tuesday')
+    with pytest.raises(ValueError):
+        parse_date(20260901)
+
+
+def test_parse_date_makes_aware_dates_naive():
+    parsed = parse_date('2026-09-01T10:00:00+00:00')
+    assert parsed.tzinfo is None
+    assert parsed == datetime(2026, 9, 1, 10, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+
+def test_parse_date_bare_upper_bound_covers_the_day():
+    assert parse_date('2026-09-01', end_of_day=True).date().isoformat() == '2026-09-01'
+    assert parse_date('2026-09-01', end_of_day=True).hour == 23
+
+
+def test_iter_reports_mixes_naive_and_aware_dates(report_dir):
+    names = [s['candidate_name'] for s, _ in iter_reports(report_dir, since='2026-09-10T00:00:00+00:00')]
+    assert names == ['Bob']
+    names = [s['candidate_name'] for s, _ in iter_reports(report_dir, until='2026-09-10')]
+    assert names == ['Ada']
+
+
+def test_iter_reports_invalid_date_raises_before_yielding(report_dir):
+    rows = iter_reports(report_dir, since='not-a-date')
+    with pytest.raises(ValueError):
+        next(rows)
+
+
+def test_export_csv_rows(report_dir):
+    text = ''.join(export_csv(iter_reports(report_dir, min_score=50)))
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert [row['candidate_name'] for row in rows] == ['Ada']
+    assert rows[0]['recommendations'] == 'Practice more'
+
+
+def test_export_ndjson_full(report_dir):
+    lines = list(export_ndjson(iter_reports(report_dir), full=True))
+    records = sorted((json.loads(line) for line in lines), key=lambda r: r['candidate_name'])
+    assert [r['report_id'] for r in records] == ['Ada_20260901_100000', 'Bob_20260915_100000']
+    assert records[0]['answers'] == [{'answer': 'x'}]
+
+
+ADMIN = {'X-Admin-Token': 'test-token'}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv('ADMIN_TOKEN', 'test-token')
+    from app import app
+    return app.test_client()
+
+
+@pytest.mark.parametrize('method, path', [
+    ('GET', '/api/reports/export'),
+    ('GET', '/api/reports/search'),
+    ('POST', '/api/reports/Ada_20260901_100000/pdf'),
+    ('POST', '/api/reports/pdf/batch'),
+    ('GET', '/api/reports/pdf/batches/batch-1'),
+    ('GET', '/api/reports/pdf/jobs/pdf-1'),
+    ('GET', '/api/reports/pdf/jobs/pdf-1/file'),
+])
+def test_archive_routes_require_the_admin_token(client, monkeypatch, method, path):
+    assert client.open(path, method=method).status_code == 403
+    assert client.open(path, method=method, headers={'X-Admin-Token': 'wrong'}).status_code == 403
+    monkeypatch.delenv('ADMIN_TOKEN')
+    assert client.open(path, method=method, headers=ADMIN).status_code == 404
+
+
+@pytest.mark.parametrize('export_format', ['csv', 'ndjson'])
+def test_export_route_rejects_bad_dates(client, export_format):
+    response = client.get(f'/api/reports/export?format={export_format}&since=yesterday', headers=ADMIN)
+    assert response.status_code == 400
+    assert 'Invalid date' in response.get_json()['error']
+
+    response = client.get(f'/api/reports/export?format={export_format}&until=2026-13-01', headers=ADMIN)
+    assert response.status_code == 400
+
+
+def test_export_route_rejects_unknown_format(client):
+    assert client.get('/api/reports/export?format=xml', headers=ADMIN).status_code == 400
+
+
+def test_report_index_is_built_once(tmp_path, report_dir):
+    from reports.report_index import ReportIndex
+    index = ReportIndex(str(tmp_path / 'index.db'))
+    assert index.ensure_built(report_dir) == 2
+    assert ReportIndex(index.db_path).ensure_built(report_dir) == 0
+    assert len(index) == 2
+
+
+def test_search_pages_past_reports_without_a_timestamp(tmp_path):
+    from reports.report_index import ReportIndex
+    index = ReportIndex(str(tmp_path / 'index.db'))
+    for i in range(5):
+        index.add({'report_id': f'r{i}', 'timestamp': f'2026-09-0{i + 1}T10:00:00' if i % 2 else None})
+
+    seen, cursor = [], None
+    for _ in range(10):
+        page = index.search(limit=2, cursor=cursor)
+        seen.extend(row['report_id'] for row in page['results'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert seen == ['r3', 'r1', 'r4', 'r2', 'r0']
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from llm.scheduler import LLMScheduler, Priority, SchedulerOverloaded
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def queued(scheduler, priority):
+    return scheduler.get_metrics()['classes'][priority.name.lower()]['queued']
+
+
+def test_waiters_are_served_by_priority_then_arrival():
+    scheduler = LLMScheduler(max_concurrency=1)
+    scheduler.acquire(Priority.LIVE_SCORING)
+    order = []
+
+    def call(priority, name):
+        scheduler.run(priority, order.append, name)
+
+    arrivals = [(Priority.RECOMMENDATIONS, 'rec'), (Priority.FOLLOWUP, 'followup-1'),
+                (Priority.LIVE_SCORING, 'score'), (Priority.FOLLOWUP, 'followup-2')]
+    threads = []
+    for priority, name in arrivals:
+        thread = threading.Thread(target=call, args=(priority, name))
+        thread.start()
+        threads.append(thread)
+        wait_until(lambda: queued(scheduler, priority) >= 1 + (name == 'followup-2'))
+
+    scheduler.release(Priority.LIVE_SCORING)
+    for thread in threads:
+        thread.join(2)
+    assert order == ['score', 'followup-1', 'followup-2', 'rec']
+    assert scheduler.get_metrics()['in_flight'] == 0
+
+
+def test_full_class_queue_is_shed_without_affecting_others():
+    scheduler = LLMScheduler(max_concurrency=1, queue_limits={'recommendations': 1})
+    scheduler.acquire(Priority.LIVE_SCORING)
+    waiter = threading.Thread(target=scheduler.run, args=(Priority.RECOMMENDATIONS, lambda: None))
+    waiter.start()
+    wait_until(lambda: queued(scheduler, Priority.RECOMMENDATIONS) == 1)
+
+    with pytest.raises(SchedulerOverloaded):
+        scheduler.acquire(Priority.RECOMMENDATIONS)
+    scoring = threading.Thread(target=scheduler.run, args=(Priority.LIVE_SCORING, lambda: None))
+    scoring.start()
+    wait_until(lambda: queued(scheduler, Priority.LIVE_SCORING) == 1)
+
+    scheduler.release(Priority.LIVE_SCORING)
+    waiter.join(2)
+    scoring.join(2)
+    metrics = scheduler.get_metrics()['classes']
+    assert metrics['recommendations']['shed'] == 1 and metrics['recommendations']['completed'] == 1
+    assert metrics['live_scoring']['shed'] == 0
+
+
+def test_waiting_past_max_wait_is_shed():
+    scheduler = LLMScheduler(max_concurrency=1, max_wait_seconds={'followup': 0.05})
+    scheduler.acquire(Priority.LIVE_SCORING)
+    with pytest.raises(SchedulerOverloaded):
+        scheduler.run(Priority.FOLLOWUP, lambda: None)
+    assert queued(scheduler, Priority.FOLLOWUP) == 0
+    scheduler.release(Priority.LIVE_SCORING)
+    assert scheduler.run(Priority.FOLLOWUP, lambda: 'ran') == 'ran'
+
+
+def test_async_callers_share_the_slots_and_give_them_back_on_cancel():
+    scheduler = LLMScheduler(max_concurrency=1)
+
+    async def scenario():
+        scheduler.acquire(Priority.LIVE_SCORING)
+        waiter = asyncio.ensure_future(scheduler.run_async(Priority.FOLLOWUP, asyncio.sleep, 0, 'followup'))
+        cancelled = asyncio.ensure_future(scheduler.run_async(Priority.RECOMMENDATIONS, asyncio.sleep, 0))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        await asyncio.sleep(0.01)
+        scheduler.release(Priority.LIVE_SCORING)
+        return await waiter
+
+    assert asyncio.run(scenario()) == 'followup'
+    metrics = scheduler.get_metrics()
+    assert metrics['in_flight'] == 0 and metrics['classes']['recommendations']['queued'] == 0
+
+
+def test_retired_classes_in_settings_are_ignored():
+    scheduler = LLMScheduler.from_settings({'queue_limits': {'batch_rescoring': 4, 'followup': 3}})
+    assert scheduler.queue_limits[Priority.FOLLOWUP] == 3
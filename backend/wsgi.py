@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Production entry point for pre-forking servers.
+
+Run from the backend directory:
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The config, question bank and engines are loaded once in the master process
+(gunicorn's preload_app), then gc.freeze() moves them into the permanent
+generation so the collector never writes to their object headers. Forked
+workers keep sharing those pages copy-on-write instead of each holding a
+private copy. Session state lives in a SQLite file shared by all workers.
+"""
+import gc
+import os
+
+os.environ.setdefault(
+    'SESSION_STORE',
+    'sqlite:///' + os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sessions', 'sessions.db')
+)
+
+# Avoid collections while the shared data is being built; the frozen objects
+# are then exempt from every later collection in the workers.
+gc.disable()
+
+from app import app  # noqa: E402
+
+gc.freeze()
+gc.enable()
@@ -1,12 +1,23 @@
 const API_BASE = 'http://localhost:5000/api';
+// Interview channel of the ASGI server; the Flask server has none and the HTTP endpoints are used instead
+const WS_URL = API_BASE.replace(/^http/, 'ws').replace(/\/api$/, '/ws/interview');
 
 let currentSession = null;
 let currentQuestionIndex = 0;
 let pendingFollowup = false;
+let questionSet = null;  // whole question set, prefetched at session start
+let channel = null;      // open interview WebSocket, if the server has one
+let channelPending = null;
+let deadlineAt = null;   // when the open question times out (ms, local clock)
+let timerInterval = null;
+let draftTimer = null;
 
 document.addEventListener('DOMContentLoaded', async () => {
     await loadConfig();
     setupEventListeners();
+    // Links from bulk session creation carry the session id
+    const invitedSession = new URLSearchParams(location.search).get('session');
+    if (invitedSession) beginInvitedInterview(invitedSession);
 });
 
 async function loadConfig() {
@@ -45,12 +56,62 @@ function setupEventListeners() {
     const answerTextarea = document.getElementById('answer-textarea');
     
     if (setupForm) setupForm.addEventListener('submit', startInterview);
-    if (submitBtn) submitBtn.addEventListener('click', submitAnswer);
+    if (submitBtn) submitBtn.addEventListener('click', () => submitAnswer());
     if (skipBtn) skipBtn.addEventListener('click', skipQuestion);
     if (restartBtn) restartBtn.addEventListener('click', restartInterview);
     if (exportJsonBtn) exportJsonBtn.addEventListener('click', () => exportReport('json'));
     if (exportHtmlBtn) exportHtmlBtn.addEventListener('click', () => exportReport('html'));
     if (answerTextarea) answerTextarea.addEventListener('input', updateCharCount);
+    if (answerTextarea) answerTextarea.addEventListener('input', scheduleDraftSave);
+}
+
+// Server-side deadline of the open question; seconds_left avoids trusting the local clock
+function setDeadline(deadline) {
+    clearInterval(timerInterval);
+    const timer = document.getElementById('question-timer');
+    if (!deadline) {
+        deadlineAt = null;
+        timer.textContent = '';
+        return;
+    }
+    deadlineAt = Date.now() + deadline.seconds_left * 1000;
+    tickTimer();
+    timerInterval = setInterval(tickTimer, 1000);
+}
+
+function tickTimer() {
+    const left = Math.max(0, Math.ceil((deadlineAt - Date.now()) / 1000));
+    const timer = document.getElementById('question-timer');
+    timer.textContent = `⏱️ ${Math.floor(left / 60)}:${String(left % 60).padStart(2, '0')}`;
+    timer.classList.toggle('urgent', left <= 30);
+    if (left === 0) {
+        clearInterval(timerInterval);
+        // Send whatever is typed; the server submits the last saved draft if this arrives too late
+        submitAnswer(true);
+    }
+}
+
+// Autosave the answer being typed, so a timeout submits it rather than nothing
+function scheduleDraftSave() {
+    clearTimeout(draftTimer);
+    if (!currentSession || pendingFollowup) return;
+    const questionIndex = currentQuestionIndex;
+    draftTimer = setTimeout(async () => {
+        try {
+            const response = await fetch(`${API_BASE}/session/${currentSession}/draft`, {
+                method: 'PUT',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    question_index: questionIndex,
+                    answer: document.getElementById('answer-textarea').value
+                })
+            });
+            const data = await response.json();
+            if (data.saved && data.deadline) setDeadline(data.deadline);
+        } catch (error) {
+            console.error('Error saving draft:', error);
+        }
+    }, 2000);
 }
 
 function updateCharCount() {
@@ -59,6 +120,57 @@ function updateCharCount() {
     charCount.textContent = textarea.value.length;
 }
 
+function openChannel() {
+    return new Promise(resolve => {
+        let socket;
+        try {
+            socket = new WebSocket(WS_URL);
+        } catch (error) {
+            resolve(null);
+            return;
+        }
+        const timer = setTimeout(() => { socket.close(); resolve(null); }, 2000);
+        socket.onopen = () => { clearTimeout(timer); resolve(socket); };
+        socket.onerror = () => { clearTimeout(timer); resolve(null); };
+        socket.onmessage = (message) => handleChannelEvent(JSON.parse(message.data));
+        socket.onclose = () => {
+            if (channel === socket) channel = null;
+            if (channelPending) {
+                channelPending.reject(new Error('Interview channel closed'));
+                channelPending = null;
+            }
+        };
+    });
+}
+
+function handleChannelEvent(event) {
+    if (!channelPending) return;
+    const pending = channelPending;
+    if (event.type === 'error') {
+        channelPending = null;
+        pending.reject(new Error(event.error));
+    } else if (event.type === pending.doneType) {
+        channelPending = null;
+        pending.resolve(event);
+    } else if (pending.onEvent) {
+        pending.onEvent(event);
+    }
+}
+
+// Send one request over the channel; resolves with the event of doneType, other events go to onEvent
+function channelRequest(message, doneType, onEvent) {
+    return new Promise((resolve, reject) => {
+        channelPending = { resolve, reject, doneType, onEvent };
+        channel.send(JSON.stringify(message));
+    });
+}
+
+function showScore(score) {
+    const scoreDisplay = document.getElementById('score-display');
+    scoreDisplay.textContent = `✅ Score: ${Math.round(score.score)}/100 - ${score.feedback}`;
+    scoreDisplay.style.display = 'block';
+}
+
 async function startInterview(e) {
     e.preventDefault();
     
@@ -76,13 +188,20 @@ async function startInterview(e) {
     showLoadingScreen(true);
     
     try {
-        const response = await fetch(`${API_BASE}/session/start`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ name, email, role, experience, domain })
-        });
+        const candidate = { name, email, role, experience, domain, include_questions: true };
+        channel = await openChannel();
         
-        const data = await response.json();
+        let data;
+        if (channel) {
+            data = await channelRequest({ type: 'start', ...candidate }, 'session');
+        } else {
+            const response = await fetch(`${API_BASE}/session/start`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(candidate)
+            });
+            data = await response.json();
+        }
         
         if (data.error) {
             alert(`Error: ${data.error}`);
@@ -91,6 +210,8 @@ async function startInterview(e) {
         
         currentSession = data.session_id;
         currentQuestionIndex = 0;
+        questionSet = data.questions || null;
+        setDeadline(data.deadline);
         
         document.getElementById('total-questions').textContent = data.total_questions;
         
@@ -104,7 +225,48 @@ async function startInterview(e) {
     }
 }
 
+async function beginInvitedInterview(sessionId) {
+    showLoadingScreen(true);
+    
+    try {
+        const response = await fetch(`${API_BASE}/session/${encodeURIComponent(sessionId)}/begin`, { method: 'POST' });
+        const data = await response.json();
+        
+        if (data.error) {
+            alert(`Error: ${data.error}`);
+            return;
+        }
+        
+        channel = await openChannel();
+        if (channel) await channelRequest({ type: 'resume', session_id: data.session_id }, 'session');
+        
+        currentSession = data.session_id;
+        questionSet = data.questions || null;
+        setDeadline(data.deadline);
+        
+        document.getElementById('total-questions').textContent = data.total_questions;
+        
+        switchScreen('interview-screen');
+        loadQuestion(data.answered || 0);
+    } catch (error) {
+        console.error('Error opening interview:', error);
+        alert('Failed to open interview');
+    } finally {
+        showLoadingScreen(false);
+    }
+}
+
 async function loadQuestion(index) {
+    // Prefetched questions render locally, without a round trip
+    if (questionSet) {
+        if (index >= questionSet.length) {
+            completeInterview();
+            return;
+        }
+        renderQuestion(questionSet[index], index);
+        return;
+    }
+    
     showLoadingScreen(true);
     
     try {
@@ -116,27 +278,7 @@ async function loadQuestion(index) {
             return;
         }
         
-        document.getElementById('question-text').textContent = question.text;
-        document.getElementById('difficulty-badge').textContent = question.difficulty || 'Medium';
-        document.getElementById('difficulty-badge').className = `difficulty-badge ${(question.difficulty || 'medium').toLowerCase()}`;
-        document.getElementById('question-number').textContent = index + 1;
-        
-        if (question.context) {
-            document.getElementById('question-context').innerHTML = `<p><strong>Context:</strong> ${question.context}</p>`;
-        } else {
-            document.getElementById('question-context').innerHTML = '';
-        }
-        
-        document.getElementById('answer-textarea').value = '';
-        document.getElementById('followup-textarea').value = '';
-        document.getElementById('follow-up-question').textContent = '';
-        document.getElementById('follow-up-section').style.display = 'none';
-        document.getElementById('score-display').style.display = 'none';
-        document.getElementById('submit-btn').textContent = 'Submit Answer';
-        
-        currentQuestionIndex = index;
-        pendingFollowup = false;
-        updateProgressBar();
+        renderQuestion(question, index);
     } catch (error) {
         console.error('Error loading question:', error);
         alert('Failed to load question');
@@ -145,10 +287,35 @@ async function loadQuestion(index) {
     }
 }
 
-async function submitAnswer() {
+function renderQuestion(question, index) {
+    document.getElementById('question-text').textContent = question.text;
+    document.getElementById('difficulty-badge').textContent = question.difficulty || 'Medium';
+    document.getElementById('difficulty-badge').className = `difficulty-badge ${(question.difficulty || 'medium').toLowerCase()}`;
+    document.getElementById('question-number').textContent = index + 1;
+    
+    if (question.context) {
+        document.getElementById('question-context').innerHTML = `<p><strong>Context:</strong> ${question.context}</p>`;
+    } else {
+        document.getElementById('question-context').innerHTML = '';
+    }
+    
+    document.getElementById('answer-textarea').value = '';
+    document.getElementById('followup-textarea').value = '';
+    document.getElementById('follow-up-question').textContent = '';
+    document.getElementById('follow-up-section').style.display = 'none';
+    document.getElementById('score-display').style.display = 'none';
+    document.getElementById('submit-btn').textContent = 'Submit Answer';
+    
+    currentQuestionIndex = index;
+    pendingFollowup = false;
+    updateProgressBar();
+}
+
+async function submitAnswer(timedOut = false) {
     const answer = document.getElementById('answer-textarea').value.trim();
+    clearTimeout(draftTimer);
     
-    if (!answer) {
+    if (!answer && !timedOut) {
         alert('Please provide an answer');
         return;
     }
@@ -167,21 +334,50 @@ async function submitAnswer() {
     showLoadingScreen(true);
     
     try {
-        const response = await fetch(`${API_BASE}/session/${currentSession}/answer`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                question_index: currentQuestionIndex,
-                answer: answer
-            })
-        });
+        let data;
+        if (channel) {
+            // Score arrives first, then the follow-up streams in token by token
+            const followup = document.getElementById('follow-up-question');
+            data = await channelRequest({ type: 'answer', question_index: currentQuestionIndex, answer }, 'followup', (event) => {
+                if (event.type === 'score') {
+                    showScore(event.score);
+                    showLoadingScreen(false);
+                } else if (event.type === 'token') {
+                    followup.textContent += event.text;
+                    document.getElementById('follow-up-section').style.display = 'block';
+                }
+            });
+        } else {
+            const response = await fetch(`${API_BASE}/session/${currentSession}/answer`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    question_index: currentQuestionIndex,
+                    answer: answer
+                })
+            });
+            data = await response.json();
+        }
         
-        const data = await response.json();
+        setDeadline(data.deadline);
+        
+        if (data.expired) {
+            // Too late: the server submitted the saved draft instead
+            const scoreDisplay = document.getElementById('score-display');
+            scoreDisplay.textContent = '⏰ Time is up - your last saved draft was submitted';
+            scoreDisplay.style.display = 'block';
+            setTimeout(() => {
+                if (data.next_question_index < data.total_questions) {
+                    loadQuestion(data.next_question_index);
+                } else {
+                    completeInterview();
+                }
+            }, 1500);
+            return;
+        }
         
         // Show score
-        const scoreDisplay = document.getElementById('score-display');
-        scoreDisplay.textContent = `✅ Score: ${Math.round(data.score.score)}/100 - ${data.score.feedback}`;
-        scoreDisplay.style.display = 'block';
+        showScore(data.score);
         
         // Show AI-generated follow-up if available
         if (data.followup_question) {
@@ -218,14 +414,19 @@ function skipQuestion() {
 }
 
 async function completeInterview() {
+    setDeadline(null);
     showLoadingScreen(true);
     
     try {
-        const response = await fetch(`${API_BASE}/session/${currentSession}/complete`, {
-            method: 'POST'
-        });
-        
-        const data = await response.json();
+        let data;
+        if (channel) {
+            data = await channelRequest({ type: 'complete' }, 'complete');
+        } else {
+            const response = await fetch(`${API_BASE}/session/${currentSession}/complete`, {
+                method: 'POST'
+            });
+            data = await response.json();
+        }
         
         if (data.success) {
             displayResults(data.report);